@@ -13,6 +13,7 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/tokenlens/tokenlens",
     packages=find_packages(),
+    package_data={"tokenlens.providers": ["models.yaml"]},
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
@@ -0,0 +1,72 @@
+"""Shared fixtures: a small byte-level BPE encoding built offline.
+
+The real tiktoken vocabularies are downloaded on first use, so the tests
+train a tiny encoding with the cl100k pre-tokenizer instead. It tokenizes
+like the real ones (byte-level merges that never cross a pre-token), which
+is all the counting, chunking and limit-checking code relies on.
+"""
+
+import collections
+import os
+
+# Load Hugging Face tokenizers from the local cache only, instead of retrying downloads
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+
+import pytest
+import regex
+import tiktoken
+
+from tokenlens.tokenizers.openai_tokenizer import OpenAITokenizer
+from tokenlens.tokenizers.registry import TokenizerRegistry
+
+ENCODING_NAME = "test_bpe"
+
+# The cl100k_base pre-tokenizer pattern
+PAT_STR = (
+    r"""'(?i:[sdmt]|ll|ve|re)|[^\r\n\p{L}\p{N}]?+\p{L}++|\p{N}{1,3}+| ?[^\s\p{L}\p{N}]++[\r\n]*+|\s++$|\s*[\r\n]|\s+(?!\S)|\s"""
+)
+
+CORPUS = (
+    "The quick brown fox jumps over the lazy dog. A tokenizer splits text into tokens, "
+    "and the number of tokens decides whether a prompt fits in the context window of a model. "
+    "Long documents are split into chunks; every chunk is counted on its own.\n\n"
+    "Paragraphs end with a blank line. Sentences end with a full stop! Do questions end with a mark? "
+    "Numbers such as 12345 and 2024 are split into groups of at most three digits. "
+    "Café naïve résumé — Grüße. 日本語のテキストとトークン。 Emoji 🙂🚀 take several bytes.\n"
+) * 3
+
+def train_encoding(corpus: str, merges: int = 300) -> tiktoken.Encoding:
+    """Learn byte-pair merges on corpus, as tiktoken's own training does."""
+    ranks = {bytes([byte]): byte for byte in range(256)}
+    words = collections.Counter(regex.findall(PAT_STR, corpus))
+    pieces = {word: [bytes([byte]) for byte in word.encode("utf-8")] for word in words}
+    for _ in range(merges):
+        pairs = collections.Counter()
+        for word, parts in pieces.items():
+            for pair in zip(parts, parts[1:]):
+                pairs[pair] += words[word]
+        if not pairs:
+            break
+        (left, right), _ = max(pairs.items(), key=lambda item: (item[1], item[0]))
+        merged = left + right
+        ranks[merged] = len(ranks)
+        for word, parts in pieces.items():
+            i = 0
+            while i < len(parts) - 1:
+                if parts[i] == left and parts[i + 1] == right:
+                    parts[i:i + 2] = [merged]
+                i += 1
+    return tiktoken.Encoding(name=ENCODING_NAME, pat_str=PAT_STR, mergeable_ranks=ranks, special_tokens={})
+
+@pytest.fixture(scope="session")
+def encoding() -> tiktoken.Encoding:
+    """The test encoding, registered with TokenizerRegistry under ENCODING_NAME."""
+    encoding = train_encoding(CORPUS)
+    TokenizerRegistry._encodings[ENCODING_NAME] = encoding
+    return encoding
+
+@pytest.fixture
+def tokenizer(encoding) -> OpenAITokenizer:
+    """An OpenAITokenizer using the test encoding."""
+    TokenizerRegistry._encodings[ENCODING_NAME] = encoding
+    return OpenAITokenizer(ENCODING_NAME)
@@ -0,0 +1,69 @@
+"""Test batch counting of the Hugging Face family of tokenizers."""
+
+from importlib import import_module
+
+import pytest
+
+from tokenlens.tokenizers.base import BaseTokenizer
+from tokenlens.tokenizers.hf_batch import HuggingFaceBatchMixin
+
+TOKENIZERS = [
+    ("huggingface_tokenizer", "HuggingFaceTokenizer"),
+    ("meta_tokenizer", "MetaTokenizer"),
+    ("qwen_tokenizer", "QwenTokenizer"),
+    ("stanford_tokenizer", "StanfordTokenizer"),
+]
+
+TEXTS = ["one two three", "", "four", "five six"]
+
+class WordTokenizer:
+    """Stands in for a transformers tokenizer, with one token per word."""
+
+    def __init__(self):
+        self.batch_calls = 0
+
+    def encode(self, text):
+        if not isinstance(text, str):
+            raise TypeError("text must be a string")
+        return [len(word) for word in text.split()]
+
+    def __call__(self, texts):
+        self.batch_calls += 1
+        return {"input_ids": [self.encode(text) for text in texts]}
+
+class SlowWordTokenizer(WordTokenizer):
+    """A tokenizer without a batch path, which reads a list as one pre-split sequence."""
+
+    def __call__(self, texts):
+        return {"input_ids": [token for text in texts for token in self.encode(text)]}
+
+class WrappingTokenizer(HuggingFaceBatchMixin, BaseTokenizer):
+    """A minimal tokenizer around a transformers-like tokenizer, as the HF family builds them."""
+
+    def __init__(self, inner):
+        self.tokenizer = inner
+
+    def encode(self, text):
+        return self.tokenizer.encode(text)
+
+    def decode(self, tokens):
+        raise NotImplementedError
+
+def test_batch_path():
+    inner = WordTokenizer()
+    tokenizer = WrappingTokenizer(inner)
+    assert tokenizer.count_tokens_batch(TEXTS) == [tokenizer.count_tokens(text) for text in TEXTS]
+    assert tokenizer.encode_batch(TEXTS) == [tokenizer.encode(text) for text in TEXTS]
+    assert inner.batch_calls == 2
+
+def test_falls_back_to_single_counts_without_batch_support():
+    tokenizer = WrappingTokenizer(SlowWordTokenizer())
+    assert tokenizer.count_tokens_batch(TEXTS) == [3, 0, 1, 2]
+
+@pytest.mark.parametrize("module_name, class_name", TOKENIZERS)
+def test_hugging_face_tokenizers_share_the_batch_path(module_name, class_name):
+    pytest.importorskip("transformers")
+    tokenizer_class = getattr(import_module(f"tokenlens.tokenizers.{module_name}"), class_name)
+    assert issubclass(tokenizer_class, HuggingFaceBatchMixin)
+    assert tokenizer_class.count_tokens_batch is HuggingFaceBatchMixin.count_tokens_batch
+    assert tokenizer_class.encode_batch is HuggingFaceBatchMixin.encode_batch
@@ -0,0 +1,69 @@
+"""Test compact token buffers against the list-based encode API."""
+
+from array import array
+
+import pytest
+
+from conftest import CORPUS
+from tokenlens.tokenizers.base import BaseTokenizer
+from tokenlens.tokenizers.buffers import ARRAY, NUMPY, BatchBuffer, as_token_sequence, to_buffer
+
+TEXTS = ["", "hello world", CORPUS, "Emoji 🙂🚀 and 日本語", "12345 67890"]
+
+class WordTokenizer(BaseTokenizer):
+    """Uses BaseTokenizer's default buffer methods, with one token per word."""
+
+    supports_decode = False
+
+    def encode(self, text):
+        return [len(word) for word in text.split()]
+
+    def decode(self, tokens):
+        raise NotImplementedError
+
+@pytest.fixture(params=["tiktoken", "default"])
+def any_tokenizer(request, tokenizer):
+    return tokenizer if request.param == "tiktoken" else WordTokenizer()
+
+def test_array_buffers_round_trip(any_tokenizer):
+    for text in TEXTS:
+        buffer = any_tokenizer.encode_buffer(text)
+        assert isinstance(buffer, array) and buffer.itemsize == 4
+        assert list(buffer) == any_tokenizer.encode(text)
+    if any_tokenizer.supports_decode:
+        assert any_tokenizer.decode(list(any_tokenizer.encode_buffer(CORPUS))) == CORPUS
+
+def test_numpy_buffers_round_trip(any_tokenizer):
+    numpy = pytest.importorskip("numpy")
+    for text in TEXTS:
+        buffer = any_tokenizer.encode_buffer(text, NUMPY)
+        assert isinstance(buffer, numpy.ndarray) and buffer.dtype == numpy.uint32
+        assert buffer.tolist() == any_tokenizer.encode(text)
+
+@pytest.mark.parametrize("kind", [ARRAY, NUMPY])
+def test_batch_buffers_round_trip(any_tokenizer, kind):
+    if kind == NUMPY:
+        pytest.importorskip("numpy")
+    batch = any_tokenizer.encode_batch_buffer(TEXTS, kind)
+    expected = [any_tokenizer.encode(text) for text in TEXTS]
+    assert len(batch) == len(TEXTS)
+    assert [list(as_token_sequence(ids)) for ids in batch] == expected
+    assert list(as_token_sequence(batch[-1])) == expected[-1]
+    assert batch.counts() == [len(ids) for ids in expected]
+    assert batch.nbytes == 4 * sum(batch.counts()) + 8 * (len(TEXTS) + 1)
+    with pytest.raises(IndexError):
+        batch[len(TEXTS)]
+
+def test_to_buffer_conversions():
+    numpy = pytest.importorskip("numpy")
+    packed = to_buffer([1, 2, 3])
+    assert to_buffer(packed) is packed
+    assert to_buffer(packed, NUMPY).tolist() == [1, 2, 3]
+    assert to_buffer(numpy.array([4, 5], dtype=numpy.int64), NUMPY).dtype == numpy.uint32
+    assert list(as_token_sequence(memoryview(packed).cast("B"))) == [1, 2, 3]
+    with pytest.raises(ValueError):
+        to_buffer([1], "tensor")
+
+def test_empty_batch():
+    batch = BatchBuffer.from_lists([])
+    assert len(batch) == 0 and batch.counts() == [] and list(batch) == []
@@ -0,0 +1,141 @@
+"""Test the in-memory token-count cache and the tokenizer wrapper using it."""
+
+import pytest
+
+from tokenlens.tokenizers.base import BaseTokenizer
+from tokenlens.tokenizers.cache import CachedTokenizer, TokenCountCache
+
+class CallCounter:
+    """Wraps a tokenizer method and records the arguments it was called with."""
+
+    def __init__(self, tokenizer, name):
+        self.calls = []
+        self.method = getattr(tokenizer, name)
+        setattr(tokenizer, name, self)
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append(args)
+        return self.method(*args, **kwargs)
+
+def test_count_hit_and_miss():
+    cache = TokenCountCache()
+    assert cache.get_count("tok", "hello") is None
+    cache.put_count("tok", "hello", 3)
+    assert cache.get_count("tok", "hello") == 3
+    # Counts are per tokenizer
+    assert cache.get_count("other", "hello") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+def test_tokens_answer_count_lookups_and_are_copied():
+    cache = TokenCountCache()
+    cache.put_tokens("tok", "hello", [1, 2])
+    assert cache.get_count("tok", "hello") == 2
+    tokens = cache.get_tokens("tok", "hello")
+    tokens.append(3)
+    assert cache.get_tokens("tok", "hello") == [1, 2]
+
+def test_empty_text_is_cached():
+    cache = TokenCountCache()
+    cache.put_count("tok", "", 0)
+    assert cache.get_count("tok", "") == 0
+
+def test_evicts_least_recently_used_entries():
+    cache = TokenCountCache(max_entries=2, stripes=1)
+    cache.put_count("tok", "a", 1)
+    cache.put_count("tok", "b", 1)
+    cache.get_count("tok", "a")
+    cache.put_count("tok", "c", 1)
+    assert cache.get_count("tok", "b") is None
+    assert cache.get_count("tok", "a") == 1
+    assert cache.get_count("tok", "c") == 1
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["entries"] == 2
+
+def test_byte_budget_bounds_memory():
+    cache = TokenCountCache(max_bytes=2000, stripes=1)
+    cache.put_tokens("tok", "large", list(range(1000)))
+    assert cache.get_tokens("tok", "large") is None
+    for i in range(100):
+        cache.put_count("tok", str(i), i)
+    assert cache.stats()["bytes"] <= 2000
+
+def test_clear_keeps_counters():
+    cache = TokenCountCache()
+    cache.put_count("tok", "a", 1)
+    cache.get_count("tok", "a")
+    cache.clear()
+    assert cache.get_count("tok", "a") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["entries"] == 0
+
+def test_cached_counts_match_the_tokenizer(tokenizer):
+    cached = CachedTokenizer(tokenizer)
+    texts = ["", "hello world", "日本語 🙂", "The quick brown fox. " * 50]
+    for text in texts:
+        assert cached.count_tokens(text) == tokenizer.count_tokens(text)
+        assert cached.count_tokens(text) == tokenizer.count_tokens(text)
+        assert cached.encode(text) == tokenizer.encode(text)
+    assert cached.count_tokens_batch(texts) == tokenizer.count_tokens_batch(texts)
+    assert cached.encode_batch(texts) == tokenizer.encode_batch(texts)
+
+def test_hit_skips_the_tokenizer(tokenizer):
+    cached = CachedTokenizer(tokenizer)
+    counter = CallCounter(tokenizer, "count_tokens")
+    assert cached.count_tokens("hello world") == cached.count_tokens("hello world")
+    assert len(counter.calls) == 1
+    assert cached.cache.stats()["hits"] == 1
+
+def test_batch_sends_only_misses(tokenizer):
+    cached = CachedTokenizer(tokenizer)
+    cached.count_tokens("one")
+    counter = CallCounter(tokenizer, "count_tokens_batch")
+    assert cached.count_tokens_batch(["one", "two", "three"]) == [tokenizer.count_tokens(t) for t in ["one", "two", "three"]]
+    assert counter.calls == [(["two", "three"],)]
+
+def test_check_limit_caches_only_exact_results(tokenizer):
+    cached = CachedTokenizer(tokenizer)
+    text = "The quick brown fox jumps over the lazy dog. " * 300
+    count = tokenizer.count_tokens(text)
+    lower, _ = tokenizer.token_bounds(text)
+
+    # Stops early, so the count is a lower bound and must not be cached
+    result = cached.check_limit(text, lower)
+    assert not result["exact"]
+    assert cached.cache.get_count(cached.tokenizer_id, text) is None
+
+    result = cached.check_limit(text, count)
+    assert result["exact"]
+    assert cached.cache.get_count(cached.tokenizer_id, text) == count
+    assert cached.check_limit(text, count - 1)["within_limit"] is False
+
+def test_forwards_capabilities_and_fast_paths(tokenizer):
+    cached = CachedTokenizer(tokenizer)
+    assert cached.supports_offsets == tokenizer.supports_offsets
+    assert cached.remote == tokenizer.remote
+    assert cached.tokenizer_id == tokenizer.tokenizer_id
+    assert cached.model_name == tokenizer.model_name
+
+    text = "The quick brown fox. " * 100
+    counter = CallCounter(tokenizer, "count_tokens_parallel")
+    assert cached.count_tokens_parallel(text, workers=2) == tokenizer.count_tokens(text)
+    assert len(counter.calls) == 1
+    assert cached.count_tokens_parallel(text, workers=2) == tokenizer.count_tokens(text)
+    assert len(counter.calls) == 1
+
+    counter = CallCounter(tokenizer, "encode_buffer")
+    assert list(cached.encode_buffer(text)) == tokenizer.encode(text)
+    assert len(counter.calls) == 1
+
+def test_errors_are_not_cached():
+    class Failing(BaseTokenizer):
+        def encode(self, text):
+            raise ValueError("Failed to count tokens")
+
+        def decode(self, tokens):
+            raise NotImplementedError
+
+    cached = CachedTokenizer(Failing())
+    with pytest.raises(ValueError):
+        cached.count_tokens("hello")
+    assert cached.cache.stats()["entries"] == 0
@@ -0,0 +1,77 @@
+"""Test the capability flags each tokenizer declares."""
+
+from importlib import import_module
+
+import pytest
+
+from tokenlens.tokenizers.base import BaseTokenizer
+from tokenlens.tokenizers.cache import CachedTokenizer
+from tokenlens.tokenizers.openai_tokenizer import OpenAITokenizer
+
+# (module, class, SDK the module imports, supports_ids, supports_decode, supports_offsets, remote)
+TOKENIZERS = [
+    ("openai_tokenizer", "OpenAITokenizer", "tiktoken", True, True, True, False),
+    ("anthropic_tokenizer", "AnthropicTokenizer", "anthropic", False, False, False, True),
+    ("google_tokenizer", "GoogleTokenizer", "google.generativeai", False, False, False, True),
+    ("mistral_tokenizer", "MistralTokenizer", "mistralai", False, False, False, True),
+    ("cohere_tokenizer", "CohereTokenizer", "cohere", True, True, False, True),
+    ("ai21_tokenizer", "AI21Tokenizer", "ai21", True, True, False, True),
+    ("deepmind_tokenizer", "DeepMindTokenizer", None, True, True, False, True),
+    ("huggingface_tokenizer", "HuggingFaceTokenizer", "transformers", True, True, False, False),
+    ("meta_tokenizer", "MetaTokenizer", "transformers", True, True, False, False),
+    ("qwen_tokenizer", "QwenTokenizer", "transformers", True, True, False, False),
+    ("stanford_tokenizer", "StanfordTokenizer", "transformers", True, True, False, False),
+]
+
+class CountOnlyTokenizer(BaseTokenizer):
+    """Counts characters, like an API that only reports counts."""
+
+    supports_ids = False
+    supports_decode = False
+    remote = True
+
+    def encode(self, text):
+        raise NotImplementedError
+
+    def decode(self, tokens):
+        raise NotImplementedError
+
+    def count_tokens(self, text):
+        return len(text)
+
+@pytest.mark.parametrize(
+    "module_name, class_name, sdk, supports_ids, supports_decode, supports_offsets, remote", TOKENIZERS
+)
+def test_declared_capabilities(module_name, class_name, sdk, supports_ids, supports_decode, supports_offsets, remote):
+    if sdk is not None:
+        pytest.importorskip(sdk)
+    tokenizer_class = getattr(import_module(f"tokenlens.tokenizers.{module_name}"), class_name)
+    assert tokenizer_class.supports_ids is supports_ids
+    assert tokenizer_class.supports_decode is supports_decode
+    assert tokenizer_class.supports_offsets is supports_offsets
+    assert tokenizer_class.remote is remote
+    # Without IDs there is nothing to decode
+    assert supports_ids or not supports_decode
+
+def test_count_only_follows_supports_ids(tokenizer):
+    assert tokenizer.count_only is False
+    count_only = CountOnlyTokenizer()
+    assert count_only.count_only is True
+    assert count_only.count_tokens("hello") == 5
+    with pytest.raises(NotImplementedError):
+        count_only.encode("hello")
+
+@pytest.mark.parametrize("inner", ["count_only", "tiktoken"])
+def test_cached_tokenizers_forward_capabilities(inner, tokenizer):
+    wrapped = CountOnlyTokenizer() if inner == "count_only" else tokenizer
+    cached = CachedTokenizer(wrapped)
+    for name in ("supports_ids", "supports_decode", "supports_offsets", "remote", "count_only"):
+        assert getattr(cached, name) == getattr(wrapped, name)
+    assert cached.count_tokens("hello world") == wrapped.count_tokens("hello world")
+
+def test_offsets_match_encode(tokenizer):
+    assert isinstance(tokenizer, OpenAITokenizer) and tokenizer.supports_offsets
+    text = "Offsets 🙂 for every token"
+    tokens, offsets = tokenizer.encode_with_offsets(text)
+    assert tokens == tokenizer.encode(text)
+    assert offsets == sorted(offsets) and len(offsets) == len(tokens)
@@ -0,0 +1,106 @@
+"""Test token limit checks: early exit, cutoff offsets and byte-length bounds."""
+
+import pytest
+
+from tokenlens.tokenizers.base import BaseTokenizer
+
+TEXT = "The quick brown fox jumps over the lazy dog. " * 300
+MULTIBYTE = "日本語のテキストとトークン。🙂🚀 Café " * 200
+
+class SplitTokenizer(BaseTokenizer):
+    """Counts whitespace-separated words, with no bounds or early exit."""
+
+    def encode(self, text):
+        return [len(word) for word in text.split()]
+
+    def decode(self, tokens):
+        raise NotImplementedError
+
+def first_token_past(tokenizer, text, max_tokens):
+    """Character offset where token max_tokens of the whole text starts."""
+    _, offsets = tokenizer.encode_with_offsets(text)
+    return offsets[max_tokens]
+
+@pytest.mark.parametrize("text", [TEXT, MULTIBYTE], ids=["ascii", "multibyte"])
+def test_within_limit_is_exact(tokenizer, text):
+    count = tokenizer.count_tokens(text)
+    result = tokenizer.check_limit(text, count)
+    assert result["within_limit"]
+    assert result["exact"]
+    assert result["token_count"] == count
+    assert result["cutoff_char"] is None
+
+@pytest.mark.parametrize("text", [TEXT, MULTIBYTE], ids=["ascii", "multibyte"])
+@pytest.mark.parametrize("fill", [0.0, 0.3, 0.9])
+def test_over_limit_stops_early_with_cutoff(tokenizer, text, fill):
+    count = tokenizer.count_tokens(text)
+    # Keep the limit between the byte-length bounds so the text is counted
+    lower, _ = tokenizer.token_bounds(text)
+    max_tokens = lower + int(fill * (count - lower))
+    result = tokenizer.check_limit(text, max_tokens)
+    assert result["decided_by"] == "count"
+    assert not result["within_limit"]
+    assert max_tokens < result["token_count"] <= count
+    assert result["exact"] == (result["token_count"] == count)
+    assert result["cutoff_char"] == first_token_past(tokenizer, text, max_tokens)
+
+def test_one_token_over(tokenizer):
+    count = tokenizer.count_tokens(TEXT)
+    result = tokenizer.check_limit(TEXT, count - 1)
+    assert not result["within_limit"]
+    assert result["exact"]
+    assert result["token_count"] == count
+    assert result["cutoff_char"] == first_token_past(tokenizer, TEXT, count - 1)
+
+def test_cutoff_inside_multibyte_character(tokenizer):
+    # This emoji is not in the training corpus, so it takes several tokens
+    text = "🎉" * 50
+    tokens, offsets = tokenizer.encode_with_offsets(text)
+    per_char = len(tokens) // 50
+    assert per_char > 1
+    lower, _ = tokenizer.token_bounds(text)
+    for max_tokens in range(lower, lower + 2 * per_char):
+        result = tokenizer.check_limit(text, max_tokens)
+        assert result["decided_by"] == "count"
+        # A token starting mid-character cuts before that character
+        assert result["cutoff_char"] == offsets[max_tokens] == max_tokens // per_char
+
+def test_empty_text_and_zero_limit(tokenizer):
+    result = tokenizer.check_limit("", 0)
+    assert result["within_limit"]
+    assert result["token_count"] == 0
+    assert result["exact"]
+
+    result = tokenizer.check_limit("a", 0)
+    assert not result["within_limit"]
+    assert result["token_count"] >= 1
+
+def test_bounds_decide_without_counting(tokenizer):
+    count = tokenizer.count_tokens(TEXT)
+    lower, upper = tokenizer.token_bounds(TEXT)
+    assert lower <= count <= upper
+
+    result = tokenizer.check_limit(TEXT, upper)
+    assert result["decided_by"] == "bound"
+    assert result["within_limit"]
+    assert result["token_count"] >= count
+
+    result = tokenizer.check_limit(TEXT, lower - 1)
+    assert result["decided_by"] == "bound"
+    assert not result["within_limit"]
+    assert result["token_count"] <= count
+
+def test_bounds_of_multibyte_text(tokenizer):
+    count = tokenizer.count_tokens(MULTIBYTE)
+    lower, upper = tokenizer.token_bounds(MULTIBYTE)
+    assert upper == len(MULTIBYTE.encode("utf-8"))
+    assert lower <= count <= upper
+
+def test_default_check_limit_counts_everything():
+    tokenizer = SplitTokenizer()
+    assert tokenizer.check_limit("a b c", 3) == {
+        "within_limit": True, "token_count": 3, "exact": True, "cutoff_char": None, "decided_by": "count",
+    }
+    result = tokenizer.check_limit("a b c", 2)
+    assert not result["within_limit"]
+    assert result["token_count"] == 3
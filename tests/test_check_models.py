@@ -0,0 +1,125 @@
+"""Test checking one text against several models' token limits."""
+
+import pytest
+import tiktoken
+
+from tokenlens.tokenizer import check_models
+from tokenlens.tokenizers.openai_tokenizer import OpenAITokenizer
+from tokenlens.tokenizers.registry import TokenizerRegistry
+
+# Context windows: gpt-3.5-turbo 4096, gpt-4 8192, gpt-4-32k 32768
+SENTENCE = "The quick brown fox jumps over the lazy dog. "
+
+@pytest.fixture
+def calls(monkeypatch, encoding):
+    """Serve the gpt-4 models from the test encoding and gpt-3.5-turbo from a copy under another name.
+
+    Returns the list of (tokenizer_id, max_tokens) of every check_limit call.
+    """
+    other = tiktoken.Encoding(
+        name="test_bpe_other", pat_str=encoding._pat_str, mergeable_ranks=encoding._mergeable_ranks, special_tokens={}
+    )
+    for model, model_encoding in [("gpt-4", encoding), ("gpt-4-32k", encoding), ("gpt-3.5-turbo", other)]:
+        monkeypatch.setitem(TokenizerRegistry._encodings, model, model_encoding)
+    monkeypatch.setattr(TokenizerRegistry, "_tokenizers", {})
+    monkeypatch.setattr(TokenizerRegistry, "_failures", {})
+    monkeypatch.setattr(TokenizerRegistry, "_fallbacks", {})
+
+    recorded = []
+    check_limit = OpenAITokenizer.check_limit
+
+    def recording_check_limit(self, text, max_tokens):
+        recorded.append((self.tokenizer_id, max_tokens))
+        return check_limit(self, text, max_tokens)
+
+    monkeypatch.setattr(OpenAITokenizer, "check_limit", recording_check_limit)
+    return recorded
+
+def test_models_sharing_a_vocabulary_count_once(calls, tokenizer):
+    text = SENTENCE * 10
+    results = check_models(text, ["gpt-4", "gpt-3.5-turbo", ("openai", "gpt-4-32k")])
+    assert [result["model"] for result in results] == ["gpt-4", "gpt-3.5-turbo", "gpt-4-32k"]
+    assert sorted(calls) == [("tiktoken:test_bpe", 32768), ("tiktoken:test_bpe_other", 4096)]
+    assert results[0]["tokenizer_id"] == results[2]["tokenizer_id"] != results[1]["tokenizer_id"]
+    for result in results:
+        assert result["within_limit"]
+        assert result["available_tokens"] == result["token_limit"]
+
+def test_text_between_limits(calls, tokenizer):
+    text = SENTENCE * 1000
+    count = tokenizer.count_tokens(text)
+    assert 8192 < count <= 32768
+    small, large = check_models(text, ["gpt-4", "gpt-4-32k"])
+    assert (small["within_limit"], large["within_limit"]) == (False, True)
+    assert small["exact"] and large["exact"]
+    assert small["token_count"] == large["token_count"] == count
+
+def test_bound_within_the_largest_budget_is_recounted_for_smaller_ones(calls, tokenizer):
+    # Fewer tokens than the smaller limit, but more bytes, so only the upper bound fits the larger one
+    text = SENTENCE * 200
+    count = tokenizer.count_tokens(text)
+    assert count <= 8192 < len(text.encode()) <= 32768
+    for result in check_models(text, ["gpt-4", "gpt-4-32k"]):
+        assert result["within_limit"] and result["exact"]
+        assert result["token_count"] == count
+
+def test_bound_within_every_budget_is_trusted(calls, tokenizer):
+    text = SENTENCE * 50
+    assert len(text.encode()) <= 8192
+    for result in check_models(text, ["gpt-4", "gpt-4-32k"]):
+        assert result["within_limit"]
+        assert tokenizer.count_tokens(text) <= result["token_count"] <= len(text.encode())
+
+def test_text_over_every_limit_stops_early(calls, tokenizer):
+    text = SENTENCE * 8000
+    results = check_models(text, ["gpt-4", "gpt-4-32k"])
+    count = tokenizer.count_tokens(text)
+    for result in results:
+        assert not result["within_limit"]
+        assert 32768 < result["token_count"] <= count
+
+def test_reserved_output(calls, tokenizer):
+    text = SENTENCE * 1000
+    count = tokenizer.count_tokens(text)
+    reserved = 32768 - count + 1
+    (result,) = check_models(text, ["gpt-4-32k"], reserved_output=reserved)
+    assert result["available_tokens"] == count - 1
+    assert not result["within_limit"]
+
+def test_empty_text(calls):
+    for result in check_models("", ["gpt-4", "gpt-3.5-turbo"]):
+        assert result["within_limit"] and result["token_count"] == 0 and result["exact"]
+
+def test_unknown_model(calls):
+    with pytest.raises(ValueError):
+        check_models("hello", [("openai", "gpt-0")])
+
+def test_reserved_output_past_the_window(calls):
+    results = check_models("", ["gpt-3.5-turbo", "gpt-4", "gpt-4-32k"], reserved_output=5000)
+    assert [result["available_tokens"] for result in results] == [-904, 3192, 27768]
+    assert [result["within_limit"] for result in results] == [False, True, True]
+    assert all(result["token_count"] == 0 for result in results)
+    small, large = check_models(SENTENCE, ["gpt-4", "gpt-4-32k"], reserved_output=10000)
+    assert (small["within_limit"], large["within_limit"]) == (False, True)
+    with pytest.raises(ValueError):
+        check_models("", ["gpt-4"], reserved_output=-1)
+
+def test_unknown_model_ids_fall_back_once(calls, monkeypatch):
+    constructions = []
+    init = OpenAITokenizer.__init__
+
+    def counting_init(self, *args, **kwargs):
+        constructions.append(args or kwargs)
+        init(self, *args, **kwargs)
+
+    monkeypatch.setattr(OpenAITokenizer, "__init__", counting_init)
+    model = ("amazon.titan", "amazon.titan-text-express-v1")
+    first = check_models(SENTENCE, [model])
+    # One failed construction for the Bedrock ID, one for the default vocabulary
+    assert len(constructions) == 2
+    for _ in range(3):
+        assert check_models(SENTENCE, [model]) == first
+    assert len(constructions) == 2
+    default = TokenizerRegistry.get_tokenizer("amazon.titan")
+    assert TokenizerRegistry.get_model_tokenizer(*model) is default
+    assert first[0]["tokenizer_id"] == default.tokenizer_id
@@ -0,0 +1,135 @@
+"""Test splitting text into chunks that fit a token budget."""
+
+import io
+
+import pytest
+
+from tokenlens.chunker import TextChunker, add_batches, chunk_text, plan_batches
+from tokenlens.tokenizers.base import BaseTokenizer
+
+TEXTS = [
+    "word",
+    "The quick brown fox jumps over the lazy dog.\n\nA second paragraph follows! Does it end? " * 60,
+    "日本語のテキストとトークン。" * 150,
+    "Café naïve résumé 🎉🚀 12345 " * 100,
+    "🎉" * 400,
+    "x" * 3000,
+]
+
+class NoOffsets(BaseTokenizer):
+    """Wraps a tokenizer but hides its offsets, so chunks are packed from counted pieces."""
+
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+
+    def encode(self, text):
+        return self.tokenizer.encode(text)
+
+    def decode(self, tokens):
+        return self.tokenizer.decode(tokens)
+
+@pytest.fixture(params=["offsets", "pieces"])
+def chunk_tokenizer(request, tokenizer):
+    return tokenizer if request.param == "offsets" else NoOffsets(tokenizer)
+
+def check_chunks(chunks, text, tokenizer, max_tokens, overlap=0):
+    """Each chunk fits, reports its exact count and together they cover the text."""
+    assert [chunk["batch"] for chunk in chunks] == list(range(1, len(chunks) + 1))
+    assert chunks[0]["start_char"] == 0
+    assert chunks[-1]["end_char"] == len(text)
+    for chunk in chunks:
+        piece = text[chunk["start_char"]:chunk["end_char"]]
+        assert piece
+        assert chunk["tokens"] == tokenizer.count_tokens(piece)
+        assert chunk["tokens"] <= max_tokens
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert previous["start_char"] < chunk["start_char"]
+        if overlap:
+            assert chunk["start_char"] <= previous["end_char"]
+        else:
+            assert chunk["start_char"] == previous["end_char"]
+
+@pytest.mark.parametrize("max_tokens", [5, 37, 200])
+def test_chunks_fit_and_cover_the_text(chunk_tokenizer, max_tokens):
+    for text in TEXTS:
+        chunks = list(TextChunker(chunk_tokenizer, max_tokens).chunks(text))
+        check_chunks(chunks, text, chunk_tokenizer, max_tokens)
+
+def test_overlap(chunk_tokenizer):
+    text = TEXTS[1]
+    chunks = list(TextChunker(chunk_tokenizer, 40, overlap=10).chunks(text))
+    check_chunks(chunks, text, chunk_tokenizer, 40, overlap=10)
+    assert any(chunk["start_char"] < previous["end_char"] for previous, chunk in zip(chunks, chunks[1:]))
+
+def test_multibyte_characters_at_segment_edges(chunk_tokenizer):
+    # Small segments put emoji right at the edges where the text is read and cut
+    for pad in range(4):
+        text = ("a" * pad + "🎉🚀 ") * 60
+        chunks = list(TextChunker(chunk_tokenizer, 7, segment_size=16).chunks(text))
+        check_chunks(chunks, text, chunk_tokenizer, 7)
+
+def test_prefers_paragraph_breaks(tokenizer):
+    text = "One sentence here. Another one follows.\n\n" * 30
+    for chunk in TextChunker(tokenizer, 50).chunks(text):
+        assert text[:chunk["end_char"]].endswith("\n\n") or chunk["end_char"] == len(text)
+
+def test_streams_give_the_same_chunks(chunk_tokenizer):
+    text = TEXTS[1]
+    chunker = TextChunker(chunk_tokenizer, 30, segment_size=100)
+    assert list(chunker.chunks(io.StringIO(text))) == list(chunker.chunks(text))
+
+def test_empty_text_has_no_chunks(chunk_tokenizer):
+    assert list(TextChunker(chunk_tokenizer, 10).chunks("")) == []
+    assert plan_batches("", 10, tokenizer=chunk_tokenizer)["batches"] == []
+
+@pytest.mark.parametrize("kwargs", [{"max_tokens": 0}, {"max_tokens": 10, "overlap": 5}, {"max_tokens": 10, "min_fill": 0}])
+def test_rejects_invalid_budgets(tokenizer, kwargs):
+    with pytest.raises(ValueError):
+        TextChunker(tokenizer, **kwargs)
+
+def test_plan_batches(tokenizer):
+    text = TEXTS[1]
+    total = tokenizer.count_tokens(text)
+    plan = plan_batches(text, 100, tokenizer=tokenizer)
+    assert plan["total_tokens"] == total
+    assert plan["recommended_batch_size"] <= 100
+    assert plan["recommended_batch_size"] * -(-total // 100) >= total
+    assert plan["batches"] == list(chunk_text(text, 100, tokenizer=tokenizer))
+
+@pytest.mark.parametrize("overlap", [0, 10])
+def test_plan_batches_counts_the_text_while_chunking(tokenizer, monkeypatch, overlap):
+    # Count every text up front, before count_tokens is watched
+    totals = [tokenizer.count_tokens(text) for text in TEXTS]
+    counted = []
+    count_tokens = type(tokenizer).count_tokens
+    monkeypatch.setattr(
+        type(tokenizer), "count_tokens", lambda self, text: counted.append(len(text)) or count_tokens(self, text)
+    )
+    for text, total in zip(TEXTS, totals):
+        counted.clear()
+        assert plan_batches(text, 40, overlap, tokenizer=tokenizer)["total_tokens"] == total
+        # Only the short chunk edges are counted again, never the whole text
+        assert len(text) not in counted or len(list(chunk_text(text, 40, overlap, tokenizer=tokenizer))) == 1
+
+def test_chunker_total_tokens(chunk_tokenizer):
+    text = TEXTS[3]
+    chunker = TextChunker(chunk_tokenizer, 30)
+    assert chunker.total_tokens is None
+    chunks = chunker.chunks(text)
+    next(chunks)
+    assert chunker.total_tokens is None
+    list(chunks)
+    if chunk_tokenizer.supports_offsets:
+        assert chunker.total_tokens == chunk_tokenizer.count_tokens(text)
+    else:
+        assert chunker.total_tokens is None
+    assert plan_batches(text, 30, tokenizer=chunk_tokenizer)["total_tokens"] == chunk_tokenizer.count_tokens(text)
+
+def test_add_batches_reuses_exact_counts(tokenizer):
+    text = TEXTS[1]
+    result = add_batches({"token_limit": 100, "token_count": 12345, "exact": True}, text, tokenizer=tokenizer)
+    assert result["recommended_batch_size"] == 100
+    result = add_batches({"token_limit": 100, "token_count": 5, "exact": False}, text, tokenizer=tokenizer)
+    assert len(result["batches"]) > 1
+    with pytest.raises(ValueError):
+        add_batches({}, text, tokenizer=tokenizer)
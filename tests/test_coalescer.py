@@ -0,0 +1,116 @@
+"""Test micro-batching of concurrent count requests."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tokenlens.tokenizers.base import BaseTokenizer
+from tokenlens.tokenizers.coalescer import CountCoalescer
+
+class RecordingTokenizer(BaseTokenizer):
+    """Counts words and records every batch it is asked to count."""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+        self.lock = threading.Lock()
+
+    def encode(self, text):
+        return [len(word) for word in text.split()]
+
+    def decode(self, tokens):
+        raise NotImplementedError
+
+    def count_tokens_batch(self, texts):
+        with self.lock:
+            self.batches.append(list(texts))
+        if self.fail:
+            raise ValueError("Failed to count tokens")
+        return super().count_tokens_batch(texts)
+
+TEXTS = [f"{'word ' * i}".strip() for i in range(50)]
+
+def test_counts_match_count_tokens():
+    tokenizer = RecordingTokenizer()
+    with CountCoalescer(tokenizer) as coalescer:
+        assert [coalescer.count_tokens(text) for text in TEXTS] == [tokenizer.count_tokens(text) for text in TEXTS]
+        assert coalescer.count_tokens("") == 0
+
+def test_concurrent_requests_share_batches():
+    tokenizer = RecordingTokenizer()
+    with CountCoalescer(tokenizer, window=0.05, max_batch=1000) as coalescer:
+        futures = [coalescer.submit(text) for text in TEXTS * 4]
+        assert [future.result() for future in futures] == [tokenizer.count_tokens(text) for text in TEXTS * 4]
+    # Duplicates are counted once and the requests arrive within one window
+    assert sum(len(batch) for batch in tokenizer.batches) == len(TEXTS)
+    assert len(tokenizer.batches) < len(TEXTS)
+
+def test_requests_from_many_threads():
+    tokenizer = RecordingTokenizer()
+    with CountCoalescer(tokenizer, window=0.01) as coalescer, ThreadPoolExecutor(16) as pool:
+        counts = list(pool.map(coalescer.count_tokens, TEXTS))
+    assert counts == [tokenizer.count_tokens(text) for text in TEXTS]
+
+def test_max_batch_caps_batches():
+    tokenizer = RecordingTokenizer()
+    with CountCoalescer(tokenizer, window=0.05, max_batch=8) as coalescer:
+        futures = [coalescer.submit(text) for text in TEXTS]
+        [future.result() for future in futures]
+    assert max(len(batch) for batch in tokenizer.batches) <= 8
+
+def test_errors_reach_every_caller():
+    with CountCoalescer(RecordingTokenizer(fail=True), window=0.05) as coalescer:
+        futures = [coalescer.submit(text) for text in ["a", "b", "a"]]
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+
+def test_async_callers():
+    tokenizer = RecordingTokenizer()
+
+    async def count_all(coalescer):
+        return await asyncio.gather(*(coalescer.acount_tokens(text) for text in TEXTS))
+
+    with CountCoalescer(tokenizer) as coalescer:
+        assert asyncio.run(count_all(coalescer)) == [tokenizer.count_tokens(text) for text in TEXTS]
+
+def test_close_counts_queued_requests_and_rejects_new_ones():
+    coalescer = CountCoalescer(RecordingTokenizer(), window=1.0)
+    future = coalescer.submit("one two")
+    coalescer.close()
+    assert future.result(timeout=0) == 2
+    with pytest.raises(ValueError):
+        coalescer.submit("three")
+    coalescer.close()
+
+def test_rejects_empty_batches():
+    with pytest.raises(ValueError):
+        CountCoalescer(RecordingTokenizer(), max_batch=0)
+
+def test_cancelled_callers_do_not_stop_the_coalescer():
+    tokenizer = RecordingTokenizer()
+
+    async def cancel_one(coalescer):
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(coalescer.acount_tokens("one two"), timeout=0.01)
+
+    with CountCoalescer(tokenizer, window=0.1) as coalescer:
+        asyncio.run(cancel_one(coalescer))
+        cancelled = coalescer.submit("three")
+        assert cancelled.cancel()
+        assert coalescer.submit("four five six").result(timeout=5) == 3
+        assert coalescer._thread.is_alive()
+    # Nobody was waiting for the cancelled texts, so they were never counted
+    assert [text for batch in tokenizer.batches for text in batch] == ["four five six"]
+
+def test_bad_batches_do_not_stop_the_coalescer():
+    class ShortTokenizer(RecordingTokenizer):
+        def count_tokens_batch(self, texts):
+            return [] if "short" in texts else super().count_tokens_batch(texts)
+
+    with CountCoalescer(ShortTokenizer(), window=0) as coalescer:
+        with pytest.raises(ValueError):
+            coalescer.submit("short").result(timeout=5)
+        assert coalescer.count_tokens("one two") == 2
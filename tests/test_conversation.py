@@ -0,0 +1,76 @@
+"""Test the incremental token count of chat transcripts."""
+
+from tokenlens.conversation import REPLY_PRIMING_TOKENS, ConversationCounter, message_overhead
+
+MESSAGES = [
+    {"role": "system", "content": "You are a helpful assistant."},
+    {"role": "user", "name": "ada", "content": "How many tokens does 日本語 take? 🎉"},
+    {"role": "assistant", "content": "A few, depending on the vocabulary."},
+    {"role": "user", "content": [{"type": "text", "text": "And this "}, {"type": "image"}, {"type": "text", "text": "part?"}]},
+]
+
+def expected_total(tokenizer, messages, model=None):
+    """Count a transcript from scratch, as the chat format does."""
+    per_message, per_name = message_overhead(model)
+    total = REPLY_PRIMING_TOKENS
+    for message in messages:
+        total += per_message
+        for key, value in message.items():
+            if isinstance(value, list):
+                value = "".join(part.get("text", "") for part in value)
+            total += tokenizer.count_tokens(value)
+            if key == "name":
+                total += per_name
+    return total
+
+def test_empty_conversation_is_reply_priming(tokenizer):
+    counter = ConversationCounter(tokenizer=tokenizer)
+    assert len(counter) == 0
+    assert counter.total == REPLY_PRIMING_TOKENS
+    assert counter.remaining(0) == -REPLY_PRIMING_TOKENS
+
+def test_total_matches_full_recount(tokenizer):
+    counter = ConversationCounter(MESSAGES, tokenizer=tokenizer)
+    assert counter.total == expected_total(tokenizer, MESSAGES)
+    assert counter.messages == MESSAGES
+    assert sum(counter.message_tokens(i) for i in range(len(counter))) + REPLY_PRIMING_TOKENS == counter.total
+
+def test_edits_keep_the_total_exact(tokenizer):
+    counter = ConversationCounter(tokenizer=tokenizer)
+    messages = []
+    for message in MESSAGES:
+        counter.append(message)
+        messages.append(message)
+        assert counter.total == expected_total(tokenizer, messages)
+
+    edited = {"role": "assistant", "content": "A different, longer answer about tokens. " * 5}
+    counter.edit(2, edited)
+    messages[2] = edited
+    assert counter.total == expected_total(tokenizer, messages)
+    assert counter[2] is edited
+
+    assert counter.pop(0) == messages.pop(0)
+    assert counter.pop() == messages.pop()
+    assert counter.total == expected_total(tokenizer, messages)
+
+    counter.clear()
+    assert counter.total == REPLY_PRIMING_TOKENS
+
+def test_edit_counts_only_the_edited_message(tokenizer):
+    counter = ConversationCounter(MESSAGES, tokenizer=tokenizer)
+    calls = []
+    count_tokens = tokenizer.count_tokens
+    tokenizer.count_tokens = lambda text: calls.append(text) or count_tokens(text)
+    counter.edit(0, {"role": "system", "content": "Be brief."})
+    assert calls == ["system", "Be brief."]
+
+def test_legacy_model_overhead(tokenizer):
+    messages = MESSAGES
+    counter = ConversationCounter(messages, model="gpt-3.5-turbo-0301", tokenizer=tokenizer)
+    assert counter.total == expected_total(tokenizer, messages, "gpt-3.5-turbo-0301")
+    assert counter.total != ConversationCounter(messages, tokenizer=tokenizer).total
+
+def test_remaining(tokenizer):
+    counter = ConversationCounter(MESSAGES, tokenizer=tokenizer)
+    assert counter.remaining(counter.total) == 0
+    assert counter.remaining(counter.total + 10) == 10
@@ -0,0 +1,114 @@
+"""Test the persistent SQLite token-count cache."""
+
+import multiprocessing
+import sqlite3
+
+import pytest
+
+from tokenlens.tokenizers.cache import CachedTokenizer
+from tokenlens.tokenizers.disk_cache import DiskTokenCountCache
+
+def put_counts(path, start, stop):
+    """Write counts from another process."""
+    cache = DiskTokenCountCache(path)
+    for i in range(start, stop):
+        cache.put_count("tok", str(i), i)
+    cache.close()
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "counts" / "cache.db")
+
+def test_hit_and_miss(path):
+    cache = DiskTokenCountCache(path)
+    assert cache.get_count("tok", "hello") is None
+    cache.put_count("tok", "hello", 3)
+    assert cache.get_count("tok", "hello") == 3
+    assert cache.get_count("other", "hello") is None
+    cache.put_count("tok", "", 0)
+    assert cache.get_count("tok", "") == 0
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 2, 2)
+
+def test_database_uses_wal(path):
+    DiskTokenCountCache(path)
+    (mode,) = sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()
+    assert mode == "wal"
+
+def test_counts_survive_reopening(path):
+    cache = DiskTokenCountCache(path)
+    cache.put_count("tok", "hello", 3)
+    cache.close()
+    assert DiskTokenCountCache(path).get_count("tok", "hello") == 3
+
+def test_tokens_are_stored_as_counts(path):
+    cache = DiskTokenCountCache(path)
+    cache.put_tokens("tok", "hello", [1, 2, 3])
+    assert cache.get_tokens("tok", "hello") is None
+    assert cache.get_count("tok", "hello") == 3
+
+def test_shared_across_processes(path):
+    DiskTokenCountCache(path)
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=put_counts, args=(path, i * 50, (i + 1) * 50)) for i in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+    cache = DiskTokenCountCache(path)
+    assert [cache.get_count("tok", str(i)) for i in range(100)] == list(range(100))
+
+def test_compact_evicts_least_recently_used(path):
+    cache = DiskTokenCountCache(path, max_entries=3, compact_every=0)
+    for i in range(5):
+        cache.put_count("tok", str(i), i)
+    # Give every entry a distinct access time
+    with sqlite3.connect(path) as connection:
+        connection.execute("UPDATE token_counts SET accessed = count")
+    assert cache.compact() == 2
+    assert cache.get_count("tok", "0") is None
+    assert cache.get_count("tok", "1") is None
+    assert [cache.get_count("tok", str(i)) for i in range(2, 5)] == [2, 3, 4]
+    assert cache.stats()["evictions"] == 2
+    assert cache.compact() == 0
+
+def test_writes_trigger_compaction(path):
+    cache = DiskTokenCountCache(path, max_entries=10, compact_every=20)
+    for i in range(19):
+        cache.put_count("tok", str(i), i)
+    assert cache.stats()["entries"] == 19
+    cache.put_count("tok", "19", 19)
+    assert cache.stats()["entries"] == 10
+    assert cache.stats()["evictions"] == 10
+
+def test_compaction_returns_pages(path):
+    cache = DiskTokenCountCache(path, max_entries=1, compact_every=0)
+    for i in range(2000):
+        cache.put_count("tok", f"text {i}", i)
+    before = cache.stats()["bytes"]
+    cache.compact()
+    # Flush the WAL so the freed pages leave the main database file
+    cache._connection().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    assert cache.stats()["bytes"] < before
+
+def test_clear(path):
+    cache = DiskTokenCountCache(path)
+    cache.put_count("tok", "hello", 3)
+    cache.clear()
+    assert cache.get_count("tok", "hello") is None
+    assert cache.stats()["entries"] == 0
+
+def test_rejects_empty_budget(path):
+    with pytest.raises(ValueError):
+        DiskTokenCountCache(path, max_entries=0)
+
+def test_backs_a_cached_tokenizer(tokenizer, path):
+    text = "The quick brown fox jumps over the lazy dog."
+    cached = CachedTokenizer(tokenizer, DiskTokenCountCache(path))
+    assert cached.count_tokens(text) == tokenizer.count_tokens(text)
+    # A new process would see the count through a fresh cache on the same file
+    reopened = CachedTokenizer(tokenizer, DiskTokenCountCache(path))
+    assert reopened.cache.get_count(tokenizer.tokenizer_id, text) == tokenizer.count_tokens(text)
+    assert reopened.count_tokens(text) == tokenizer.count_tokens(text)
+    assert reopened.cache.stats()["hits"] == 2
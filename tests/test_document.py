@@ -0,0 +1,94 @@
+"""Test documents whose token count is kept up to date across edits."""
+
+import random
+from itertools import accumulate
+
+import pytest
+
+from tokenlens.document import TokenizedDocument
+from tokenlens.tokenizers.base import BaseTokenizer
+
+TEXT = (
+    "The quick brown fox jumps over the lazy dog.\n\nA second paragraph follows. "
+    "日本語のテキストとトークン。 Café naïve 🎉🚀 12345 "
+) * 40
+
+PIECES = ["", " ", "a", "word ", "\n\n", "日本", "🎉", "12", "!", " the lazy dog. "]
+
+class CountOnly(BaseTokenizer):
+    """A tokenizer that reports counts but no token IDs, like the remote APIs."""
+
+    supports_ids = False
+
+    def encode(self, text):
+        raise NotImplementedError
+
+    def decode(self, tokens):
+        raise NotImplementedError
+
+    def count_tokens(self, text):
+        return len(text.split())
+
+def check(document, text, tokenizer):
+    assert document.text == text
+    assert len(document) == len(text)
+    assert document.token_count == tokenizer.count_tokens(text)
+    assert document._ends == list(accumulate(map(len, document._segments)))
+
+def test_initial_count(tokenizer):
+    for text in ["", "word", TEXT]:
+        check(TokenizedDocument(text, tokenizer=tokenizer, segment_size=64), text, tokenizer)
+
+def test_random_edits_keep_the_count_exact(tokenizer):
+    rng = random.Random(0)
+    text = TEXT
+    document = TokenizedDocument(text, tokenizer=tokenizer, segment_size=64)
+    for _ in range(300):
+        start = rng.randrange(len(text) + 1)
+        end = min(len(text), start + rng.choice([0, 0, 1, 3, 50]))
+        replacement = rng.choice(PIECES)
+        document.edit(start, end, replacement)
+        text = text[:start] + replacement + text[end:]
+        check(document, text, tokenizer)
+
+def test_edits_split_multibyte_runs(tokenizer):
+    text = "🎉" * 200
+    document = TokenizedDocument(text, tokenizer=tokenizer, segment_size=16)
+    for position in (0, 15, 16, 17, 100, 200):
+        document.insert(position, " ")
+        text = text[:position] + " " + text[position:]
+        check(document, text, tokenizer)
+
+def test_insert_delete_and_empty_document(tokenizer):
+    document = TokenizedDocument(tokenizer=tokenizer)
+    check(document, "", tokenizer)
+    document.insert(0, TEXT)
+    check(document, TEXT, tokenizer)
+    document.delete(0, len(TEXT))
+    check(document, "", tokenizer)
+    document.insert(0, "hello")
+    check(document, "hello", tokenizer)
+
+def test_edit_outside_the_document(tokenizer):
+    document = TokenizedDocument("hello", tokenizer=tokenizer)
+    for start, end in [(-1, 2), (3, 2), (0, 6)]:
+        with pytest.raises(ValueError):
+            document.edit(start, end, "x")
+
+def test_edit_recounts_only_nearby_segments(tokenizer):
+    document = TokenizedDocument(TEXT, tokenizer=tokenizer, segment_size=64)
+    counted = []
+    count_tokens = tokenizer.count_tokens
+    tokenizer.count_tokens = lambda text: counted.append(text) or count_tokens(text)
+    document.insert(len(TEXT) // 2, "word ")
+    assert sum(map(len, counted)) < len(TEXT) // 10
+
+def test_rejects_tokenizers_without_ids_or_offsets():
+    with pytest.raises(ValueError, match="token IDs and offsets"):
+        TokenizedDocument("hello", tokenizer=CountOnly())
+
+    class NoOffsets(CountOnly):
+        supports_ids = True
+
+    with pytest.raises(ValueError, match="token IDs and offsets"):
+        TokenizedDocument("hello", tokenizer=NoOffsets())
@@ -0,0 +1,60 @@
+"""Test sampling-based token estimates for large texts."""
+
+import random
+
+import pytest
+
+from conftest import CORPUS
+
+SENTENCES = [sentence.strip() + ". " for sentence in CORPUS.split(".") if sentence.strip()]
+
+@pytest.fixture(scope="module")
+def large_text():
+    rng = random.Random(0)
+    return "".join(rng.choice(SENTENCES) for _ in range(8000))
+
+def test_small_texts_are_counted_exactly(tokenizer):
+    for text in ["", "hello world", CORPUS]:
+        result = tokenizer.estimate_tokens(text)
+        count = tokenizer.count_tokens(text)
+        assert result == {"estimate": count, "low": count, "high": count, "confidence": 1.0, "exact": True, "samples": 0}
+
+def test_exact_flag_counts_everything(tokenizer, large_text):
+    result = tokenizer.estimate_tokens(large_text, exact=True)
+    assert result["exact"] and result["estimate"] == tokenizer.count_tokens(large_text)
+
+def test_interval_covers_exact_count(tokenizer, large_text):
+    count = tokenizer.count_tokens(large_text)
+    for seed in range(5):
+        result = tokenizer.estimate_tokens(large_text, sample_fraction=0.05, confidence=0.99, seed=seed)
+        assert not result["exact"]
+        assert result["samples"] >= 32
+        assert result["low"] <= count <= result["high"]
+        assert abs(result["estimate"] - count) / count < 0.05
+
+def test_seed_makes_samples_reproducible(tokenizer, large_text):
+    first = tokenizer.estimate_tokens(large_text, seed=7)
+    assert tokenizer.estimate_tokens(large_text, seed=7) == first
+
+def test_higher_confidence_widens_interval(tokenizer, large_text):
+    narrow = tokenizer.estimate_tokens(large_text, confidence=0.5, seed=1)
+    wide = tokenizer.estimate_tokens(large_text, confidence=0.99, seed=1)
+    assert narrow["estimate"] == wide["estimate"]
+    assert wide["high"] - wide["low"] > narrow["high"] - narrow["low"]
+
+@pytest.mark.parametrize("confidence", [0, 1, 1.0, -0.5, 1.5])
+def test_rejects_confidence_outside_open_unit_interval(tokenizer, large_text, confidence):
+    with pytest.raises(ValueError, match="confidence"):
+        tokenizer.estimate_tokens(large_text, confidence=confidence)
+    # Also for texts that would be counted exactly
+    with pytest.raises(ValueError, match="confidence"):
+        tokenizer.estimate_tokens("hello world", confidence=confidence)
+
+@pytest.mark.parametrize("sample_fraction", [0, -0.1, 1.01, 2])
+def test_rejects_sample_fraction_outside_unit_interval(tokenizer, large_text, sample_fraction):
+    with pytest.raises(ValueError, match="sample_fraction"):
+        tokenizer.estimate_tokens(large_text, sample_fraction=sample_fraction)
+
+def test_whole_text_sample_fraction_is_exact(tokenizer, large_text):
+    result = tokenizer.estimate_tokens(large_text, sample_fraction=1)
+    assert result["exact"] and result["estimate"] == tokenizer.count_tokens(large_text)
@@ -0,0 +1,131 @@
+"""Test offline token estimates and the limit checks that rely on them."""
+
+import pytest
+
+from conftest import CORPUS
+from tokenlens.providers.anthropic_provider import AnthropicProvider
+from tokenlens.tokenizers.base import BaseTokenizer
+from tokenlens.tokenizers.cache import CachedTokenizer
+from tokenlens.tokenizers.deepmind_tokenizer import DeepMindTokenizer
+from tokenlens.tokenizers.estimator import FAMILY_RATIOS, FEATURES, TokenEstimator, _least_squares, count_features
+
+SENTENCES = [sentence.strip() + "." for sentence in CORPUS.split(".") if sentence.strip()]
+
+class CharTokenizer(BaseTokenizer):
+    """Stands in for the Anthropic tokenizer, counting one token per character."""
+
+    supports_ids = False
+    supports_decode = False
+    remote = True
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, text):
+        raise NotImplementedError
+
+    def decode(self, tokens):
+        raise NotImplementedError
+
+    def count_tokens(self, text):
+        self.calls += 1
+        return len(text)
+
+def char_counting_provider(monkeypatch):
+    """An AnthropicProvider whose shared tokenizer is a CharTokenizer."""
+    provider = AnthropicProvider()
+    tokenizer = CharTokenizer()
+    monkeypatch.setattr(provider, "_get_tokenizer", lambda: tokenizer)
+    return provider, tokenizer
+
+def test_count_features():
+    assert count_features("") == {"ascii": 0, "digit": 0, "cjk": 0, "other": 0}
+    assert count_features("ab 12") == {"ascii": 3, "digit": 2, "cjk": 0, "other": 0}
+    assert count_features("é日本🙂") == {"ascii": 0, "digit": 0, "cjk": 2, "other": 2}
+
+def test_empty_text_estimates_zero():
+    assert TokenEstimator().estimate("") == {"estimate": 0, "low": 0, "high": 0, "family": "default"}
+
+def test_least_squares_solves_exact_systems():
+    solution = _least_squares([[1, 0], [0, 1], [1, 1]], [2, 3, 5], [0, 0], 0)
+    assert solution == pytest.approx([2, 3])
+
+def test_least_squares_shrinks_towards_prior():
+    solution = _least_squares([[1, 0], [0, 1]], [2, 3], [7, 9], 1e9)
+    assert solution == pytest.approx([7, 9], abs=1e-6)
+
+def test_calibrated_interval_covers_exact_counts(tokenizer):
+    train, held_out = SENTENCES[::2], SENTENCES[1::2]
+    estimator = TokenEstimator("test").calibrate(
+        [(text, tokenizer.count_tokens(text)) for text in train], confidence=1.0
+    )
+    texts = held_out + [a + " " + b for a in held_out for b in held_out]
+    for text in texts:
+        estimate = estimator.estimate(text)
+        assert estimate["low"] <= tokenizer.count_tokens(text) <= estimate["high"], text
+
+def test_calibrate_keeps_ratios_of_absent_classes(tokenizer):
+    estimator = TokenEstimator("default")
+    before = dict(estimator.ratios)
+    estimator.calibrate([(text, tokenizer.count_tokens(text)) for text in ["hello world", "the lazy dog"]])
+    assert estimator.ratios["cjk"] == before["cjk"]
+    assert estimator.ratios["ascii"] != before["ascii"]
+    assert set(FEATURES) < set(estimator.ratios)
+
+def test_calibrate_needs_samples():
+    with pytest.raises(ValueError):
+        TokenEstimator().calibrate([("", 0)])
+
+def test_seed_ratios_never_reject():
+    estimator = TokenEstimator()
+    assert not estimator.calibrated
+    assert estimator.decide("The quick brown fox. " * 1000, 10) is None
+    result = estimator.check_limit("The quick brown fox. " * 1000, 10)
+    assert (result["within_limit"], result["exact"], result["decided_by"]) == (False, False, "estimate")
+
+def test_calibrated_estimate_only_rejects(tokenizer):
+    estimator = TokenEstimator(ratios=FAMILY_RATIOS["default"])
+    assert estimator.calibrated
+    assert TokenEstimator().calibrate([("hello world", tokenizer.count_tokens("hello world"))]).calibrated
+    # Far under the limit, but accepting always takes an exact count
+    assert estimator.decide("hello world", 1000) is None
+    result = estimator.decide("The quick brown fox. " * 1000, 10)
+    assert (result["within_limit"], result["exact"], result["decided_by"]) == (False, False, "estimate")
+
+    text = "The quick brown fox. " * 10
+    count = tokenizer.count_tokens(text)
+    result = estimator.check_limit(text, count, tokenizer)
+    assert (result["within_limit"], result["token_count"], result["decided_by"]) == (True, count, "count")
+
+def test_provider_counts_before_accepting(monkeypatch):
+    provider, _ = char_counting_provider(monkeypatch)
+    # The seed ratios would put this well under the limit; the exact count does not
+    text = "7" * 250000
+    result = provider.check_text_limits("claude-2.1", text)
+    assert (result["valid"], result["exact"], result["decided_by"]) == (False, True, "count")
+    assert result["token_count"] == len(text)
+
+def test_provider_counts_before_rejecting_with_seed_ratios(monkeypatch):
+    provider, tokenizer = char_counting_provider(monkeypatch)
+    text = "The quick brown fox. " * 100000
+    result = provider.check_text_limits("claude-2.1", text)
+    assert (result["valid"], result["exact"], result["decided_by"]) == (False, True, "count")
+    assert tokenizer.calls == 1
+
+def test_provider_rejects_by_calibrated_estimate_without_counting(monkeypatch):
+    provider, tokenizer = char_counting_provider(monkeypatch)
+    estimator = TokenEstimator("claude", FAMILY_RATIOS["claude"])
+    monkeypatch.setattr(provider, "_get_estimator", lambda model=None: estimator)
+    result = provider.check_text_limits("claude-2.1", "The quick brown fox. " * 100000)
+    assert (result["valid"], result["exact"], result["decided_by"]) == (False, False, "estimate")
+    assert tokenizer.calls == 0
+
+def test_provider_without_counter_reports_inexact_estimate():
+    result = AnthropicProvider().check_text_limits("claude-2.1", "hello world")
+    assert (result["valid"], result["exact"], result["decided_by"]) == (True, False, "estimate")
+
+def test_failed_counts_raise_and_are_not_cached():
+    cached = CachedTokenizer(DeepMindTokenizer())
+    with pytest.raises(ValueError):
+        cached.count_tokens("hello world")
+    assert cached.cache.stats()["entries"] == 0
@@ -0,0 +1,72 @@
+"""Test that the provider factory resolves providers lazily and accepts registered classes."""
+
+import json
+import sys
+
+import pytest
+
+from test_imports import HEAVY_MODULES, run_fresh
+from tokenlens.providers.anthropic_provider import AnthropicProvider
+from tokenlens.providers.factory import ProviderFactory
+
+PROVIDER_MODULES = sorted({path.rsplit(".", 1)[0] for path in ProviderFactory._providers.values()})
+
+@pytest.fixture
+def factory(monkeypatch):
+    """Let tests register providers without leaking them into the shared tables."""
+    monkeypatch.setattr(ProviderFactory, "_providers", dict(ProviderFactory._providers))
+    monkeypatch.setattr(ProviderFactory, "_classes", dict(ProviderFactory._classes))
+    return ProviderFactory
+
+def test_nested_classes_register_directly(factory):
+    class LocalProvider(AnthropicProvider):
+        pass
+
+    factory.register_provider("Local", LocalProvider)
+    # Resolving must not depend on the resolved-class cache
+    factory._classes.clear()
+    assert factory.get_provider_class("local") is LocalProvider
+    assert isinstance(factory.get_provider("local"), LocalProvider)
+    assert "local" in factory.get_supported_providers()
+
+def test_classes_from_top_level_modules_register_directly(factory, tmp_path, monkeypatch):
+    (tmp_path / "plainprovider.py").write_text(
+        "from tokenlens.providers.anthropic_provider import AnthropicProvider\n"
+        "class PlainProvider(AnthropicProvider):\n"
+        "    pass\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "plainprovider", raising=False)
+    from plainprovider import PlainProvider
+
+    factory.register_provider("plain", PlainProvider)
+    factory._classes.clear()
+    assert factory.get_provider_class("plain") is PlainProvider
+
+def test_registering_replaces_the_resolved_class(factory):
+    class Replacement(AnthropicProvider):
+        pass
+
+    assert factory.get_provider_class("anthropic") is AnthropicProvider
+    factory.register_provider("anthropic", Replacement)
+    assert factory.get_provider_class("anthropic") is Replacement
+    factory.register_provider("anthropic", "anthropic_provider.AnthropicProvider")
+    assert factory.get_provider_class("anthropic") is AnthropicProvider
+
+def test_unknown_providers_are_rejected():
+    with pytest.raises(ValueError):
+        ProviderFactory.get_provider_class("no-such-provider")
+
+@pytest.mark.parametrize("name", sorted(ProviderFactory._providers))
+def test_resolving_a_provider_loads_only_its_module(name):
+    own_module = ProviderFactory._providers[name].rsplit(".", 1)[0]
+    loaded = json.loads(run_fresh(
+        "import json, sys\n"
+        "from tokenlens.providers.factory import ProviderFactory\n"
+        f"ProviderFactory.get_provider_class({name!r})\n"
+        "print(json.dumps({\n"
+        f"    'providers': [m for m in {PROVIDER_MODULES!r} if 'tokenlens.providers.' + m in sys.modules],\n"
+        f"    'sdks': [m for m in {HEAVY_MODULES!r} if m in sys.modules],\n"
+        "}))\n"
+    ))
+    assert loaded == {"providers": [own_module], "sdks": []}
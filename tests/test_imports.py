@@ -0,0 +1,65 @@
+"""Test that importing tokenlens stays cheap and loads provider SDKs lazily."""
+
+import json
+import statistics
+import subprocess
+import sys
+
+import pytest
+
+import tokenlens
+from tokenlens.tokenizers import BaseTokenizer
+
+# Seconds `import tokenlens` may take in a fresh interpreter (median of several runs)
+IMPORT_BUDGET = 0.5
+
+# Modules only a specific provider's tokenizer or an opt-in feature needs
+HEAVY_MODULES = [
+    "anthropic",
+    "cohere",
+    "google.generativeai",
+    "mistralai",
+    "ai21",
+    "transformers",
+    "huggingface_hub",
+    "torch",
+    "requests",
+    "openai",
+    "numpy",
+]
+
+def run_fresh(code: str) -> str:
+    """Run code in a fresh interpreter and return its stdout."""
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout
+
+def test_import_loads_no_provider_sdks():
+    loaded = json.loads(run_fresh(
+        "import json, sys\n"
+        "import tokenlens, tokenlens.tokenizers\n"
+        f"print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))\n"
+    ))
+    assert loaded == []
+
+def test_import_time_budget():
+    timings = [
+        float(run_fresh(
+            "import time\n"
+            "start = time.perf_counter()\n"
+            "import tokenlens\n"
+            "print(time.perf_counter() - start)\n"
+        ))
+        for _ in range(5)
+    ]
+    assert statistics.median(timings) < IMPORT_BUDGET
+
+@pytest.mark.parametrize("name", tokenlens.tokenizers._OPTIONAL_TOKENIZERS)
+def test_optional_tokenizer_resolves_on_access(name):
+    tokenizer = getattr(tokenlens, name)
+    assert tokenizer is None or issubclass(tokenizer, BaseTokenizer)
+    assert getattr(tokenlens.tokenizers, name) is tokenizer
+    assert name in dir(tokenlens)
+
+def test_unknown_attribute_raises():
+    with pytest.raises(AttributeError):
+        tokenlens.NoSuchTokenizer
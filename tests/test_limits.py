@@ -0,0 +1,120 @@
+"""Test the model-limits registry and the config it is built from."""
+
+import json
+
+import pytest
+
+from tokenlens.providers import limits
+from tokenlens.providers.limits import (
+    ModelLimits,
+    ModelRegistry,
+    parse_duration,
+    parse_resolution,
+    parse_size,
+)
+from tokenlens.providers.openai_provider import OpenAIProvider
+
+class VoiceProvider(OpenAIProvider):
+    """OpenAIProvider with its unimplemented abstract methods stubbed out."""
+
+    check_avatar_limits = check_video_limits = refresh_models = lambda *args: None
+
+def test_parse_resolution():
+    assert parse_resolution("1024x1792") == (1024, 1792)
+    assert parse_resolution(" 512 X 512 ") == (512, 512)
+    assert parse_resolution("1080p") == (1920, 1080)
+    assert parse_resolution("large") is None
+    assert parse_resolution(None) is None
+
+def test_parse_size():
+    assert parse_size("25MB") == 25 << 20
+    assert parse_size("1.5 GiB") == 3 << 29
+    assert parse_size("512") == 512
+    assert parse_size(100) == 100
+    assert parse_size("big") is None
+    assert parse_size(True) is None
+
+def test_parse_duration():
+    assert parse_duration(300) == 300.0
+    assert parse_duration("300") == 300.0
+    assert parse_duration("5m") == 300.0
+    assert parse_duration("2 hours") == 7200.0
+    assert parse_duration("soon") is None
+
+def test_config_ships_with_the_package():
+    text = limits._read_config()
+    assert "providers:" in text
+    # A model only the config lists
+    record = ModelRegistry.get("anthropic", "claude-3-5-sonnet")
+    assert record is not None and record.type == "text" and record.token_limit == 200000
+
+def test_provider_tables_win_over_the_config():
+    record = ModelRegistry.get("openai", "gpt-4")
+    assert record.token_limit == 8192
+
+def test_records_are_read_only():
+    record = ModelRegistry.get("openai", "dall-e-3")
+    with pytest.raises(AttributeError):
+        record.token_limit = 1
+    with pytest.raises(TypeError):
+        record.limits["type"] = "text"
+    with pytest.raises(TypeError):
+        record.limits["additional_constraints"]["quality"] = "low"
+    assert isinstance(record.limits["supported_formats"], tuple)
+
+def test_records_do_not_share_the_source_tables():
+    table = {"type": "image", "max_resolution": "64x64", "additional_constraints": {"file_size": "1MB"}}
+    record = ModelLimits("test", "tiny", table)
+    table["additional_constraints"]["file_size"] = "2MB"
+    assert record.limits["additional_constraints"]["file_size"] == "1MB"
+    assert (record.max_width, record.max_height, record.max_file_size) == (64, 64, 1 << 20)
+
+def test_parsed_fields():
+    record = ModelRegistry.get("openai", "whisper-1")
+    assert (record.type, record.max_duration, record.max_file_size) == ("voice", 300.0, 25 << 20)
+
+def test_voice_limits_use_the_parsed_fields():
+    provider = VoiceProvider()
+    assert provider.check_voice_limits("whisper-1", {"duration": 300, "file_size": 25})["is_within_limit"]
+    error = provider.check_voice_limits("whisper-1", {"duration": 301, "file_size": 25.5})["error"]
+    assert "Duration exceeds limit of 300.0 seconds" in error
+    assert "File size exceeds limit of 25.0MB" in error
+    # No duration or size limit is listed for the speech models
+    assert provider.check_voice_limits("tts-1", {"duration": 10 ** 6})["is_within_limit"]
+    assert "error" in provider.check_voice_limits("gpt-4", {})
+
+def test_to_dict_gives_plain_copies():
+    record = ModelRegistry.get("openai", "dall-e-3")
+    limits = record.to_dict()
+    assert limits == {
+        "type": "image",
+        "max_resolution": "1024x1024",
+        "supported_formats": ["png", "jpeg"],
+        "additional_constraints": {"quality": ["standard", "hd"], "style": ["vivid", "natural"]},
+    }
+    assert type(limits["additional_constraints"]) is dict
+    json.dumps(limits)
+    limits["additional_constraints"]["quality"].append("low")
+    assert record.limits["additional_constraints"]["quality"] == ("standard", "hd")
+
+def test_openai_limits_come_from_the_registry():
+    provider = VoiceProvider()
+    for record in ModelRegistry.get_provider_models("openai").values():
+        assert provider.get_model_limits(record.model) == record.to_dict()
+    # A model only the config lists
+    assert provider.get_model_limits("speechgen") == ModelRegistry.get("openai", "speechgen").to_dict() != {}
+    assert provider.get_model_limits("gpt-0") == {}
+
+def test_index_queries():
+    index = ModelRegistry.index()
+    assert index.smallest_fit(5000, provider="openai").model == "gpt-4"
+    assert index.smallest_fit(10 ** 9) is None
+    texts = index.find(feature="text", provider="openai")
+    assert [record.token_limit for record in texts] == sorted(record.token_limit for record in texts)
+    assert set(index.features("openai")) >= {"text", "image", "voice"}
+
+def test_clear_rebuilds_the_registry():
+    before = ModelRegistry.get("openai", "gpt-4")
+    ModelRegistry.clear()
+    after = ModelRegistry.get("openai", "gpt-4")
+    assert after is not before and after.limits == before.limits
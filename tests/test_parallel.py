@@ -0,0 +1,35 @@
+"""Test parallel token counts of large texts."""
+
+import pytest
+
+from tokenlens.tokenizers import openai_tokenizer
+from tokenlens.tokenizers.base import BaseTokenizer
+
+TEXTS = [
+    "",
+    "word",
+    "The quick brown fox jumps over the lazy dog.\n\nA second paragraph follows. " * 200,
+    "日本語のテキストとトークン。" * 500,
+    "Café naïve résumé 🎉🚀 12345 " * 300,
+    "x" * 20000,
+]
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    """Split even the small test texts into many chunks."""
+    monkeypatch.setattr(openai_tokenizer, "PARALLEL_MIN_CHUNK", 64)
+
+@pytest.mark.parametrize("workers", [1, 2, 4, None])
+def test_parallel_counts_match_count_tokens(tokenizer, workers):
+    for text in TEXTS:
+        assert tokenizer.count_tokens_parallel(text, workers=workers) == tokenizer.count_tokens(text)
+
+def test_multibyte_characters_at_chunk_edges(tokenizer):
+    # Shift the emoji across every position relative to the chunk size
+    for pad in range(8):
+        text = ("a" * pad + "🎉 ") * 400
+        assert tokenizer.count_tokens_parallel(text, workers=4) == tokenizer.count_tokens(text)
+
+def test_default_counts_serially(tokenizer):
+    text = TEXTS[2]
+    assert BaseTokenizer.count_tokens_parallel(tokenizer, text, workers=4) == tokenizer.count_tokens(text)
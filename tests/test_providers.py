@@ -0,0 +1,115 @@
+"""Test that providers serve every model they list."""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from tokenlens.providers.adobe_provider import AdobeProvider
+from tokenlens.providers.ai21_provider import AI21Provider
+from tokenlens.providers.amazon_provider import AmazonProvider
+from tokenlens.providers.anthropic_provider import AnthropicProvider
+from tokenlens.providers.cohere_provider import CohereProvider
+from tokenlens.providers.google_provider import GoogleProvider
+from tokenlens.providers.limits import ModelRegistry
+from tokenlens.providers.meta_provider import MetaProvider
+from tokenlens.providers.midjourney_provider import MidjourneyProvider
+from tokenlens.providers.mistral_provider import MistralProvider
+from tokenlens.providers.stability_provider import StabilityProvider
+
+TEXT_PROVIDERS = [AI21Provider, AmazonProvider, AnthropicProvider, CohereProvider, GoogleProvider, MetaProvider, MistralProvider]
+IMAGE_PROVIDERS = [AdobeProvider, AmazonProvider, GoogleProvider, MidjourneyProvider, StabilityProvider]
+
+@pytest.mark.parametrize("provider_class", TEXT_PROVIDERS)
+def test_every_listed_text_model_passes_check_text_limits(provider_class):
+    provider = provider_class()
+    models = provider.get_supported_models("text")
+    assert models
+    for model in models:
+        result = provider.check_text_limits(model, "hello world")
+        assert result["valid"], model
+        assert result["token_limit"] == provider.get_model_limits(model)["token_limit"]
+
+@pytest.mark.parametrize("provider_class", IMAGE_PROVIDERS)
+def test_every_listed_image_model_passes_check_image_limits(provider_class):
+    provider = provider_class()
+    models = provider.get_supported_models("image")
+    assert models
+    for model in models:
+        assert provider.check_image_limits(model, {"width": 256, "height": 256})["valid"], model
+
+@pytest.mark.parametrize("provider_class", TEXT_PROVIDERS + IMAGE_PROVIDERS)
+def test_limits_come_from_the_registry(provider_class):
+    provider = provider_class()
+    name = provider._provider_name()
+    every = provider.get_model_limits("")
+    assert set(every) == set(ModelRegistry.get_provider_models(name))
+    assert set(provider.get_supported_models()) == set(every)
+    for model, limits in every.items():
+        assert provider.get_model_limits(model) == limits == ModelRegistry.get(name, model).to_dict()
+    assert set(provider.get_supported_features()) == {limits["type"] for limits in every.values()}
+
+@pytest.mark.parametrize("provider_class", TEXT_PROVIDERS + IMAGE_PROVIDERS)
+def test_limits_are_plain_copies(provider_class):
+    provider = provider_class()
+    every = provider.get_model_limits("")
+    json.dumps(every)
+    model = next(iter(every))
+    provider.get_model_limits(model)["type"] = "changed"
+    assert provider.get_model_limits(model) == every[model]
+
+def test_config_only_model_is_served():
+    # claude-3-5-sonnet is listed only in models.yaml, not in the provider's table
+    result = AnthropicProvider().check_text_limits("claude-3-5-sonnet", "hello")
+    assert result["valid"] and result["token_limit"] == 200000
+
+def test_unknown_model_is_rejected():
+    with pytest.raises(ValueError):
+        AnthropicProvider().check_text_limits("claude-0", "hello")
+    assert AnthropicProvider().get_model_limits("claude-0") == {}
+
+class SlowProvider(AnthropicProvider):
+    """Counts with a blocking provider-specific call instead of a shared tokenizer."""
+
+    provider_name = "anthropic"
+    tokenizer_name = None
+
+    def _count_tokens(self, content):
+        time.sleep(0.3)
+        return len(content.split())
+
+def test_acheck_text_limits_does_not_block_the_event_loop():
+    provider = SlowProvider()
+
+    async def check_while_ticking():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.ensure_future(tick())
+        result = await provider.acheck_text_limits("claude-2.1", "one two three")
+        ticker.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(check_while_ticking())
+    assert (result["valid"], result["token_count"], result["exact"]) == (True, 3, True)
+    # The loop kept running while the client was counting
+    assert ticks >= 10
+
+def test_results_and_estimates_use_the_provider_name():
+    class ClaudeProvider(AnthropicProvider):
+        provider_name = "anthropic"
+
+    class ImagesProvider(StabilityProvider):
+        provider_name = "stability"
+
+    provider = ClaudeProvider()
+    assert provider._get_estimator("claude-2.1").family == "claude"
+    assert provider.check_text_limits("claude-2.1", "hello world")["provider"] == "anthropic"
+    model = ImagesProvider().get_supported_models("image")[0]
+    assert ImagesProvider().check_image_limits(model, {"width": 1, "height": 1})["provider"] == "stability"
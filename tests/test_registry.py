@@ -0,0 +1,112 @@
+"""Test that the registry shares tokenizers and encodings across callers."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import ENCODING_NAME
+from tokenlens.providers.amazon_provider import AmazonProvider
+from tokenlens.providers.anthropic_provider import AnthropicProvider
+from tokenlens.providers.cohere_provider import CohereProvider
+from tokenlens.providers.google_provider import GoogleProvider
+from tokenlens.providers.meta_provider import MetaProvider
+from tokenlens.providers.mistral_provider import MistralProvider
+from tokenlens.tokenizers.factory import TokenizerFactory
+from tokenlens.tokenizers.openai_tokenizer import OpenAITokenizer
+from tokenlens.tokenizers.registry import TokenizerRegistry
+
+class FailingTokenizer(OpenAITokenizer):
+    """Fails to construct, like a vocabulary download while offline."""
+
+    constructions = 0
+
+    def __init__(self, model_name="gpt-4", api_key=None):
+        FailingTokenizer.constructions += 1
+        raise ValueError("Failed to initialize tokenizer: offline")
+
+@pytest.fixture
+def failing(monkeypatch):
+    """Register FailingTokenizer as "failing" with the factory."""
+    lookup = TokenizerFactory.get_tokenizer.__func__
+    monkeypatch.setattr(
+        TokenizerFactory,
+        "get_tokenizer",
+        classmethod(lambda cls, name: FailingTokenizer if name == "failing" else lookup(cls, name)),
+    )
+    FailingTokenizer.constructions = 0
+    yield "failing"
+    TokenizerRegistry._failures.clear()
+
+def test_aliases_share_one_instance(encoding):
+    tokenizer = TokenizerRegistry.get_tokenizer("openai", ENCODING_NAME)
+    assert isinstance(tokenizer, OpenAITokenizer)
+    assert TokenizerRegistry.get_tokenizer("openai", ENCODING_NAME) is tokenizer
+    assert TokenizerRegistry.get_tokenizer("microsoft.azure", ENCODING_NAME) is tokenizer
+    assert TokenizerFactory.get_shared_tokenizer("amazon.titan", ENCODING_NAME) is tokenizer
+
+def test_options_key_separate_instances(encoding):
+    plain = TokenizerRegistry.get_tokenizer("openai", ENCODING_NAME)
+    keyed = TokenizerRegistry.get_tokenizer("openai", ENCODING_NAME, api_key="key")
+    assert keyed is not plain
+    assert TokenizerRegistry.get_tokenizer("openai", ENCODING_NAME, api_key="key") is keyed
+    # Both still use the one shared encoding
+    assert keyed.tokenizer is plain.tokenizer is TokenizerRegistry.get_encoding(ENCODING_NAME) is encoding
+
+def test_tokenizers_share_encodings(encoding):
+    assert OpenAITokenizer(ENCODING_NAME).tokenizer is OpenAITokenizer(ENCODING_NAME).tokenizer is encoding
+
+def test_concurrent_callers_get_one_instance(encoding, monkeypatch):
+    constructions = []
+    init = OpenAITokenizer.__init__
+
+    def counting_init(self, *args, **kwargs):
+        constructions.append(threading.get_ident())
+        init(self, *args, **kwargs)
+
+    monkeypatch.setattr(OpenAITokenizer, "__init__", counting_init)
+    with ThreadPoolExecutor(16) as pool:
+        tokenizers = list(pool.map(
+            lambda _: TokenizerRegistry.get_tokenizer("openai", ENCODING_NAME, api_key="concurrent"), range(64)
+        ))
+    assert all(tokenizer is tokenizers[0] for tokenizer in tokenizers)
+    assert len(constructions) == 1
+
+def test_unknown_tokenizers_are_none():
+    assert TokenizerRegistry.get_tokenizer("no-such-tokenizer") is None
+    assert TokenizerRegistry.get_tokenizer("stability") is None
+
+def test_failed_constructions_are_not_retried(failing):
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            TokenizerRegistry.get_tokenizer(failing, "gpt-4")
+    assert FailingTokenizer.constructions == 1
+    TokenizerRegistry._failures.clear()
+    with pytest.raises(ValueError):
+        TokenizerRegistry.get_tokenizer(failing, "gpt-4")
+    assert FailingTokenizer.constructions == 2
+
+def test_provider_tokenizer_failures_are_cached(failing):
+    provider = AmazonProvider()
+    provider.tokenizer_name = failing
+    for _ in range(3):
+        assert provider._get_tokenizer() is None
+        assert provider.check_text_limits("amazon.titan-text-express-v1", "hello")["exact"] is False
+    assert FailingTokenizer.constructions == 1
+
+@pytest.mark.parametrize(
+    "provider_class, tokenizer_name",
+    [
+        (AmazonProvider, "amazon.titan"),
+        (AnthropicProvider, "anthropic"),
+        (CohereProvider, "cohere"),
+        (GoogleProvider, "google"),
+        (MetaProvider, "meta"),
+        (MistralProvider, "mistral"),
+    ],
+)
+def test_providers_use_the_shared_tokenizers(provider_class, tokenizer_name):
+    assert provider_class.tokenizer_name == tokenizer_name
+    provider = provider_class()
+    tokenizer = provider._get_tokenizer()
+    assert tokenizer is None or tokenizer is provider_class()._get_tokenizer()
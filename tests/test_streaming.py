@@ -0,0 +1,110 @@
+"""Test streaming token counts and the safe boundaries they cut text at."""
+
+import io
+
+import pytest
+
+from tokenlens.tokenizers.base import BaseTokenizer
+from tokenlens.tokenizers.boundaries import (
+    find_safe_boundary,
+    is_safe_boundary,
+    iter_decoded,
+    iter_safe_chunks,
+    iter_text,
+    next_safe_boundary,
+)
+
+TEXTS = [
+    "",
+    "word",
+    "The quick brown fox jumps over the lazy dog.\n\nA second paragraph follows. " * 40,
+    "日本語のテキストとトークン。" * 200,
+    "Café naïve résumé 🙂🚀 12345 " * 150,
+    "  leading and trailing whitespace  \n\n\n",
+    "x" * 5000,
+]
+
+def test_is_safe_boundary():
+    text = "ab cd"
+    assert is_safe_boundary(text, 2)
+    assert not is_safe_boundary(text, 1)
+    assert not is_safe_boundary(text, 3)
+    assert not is_safe_boundary(text, 0)
+    assert not is_safe_boundary(text, len(text))
+
+def test_find_and_next_safe_boundary():
+    text = "one two three"
+    assert find_safe_boundary(text, len(text)) == 7
+    assert find_safe_boundary(text, 6) == 3
+    assert find_safe_boundary(text, 2) == -1
+    assert next_safe_boundary(text, 0, len(text)) == 3
+    assert next_safe_boundary(text, 4, len(text)) == 7
+    assert next_safe_boundary("nospaces", 0, 8) == -1
+
+@pytest.mark.parametrize("text", TEXTS)
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 16])
+def test_safe_chunks_join_up_and_keep_tokens(tokenizer, text, chunk_size):
+    chunks = list(iter_safe_chunks(text, chunk_size))
+    assert "".join(chunks) == text
+    assert all(chunks)
+    assert sum(tokenizer.count_tokens(chunk) for chunk in chunks) == tokenizer.count_tokens(text)
+
+def test_iter_text_sources():
+    text = "abcdefghij"
+    assert list(iter_text(text, 4)) == ["abcd", "efgh", "ij"]
+    assert "".join(iter_text(io.StringIO(text), 3)) == text
+    assert list(iter_text(["ab", "", "cd"])) == ["ab", "cd"]
+    assert list(iter_text("")) == []
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5])
+def test_iter_decoded_carries_split_characters(chunk_size):
+    text = "aé日🙂b"
+    assert "".join(iter_decoded(text.encode("utf-8"), chunk_size)) == text
+
+@pytest.mark.parametrize("text", TEXTS)
+@pytest.mark.parametrize("chunk_size", [1, 10, 4096])
+def test_count_tokens_stream_matches_count_tokens(tokenizer, text, chunk_size):
+    expected = tokenizer.count_tokens(text)
+    assert tokenizer.count_tokens_stream(text, chunk_size) == expected
+    assert tokenizer.count_tokens_stream(io.StringIO(text), chunk_size) == expected
+    assert tokenizer.count_tokens_stream(iter(text.splitlines(keepends=True)), chunk_size) == expected
+
+class WordTokenizer(BaseTokenizer):
+    """Uses BaseTokenizer's default stream, byte and file counts, with one token per word."""
+
+    def encode(self, text):
+        return [len(word) for word in text.split()]
+
+    def decode(self, tokens):
+        raise NotImplementedError
+
+@pytest.fixture(params=["tiktoken", "default"])
+def any_tokenizer(request, tokenizer):
+    return tokenizer if request.param == "tiktoken" else WordTokenizer()
+
+@pytest.mark.parametrize("text", TEXTS)
+# Chunk sizes of 1 and 5 bytes split the multi-byte characters across chunks
+@pytest.mark.parametrize("chunk_size", [1, 5, 64, 1 << 16])
+def test_count_tokens_file_matches_count_tokens(any_tokenizer, tmp_path, text, chunk_size):
+    expected = any_tokenizer.count_tokens(text)
+    path = tmp_path / "input.txt"
+    path.write_bytes(text.encode("utf-8"))
+    assert any_tokenizer.count_tokens_file(path, chunk_size=chunk_size) == expected
+    data = text.encode("utf-8")
+    for buffer in (data, bytearray(data), memoryview(data)):
+        assert any_tokenizer.count_tokens_bytes(buffer, chunk_size=chunk_size) == expected
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 4096])
+def test_count_tokens_bytes_other_encodings(any_tokenizer, tmp_path, chunk_size):
+    text = TEXTS[4]
+    expected = any_tokenizer.count_tokens(text)
+    assert any_tokenizer.count_tokens_bytes(text.encode("utf-16"), "utf-16", chunk_size) == expected
+    path = tmp_path / "latin.txt"
+    path.write_bytes("Café naïve résumé".encode("latin-1"))
+    assert any_tokenizer.count_tokens_file(path, "latin-1", chunk_size) == any_tokenizer.count_tokens("Café naïve résumé")
+
+def test_count_tokens_file_rejects_invalid_bytes(any_tokenizer, tmp_path):
+    path = tmp_path / "invalid.txt"
+    path.write_bytes(b"valid \xff\xfe")
+    with pytest.raises(UnicodeDecodeError):
+        any_tokenizer.count_tokens_file(path)
@@ -0,0 +1,175 @@
+"""Test the pooled HTTP transport against a local stand-in server."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from tokenlens.transport import HTTPTransport
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers like a tokenizer REST API, with endpoints for failure modes."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        server.client_ports.add(self.client_address[1])
+        server.paths.append(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+
+        if self.path == "/count_tokens":
+            self._reply(200, {"count": len(payload["text"].split())})
+        elif self.path == "/flaky":
+            server.flaky_calls += 1
+            if server.flaky_calls <= 2:
+                self._reply(503, {"error": "unavailable"})
+            else:
+                self._reply(200, {"ok": True})
+        elif self.path == "/down":
+            self._reply(503, {"error": "unavailable"})
+        elif self.path == "/slow":
+            time.sleep(2)
+            self._reply(200, {"ok": True})
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def server():
+    """Run the stand-in server on a free local port."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    httpd.daemon_threads = True
+    httpd.client_ports = set()
+    httpd.paths = []
+    httpd.flaky_calls = 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def base_url(httpd):
+    return f"http://127.0.0.1:{httpd.server_address[1]}"
+
+def test_connections_are_reused(server):
+    transport = HTTPTransport(base_url(server))
+    for _ in range(5):
+        assert transport.post("count_tokens", json={"text": "a b c"}).json() == {"count": 3}
+    assert len(server.client_ports) == 1
+
+def test_retries_transient_errors(server):
+    transport = HTTPTransport(base_url(server), backoff=0.01)
+    response = transport.post("flaky", json={})
+    assert response.status_code == 200
+    assert server.flaky_calls == 3
+
+def test_returns_last_response_when_retries_run_out(server):
+    transport = HTTPTransport(base_url(server), max_retries=2, backoff=0.01)
+    assert transport.post("down", json={}).status_code == 503
+
+def test_deadline_bounds_slow_endpoint(server):
+    transport = HTTPTransport(base_url(server), backoff=0.01)
+    start = time.monotonic()
+    with pytest.raises(requests.Timeout):
+        transport.post("slow", json={}, deadline=0.3)
+    assert time.monotonic() - start < 1.5
+
+def test_async_post(server):
+    transport = HTTPTransport(base_url(server))
+
+    async def count():
+        try:
+            return await transport.apost("count_tokens", json={"text": "one two"})
+        finally:
+            await transport.aclose()
+
+    assert asyncio.run(count()) == (200, {"count": 2})
+
+def test_deepmind_tokenizer_uses_transport(server):
+    from tokenlens.tokenizers.deepmind_tokenizer import DeepMindTokenizer
+
+    tokenizer = DeepMindTokenizer(api_key="test-key", base_url=base_url(server))
+    assert tokenizer.count_tokens("four words right here") == 4
+    assert tokenizer.count_tokens("two words") == 2
+    assert len(server.client_ports) == 1
+
+def test_deepmind_tokenizer_does_not_swallow_cancellation(server):
+    from tokenlens.tokenizers.deepmind_tokenizer import DeepMindTokenizer
+
+    tokenizer = DeepMindTokenizer(api_key="test-key", base_url=base_url(server))
+
+    async def cancelled(endpoint, payload):
+        raise asyncio.CancelledError
+
+    tokenizer._apost = cancelled
+    for method, argument in [("aencode", "text"), ("adecode", [1, 2]), ("acount_tokens", "text")]:
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(getattr(tokenizer, method)(argument))
+
+def test_deepmind_tokenizer_failures_raise_after_one_request(server):
+    from tokenlens.tokenizers.deepmind_tokenizer import DeepMindTokenizer
+
+    # The stand-in server has no tokenize/detokenize endpoints
+    tokenizer = DeepMindTokenizer(api_key="test-key", base_url=base_url(server))
+    with pytest.raises(ValueError):
+        tokenizer.encode("text")
+    for method, argument in [("aencode", "text"), ("adecode", [1, 2])]:
+        with pytest.raises(ValueError):
+            asyncio.run(getattr(tokenizer, method)(argument))
+    assert server.paths == ["/tokenize", "/tokenize", "/detokenize"]
+
+    unauthorized = DeepMindTokenizer(base_url=base_url(server))
+    for method, argument in [("aencode", "text"), ("adecode", [1, 2]), ("acount_tokens", "text")]:
+        with pytest.raises(ValueError):
+            asyncio.run(getattr(unauthorized, method)(argument))
+    assert len(server.paths) == 3
+
+def test_async_sessions_close_with_their_event_loop(server):
+    transport = HTTPTransport(base_url(server))
+    sessions = []
+
+    async def count():
+        status, body = await transport.apost("count_tokens", json={"text": "one two"})
+        sessions.append(transport._async_sessions[asyncio.get_running_loop()][0])
+        return status, body
+
+    assert asyncio.run(count()) == (200, {"count": 2})
+    assert asyncio.run(count()) == (200, {"count": 2})
+    assert sessions[0] is not sessions[1]
+    assert all(session.closed for session in sessions)
+    assert transport._async_sessions == {}
+
+# The session of a loop closed without shutdown_asyncgens can only be dropped, not closed
+@pytest.mark.filterwarnings("ignore:Unclosed client session:ResourceWarning")
+def test_async_sessions_of_closed_loops_are_dropped(server):
+    transport = HTTPTransport(base_url(server))
+    loop = asyncio.new_event_loop()
+    # Closing the loop directly skips shutdown_asyncgens, so the session stays open
+    loop.run_until_complete(transport.apost("count_tokens", json={"text": "one"}))
+    loop.close()
+    assert loop in transport._async_sessions
+
+    async def count():
+        try:
+            return await transport.apost("count_tokens", json={"text": "one two"})
+        finally:
+            await transport.aclose()
+
+    assert asyncio.run(count()) == (200, {"count": 2})
+    assert transport._async_sessions == {}
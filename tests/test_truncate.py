@@ -0,0 +1,68 @@
+"""Test shortening text to a token budget."""
+
+import pytest
+
+from tokenlens.tokenizers.base import BaseTokenizer
+
+TEXTS = [
+    "The quick brown fox jumps over the lazy dog.\n\nA second paragraph follows. " * 30,
+    "日本語のテキストとトークン。" * 100,
+    "Café naïve résumé 🎉🚀 12345 " * 60,
+    "🎉" * 300,
+]
+
+class NoOffsets(BaseTokenizer):
+    """Wraps a tokenizer but hides its offsets, so cuts are found by binary search."""
+
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+
+    def encode(self, text):
+        return self.tokenizer.encode(text)
+
+    def decode(self, tokens):
+        return self.tokenizer.decode(tokens)
+
+@pytest.fixture(params=["offsets", "search"])
+def truncate_tokenizer(request, tokenizer):
+    return tokenizer if request.param == "offsets" else NoOffsets(tokenizer)
+
+@pytest.mark.parametrize("strategy", ["head", "tail", "middle"])
+@pytest.mark.parametrize("max_tokens", [0, 1, 7, 100])
+def test_result_fits_and_keeps_the_right_parts(truncate_tokenizer, strategy, max_tokens):
+    for text in TEXTS:
+        result = truncate_tokenizer.truncate(text, max_tokens, strategy)
+        count = truncate_tokenizer.count_tokens(result)
+        assert count <= max_tokens
+        # Cuts fall between tokens, so little of the budget is left unused
+        assert count >= max_tokens - 6
+        if strategy == "head":
+            assert text.startswith(result)
+        elif strategy == "tail":
+            assert text.endswith(result)
+        else:
+            assert any(
+                text.startswith(result[:cut]) and text.endswith(result[cut:])
+                for cut in range(len(result) + 1)
+            )
+
+def test_short_text_is_returned_unchanged(truncate_tokenizer):
+    for text in ["", "hello world", TEXTS[0]]:
+        budget = truncate_tokenizer.count_tokens(text)
+        for strategy in ["head", "tail", "middle"]:
+            assert truncate_tokenizer.truncate(text, budget, strategy) is text
+
+def test_zero_budget_empties_the_text(truncate_tokenizer):
+    assert truncate_tokenizer.truncate(TEXTS[0], 0) == ""
+    assert truncate_tokenizer.truncate("", 0) == ""
+
+def test_middle_keeps_both_ends(tokenizer):
+    text = "start " + "filler words " * 200 + "end"
+    result = tokenizer.truncate(text, 20, "middle")
+    assert result.startswith("start") and result.endswith("end")
+
+def test_rejects_bad_arguments(tokenizer):
+    with pytest.raises(ValueError):
+        tokenizer.truncate("hello", -1)
+    with pytest.raises(ValueError):
+        tokenizer.truncate("hello", 1, "sides")
@@ -1,57 +1,20 @@
 """TokenLens: A library for accurate token counting and limit validation across various LLM providers."""
 
-from .tokenizers import BaseTokenizer, OpenAITokenizer
-
-# Optional tokenizers
-try:
-    from .tokenizers import AnthropicTokenizer
-except ImportError:
-    AnthropicTokenizer = None
-
-try:
-    from .tokenizers import MistralTokenizer
-except ImportError:
-    MistralTokenizer = None
-
-try:
-    from .tokenizers import CohereTokenizer
-except ImportError:
-    CohereTokenizer = None
-
-try:
-    from .tokenizers import MetaTokenizer
-except ImportError:
-    MetaTokenizer = None
-
-try:
-    from .tokenizers import GoogleTokenizer
-except ImportError:
-    GoogleTokenizer = None
+from importlib import import_module
 
-try:
-    from .tokenizers import HuggingFaceTokenizer
-except ImportError:
-    HuggingFaceTokenizer = None
-
-try:
-    from .tokenizers import AI21Tokenizer
-except ImportError:
-    AI21Tokenizer = None
-
-try:
-    from .tokenizers import DeepMindTokenizer
-except ImportError:
-    DeepMindTokenizer = None
-
-try:
-    from .tokenizers import QwenTokenizer
-except ImportError:
-    QwenTokenizer = None
+from . import tokenizers
+from .tokenizers import BaseTokenizer, OpenAITokenizer
 
-try:
-    from .tokenizers import StanfordTokenizer
-except ImportError:
-    StanfordTokenizer = None
+# Attributes imported on first access (PEP 562), so `import tokenlens` does not
+# load provider SDKs. Optional tokenizers resolve to None when their
+# dependencies are not installed.
+_LAZY_ATTRIBUTES = {
+    **{name: "tokenizers" for name in tokenizers._OPTIONAL_TOKENIZERS},
+    "ConversationCounter": "conversation",
+    "TokenizedDocument": "document",
+    "TextChunker": "chunker",
+    "chunk_text": "chunker",
+}
 
 __version__ = "0.1.6"
 
@@ -68,4 +31,19 @@ __all__ = [
     "DeepMindTokenizer",
     "QwenTokenizer",
     "StanfordTokenizer",
+    "ConversationCounter",
+    "TokenizedDocument",
+    "TextChunker",
+    "chunk_text",
 ]
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
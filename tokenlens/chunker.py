@@ -0,0 +1,392 @@
+"""Splitting text into chunks that fit a token budget."""
+
+import math
+import re
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .tokenizers.base import BaseTokenizer
+from .tokenizers.boundaries import (
+    DEFAULT_CHUNK_SIZE,
+    TextSource,
+    find_safe_boundary,
+    iter_safe_chunks,
+    next_safe_boundary,
+)
+from .tokenizers.registry import TokenizerRegistry
+
+# Cut preferences, best first
+_PARAGRAPH = 3
+_SENTENCE = 2
+_WHITESPACE = 1
+
+_SENTENCE_END = ".!?"
+
+# Chunks this short are re-counted whole instead of by their edges
+_SHORT_CHUNK = 64
+
+# Sentences (or paragraphs) with their trailing whitespace, and words
+_SENTENCE_PIECE = re.compile(r".*?(?:[.!?]+(?=\s)|\n\n|$)\s*", re.S)
+_WORD_PIECE = re.compile(r"\s*\S+\s*|\s+")
+
+Chunk = Dict[str, Any]
+
+class TextChunker:
+    """Split text into chunks of at most max_tokens tokens.
+
+    With a tokenizer that reports token offsets (OpenAITokenizer), the text is
+    encoded once, piece by piece, and chunks are cut between tokens. Each cut
+    looks back from the budget (down to min_fill of it) for a paragraph break,
+    then a sentence end, then whitespace. A chunk's exact standalone count is
+    its number of tokens corrected at the two edges, where the cut may change
+    how the text tokenizes; only the short stretch between each edge and the
+    nearest safe boundary (see tokenizers.boundaries) is re-encoded.
+
+    Other tokenizers split the text into sentences (and sentences that are
+    too long into words), count each piece once and pack pieces greedily;
+    each chunk is then counted once more to report its exact count.
+
+    Chunks are dicts with the 1-based "batch" number, "start_char" and
+    "end_char" (text[start_char:end_char] is the chunk) and "tokens".
+    Once a run with token offsets has used up its source, total_tokens is
+    the token count of the whole text; otherwise it is None.
+    """
+
+    def __init__(
+        self,
+        tokenizer: BaseTokenizer,
+        max_tokens: int,
+        overlap: int = 0,
+        min_fill: float = 0.5,
+        segment_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """Initialize the chunker.
+
+        Args:
+            tokenizer: Tokenizer that counts the chunks
+            max_tokens: Largest number of tokens in a chunk
+            overlap: Tokens each chunk repeats from the end of the previous one
+            min_fill: Smallest fraction of max_tokens a chunk is cut at to end on a boundary
+            segment_size: Characters read and encoded at a time
+        """
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be at least 1")
+        if not 0 <= overlap * 2 < max_tokens:
+            raise ValueError("overlap must be at least 0 and less than half of max_tokens")
+        if not 0 < min_fill <= 1:
+            raise ValueError("min_fill must be in (0, 1]")
+        self.tokenizer = tokenizer
+        self.max_tokens = max_tokens
+        self.overlap = overlap
+        self.min_fill = min_fill
+        self.segment_size = segment_size
+        self.total_tokens: Optional[int] = None
+
+    def chunks(self, source: TextSource) -> Iterator[Chunk]:
+        """Iterate over the chunks of a string, text file object or iterable of strings."""
+        self.total_tokens = None
+        if getattr(self.tokenizer, "supports_offsets", False):
+            return self._token_chunks(source)
+        return self._piece_chunks(source)
+
+    def _token_chunks(self, source: TextSource) -> Iterator[Chunk]:
+        """Cut chunks between the tokens of text encoded once with offsets."""
+        segments = iter_safe_chunks(source, self.segment_size)
+        exhausted = False
+        # Buffered text starting at character base, with its tokens and their offsets into it
+        text = ""
+        base = 0
+        tokens: List[int] = []
+        offsets: List[int] = []
+        start = 0
+        number = 0
+        # Tokens of all segments encoded so far, which are cut at safe boundaries
+        encoded = 0
+        while True:
+            # Buffer one token past the budget so the cut search sees a full window
+            while not exhausted and len(tokens) - start <= self.max_tokens:
+                segment = next(segments, None)
+                if segment is None:
+                    exhausted = True
+                    break
+                segment_tokens, segment_offsets = self.tokenizer.encode_with_offsets(segment)
+                encoded += len(segment_tokens)
+                offsets.extend(len(text) + offset for offset in segment_offsets)
+                tokens.extend(segment_tokens)
+                text += segment
+            if start >= len(tokens):
+                self.total_tokens = encoded
+                return
+
+            last = len(tokens)
+            if exhausted and last - start <= self.max_tokens:
+                end = last
+            else:
+                end = self._find_cut(text, offsets, start, min(start + self.max_tokens, last))
+            count = self._count_chunk(text, offsets, start, end)
+            while count > self.max_tokens:
+                shorter = self._valid_cut(offsets, start, end - (count - self.max_tokens))
+                if shorter >= end:
+                    break
+                end = shorter
+                count = self._count_chunk(text, offsets, start, end)
+
+            number += 1
+            yield {
+                "batch": number,
+                "start_char": base + _offset(text, offsets, start),
+                "end_char": base + _offset(text, offsets, end),
+                "tokens": count,
+            }
+            if end >= last and exhausted:
+                self.total_tokens = encoded
+                return
+
+            next_start = self._valid_cut(offsets, start, end - self.overlap)
+            start = next_start if next_start > start else end
+            # Drop consumed text once it outweighs what is still buffered
+            if start > len(tokens) // 2:
+                shift = offsets[start]
+                text = text[shift:]
+                base += shift
+                offsets = [offset - shift for offset in offsets[start:]]
+                del tokens[:start]
+                start = 0
+
+    def _find_cut(self, text: str, offsets: List[int], start: int, end: int) -> int:
+        """Find the best token index to end a chunk at, at most end."""
+        lowest = start + max(1, int(self.max_tokens * self.min_fill))
+        best = {}
+        for index in range(end, lowest - 1, -1):
+            position = _offset(text, offsets, index)
+            if index < len(offsets) and index > 0 and offsets[index] == offsets[index - 1]:
+                continue
+            level = _cut_level(text, position)
+            if level and level not in best:
+                best[level] = index
+                if level == _PARAGRAPH:
+                    break
+        if best:
+            return best[max(best)]
+        return self._valid_cut(offsets, start, end)
+
+    def _valid_cut(self, offsets: List[int], start: int, index: int) -> int:
+        """Move a token index back to the nearest one that starts a character, staying after start."""
+        index = min(index, len(offsets))
+        while index > start + 1 and index < len(offsets) and offsets[index] == offsets[index - 1]:
+            index -= 1
+        if index > start:
+            return index
+        # Cannot cut inside the first character; end after it instead
+        index = start + 1
+        while index < len(offsets) and offsets[index] == offsets[index - 1]:
+            index += 1
+        return index
+
+    def _count_chunk(self, text: str, offsets: List[int], start: int, end: int) -> int:
+        """Count the tokens of the chunk between two token indices as standalone text."""
+        start_char = _offset(text, offsets, start)
+        end_char = _offset(text, offsets, end)
+        if end - start <= _SHORT_CHUNK:
+            return self.tokenizer.count_tokens(text[start_char:end_char])
+        first = next_safe_boundary(text, start_char, end_char)
+        if first == -1:
+            return self.tokenizer.count_tokens(text[start_char:end_char])
+        last = find_safe_boundary(text, end_char, first - 1)
+        # Tokens start exactly at safe boundaries, so only the edges can differ
+        inner = bisect_left(offsets, last, start, end) - bisect_left(offsets, first, start, end)
+        head = self.tokenizer.count_tokens(text[start_char:first])
+        tail = self.tokenizer.count_tokens(text[last:end_char]) if last < end_char else 0
+        return head + inner + tail
+
+    def _piece_chunks(self, source: TextSource) -> Iterator[Chunk]:
+        """Pack counted sentence or word pieces into chunks."""
+        # Pieces of the chunk being built; the first `emitted` are the previous chunk's overlap
+        pending: List[Tuple[int, str, int]] = []
+        pending_tokens = 0
+        emitted = 0
+        number = 0
+        position = 0
+        for segment in iter_safe_chunks(source, self.segment_size):
+            for piece in self._count_pieces(segment, position, _SENTENCE_PIECE):
+                while pending_tokens + piece[2] > self.max_tokens and len(pending) > emitted:
+                    number += 1
+                    chunk, size = self._emit(pending, number)
+                    yield chunk
+                    overlap_start = self._overlap_start(pending, size)
+                    pending = pending[overlap_start:]
+                    emitted = size - overlap_start
+                    pending_tokens = sum(count for _, _, count in pending)
+                if pending_tokens + piece[2] > self.max_tokens:
+                    pending, pending_tokens, emitted = [], 0, 0
+                pending.append(piece)
+                pending_tokens += piece[2]
+            position += len(segment)
+        while len(pending) > emitted:
+            number += 1
+            chunk, size = self._emit(pending, number)
+            yield chunk
+            overlap_start = self._overlap_start(pending, size) if size < len(pending) else size
+            pending = pending[overlap_start:]
+            emitted = size - overlap_start
+
+    def _emit(self, pending: List[Tuple[int, str, int]], number: int) -> Tuple[Chunk, int]:
+        """Count the pending pieces as one chunk, dropping trailing pieces until it fits.
+
+        Returns:
+            The chunk and the number of pieces it holds
+        """
+        size = len(pending)
+        while True:
+            chunk_text = "".join(piece for _, piece, _ in pending[:size])
+            count = self.tokenizer.count_tokens(chunk_text)
+            if count <= self.max_tokens or size == 1:
+                break
+            size -= 1
+        chunk = {
+            "batch": number,
+            "start_char": pending[0][0],
+            "end_char": pending[0][0] + len(chunk_text),
+            "tokens": count,
+        }
+        return chunk, size
+
+    def _overlap_start(self, pending: List[Tuple[int, str, int]], size: int) -> int:
+        """Find the first of the chunk's trailing pieces that fit in the overlap."""
+        start = size
+        carried = 0
+        while start > 1 and carried + pending[start - 1][2] <= self.overlap:
+            start -= 1
+            carried += pending[start][2]
+        return start
+
+    def _count_pieces(self, text: str, position: int, pattern: "re.Pattern") -> Iterator[Tuple[int, str, int]]:
+        """Split text into pieces that fit max_tokens and count each once.
+
+        Sentences that do not fit are split into words, and words into halves.
+        """
+        pieces = [(position + m.start(), m.group()) for m in pattern.finditer(text) if m.group()]
+        counts = self.tokenizer.count_tokens_batch([piece for _, piece in pieces])
+        for (piece_start, piece), count in zip(pieces, counts):
+            if count <= self.max_tokens or len(piece) == 1:
+                yield piece_start, piece, count
+            elif pattern is _SENTENCE_PIECE:
+                yield from self._count_pieces(piece, piece_start, _WORD_PIECE)
+            else:
+                middle = len(piece) // 2
+                yield from self._count_pieces(piece, piece_start, re.compile(f"(?s).{{1,{middle}}}"))
+
+def _offset(text: str, offsets: List[int], index: int) -> int:
+    """Get the character offset of a token index, where one past the last token is the text end."""
+    return offsets[index] if index < len(offsets) else len(text)
+
+def _cut_level(text: str, position: int) -> int:
+    """Rate how natural a place position is to end a chunk at."""
+    if position <= 0 or position >= len(text):
+        return 0
+    before = text[position - 1]
+    after = text[position]
+    if text.startswith("\n\n", position) or text.startswith("\n\n", position - 2):
+        return _PARAGRAPH
+    if before in _SENTENCE_END and after.isspace():
+        return _SENTENCE
+    if before.isspace() and position >= 2 and text[position - 2] in _SENTENCE_END:
+        return _SENTENCE
+    if before.isspace() or after.isspace():
+        return _WHITESPACE
+    return 0
+
+def chunk_text(
+    text: TextSource,
+    max_tokens: int,
+    overlap: int = 0,
+    provider: str = "openai",
+    model: Optional[str] = None,
+    tokenizer: Optional[BaseTokenizer] = None,
+) -> Iterator[Chunk]:
+    """Split text into chunks of at most max_tokens tokens.
+
+    Args:
+        text: A string, text file object or iterable of strings
+        max_tokens: Largest number of tokens in a chunk
+        overlap: Tokens each chunk repeats from the end of the previous one
+        provider: Provider whose tokenizer counts the chunks
+        model: Optional model name to use for tokenization
+        tokenizer: Tokenizer to use instead of the provider's shared one
+
+    Returns:
+        Iterator of chunk dicts with "batch", "start_char", "end_char" and "tokens"
+    """
+    return TextChunker(_resolve_tokenizer(provider, model, tokenizer), max_tokens, overlap).chunks(text)
+
+def plan_batches(
+    text: str,
+    max_tokens: int,
+    overlap: int = 0,
+    provider: str = "openai",
+    model: Optional[str] = None,
+    tokenizer: Optional[BaseTokenizer] = None,
+    total_tokens: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Split text into batches that each fit max_tokens.
+
+    Args:
+        text: The text to split
+        max_tokens: Token budget of one batch
+        overlap: Tokens each batch repeats from the end of the previous one
+        provider: Provider whose tokenizer counts the batches
+        model: Optional model name to use for tokenization
+        tokenizer: Tokenizer to use instead of the provider's shared one
+        total_tokens: Token count of the whole text, if already known
+
+    Returns:
+        Dict with "total_tokens", "recommended_batch_size" (the budget spread
+        evenly over the fewest batches that can hold the text) and "batches"
+    """
+    tokenizer = _resolve_tokenizer(provider, model, tokenizer)
+    chunker = TextChunker(tokenizer, max_tokens, overlap)
+    batches = list(chunker.chunks(text))
+    if total_tokens is None:
+        # The chunker's per-segment counts add up to the whole text's when it encoded all of it
+        total_tokens = chunker.total_tokens
+    if total_tokens is None:
+        total_tokens = tokenizer.count_tokens(text)
+    return {
+        "total_tokens": total_tokens,
+        "recommended_batch_size": math.ceil(total_tokens / max(1, math.ceil(total_tokens / max_tokens))),
+        "batches": batches,
+    }
+
+def add_batches(
+    result: Dict[str, Any],
+    text: str,
+    provider: str = "openai",
+    model: Optional[str] = None,
+    tokenizer: Optional[BaseTokenizer] = None,
+    max_tokens: Optional[int] = None,
+    overlap: int = 0,
+) -> Dict[str, Any]:
+    """Add a batch plan to a check_text_limits result.
+
+    The budget is max_tokens, or else the result's "token_limit" (or
+    "model_max_tokens"). An exact count already in the result is reused.
+
+    Returns:
+        The result, with "recommended_batch_size" and "batches" set
+    """
+    limit = max_tokens or result.get("token_limit") or result.get("model_max_tokens")
+    if not limit:
+        raise ValueError("The result has no token limit to plan batches for")
+    total = result.get("token_count", result.get("total_tokens")) if result.get("exact", True) else None
+    plan = plan_batches(text, limit, overlap, provider, model, tokenizer, total)
+    result["recommended_batch_size"] = plan["recommended_batch_size"]
+    result["batches"] = plan["batches"]
+    return result
+
+def _resolve_tokenizer(provider: str, model: Optional[str], tokenizer: Optional[BaseTokenizer]) -> BaseTokenizer:
+    """Get the given tokenizer, or else the provider's shared one."""
+    if tokenizer is None:
+        tokenizer = TokenizerRegistry.get_tokenizer(provider, model)
+        if tokenizer is None:
+            raise ValueError(f"Provider {provider} not supported or its dependencies are not installed")
+    return tokenizer
@@ -0,0 +1,128 @@
+"""Incremental token counting for chat conversations."""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .tokenizers.base import BaseTokenizer
+from .tokenizers.registry import TokenizerRegistry
+
+# Chat formatting overhead of OpenAI models, per the chat markup they use:
+# (tokens per message, tokens per "name" field)
+_OVERHEAD_0301 = (4, -1)
+_OVERHEAD_DEFAULT = (3, 1)
+# Every reply is primed with <|start|>assistant<|message|>
+REPLY_PRIMING_TOKENS = 3
+
+Message = Dict[str, Any]
+
+def message_overhead(model: Optional[str] = None) -> Tuple[int, int]:
+    """Get the (per-message, per-name) token overhead of a chat model."""
+    if model and model.startswith("gpt-3.5-turbo-0301"):
+        return _OVERHEAD_0301
+    return _OVERHEAD_DEFAULT
+
+class ConversationCounter:
+    """Running token count of a chat transcript.
+
+    Each message is tokenized once when it is added or edited; the total is
+    kept up to date, so appending a turn costs only that turn's tokens rather
+    than a re-count of the whole history.
+    """
+
+    def __init__(
+        self,
+        messages: Iterable[Message] = (),
+        provider: str = "openai",
+        model: Optional[str] = None,
+        tokenizer: Optional[BaseTokenizer] = None,
+    ):
+        """Initialize the counter.
+
+        Args:
+            messages: Initial messages, dicts with "role", "content" and optionally "name"
+            provider: Provider whose tokenizer counts the messages
+            model: Model name, which also selects the formatting overhead
+            tokenizer: Tokenizer to use instead of the provider's shared one
+        """
+        if tokenizer is None:
+            tokenizer = TokenizerRegistry.get_tokenizer(provider, model)
+            if tokenizer is None:
+                raise ValueError(f"Provider {provider} not supported or its dependencies are not installed")
+        self.tokenizer = tokenizer
+        self.tokens_per_message, self.tokens_per_name = message_overhead(model)
+        self._messages: List[Message] = []
+        self._counts: List[int] = []
+        self._total = 0
+        self.extend(messages)
+
+    @property
+    def total(self) -> int:
+        """Tokens the whole conversation takes as a prompt, including reply priming."""
+        return self._total + REPLY_PRIMING_TOKENS
+
+    @property
+    def messages(self) -> List[Message]:
+        """The messages, in order (a copy of the list)."""
+        return list(self._messages)
+
+    def message_tokens(self, index: int) -> int:
+        """Tokens taken by one message, including its formatting overhead."""
+        return self._counts[index]
+
+    def append(self, message: Message) -> int:
+        """Add a message at the end and return its token count."""
+        count = self.count_message(message)
+        self._messages.append(message)
+        self._counts.append(count)
+        self._total += count
+        return count
+
+    def extend(self, messages: Iterable[Message]) -> None:
+        """Add several messages at the end."""
+        for message in messages:
+            self.append(message)
+
+    def pop(self, index: int = -1) -> Message:
+        """Remove a message (the last one by default) and return it."""
+        self._total -= self._counts.pop(index)
+        return self._messages.pop(index)
+
+    def edit(self, index: int, message: Message) -> int:
+        """Replace a message, re-counting only that message, and return its token count."""
+        count = self.count_message(message)
+        self._total += count - self._counts[index]
+        self._messages[index] = message
+        self._counts[index] = count
+        return count
+
+    def clear(self) -> None:
+        """Remove all messages."""
+        self._messages.clear()
+        self._counts.clear()
+        self._total = 0
+
+    def remaining(self, token_limit: int) -> int:
+        """Tokens left for the reply under token_limit (negative when over)."""
+        return token_limit - self.total
+
+    def count_message(self, message: Message) -> int:
+        """Count the tokens of one message, including its formatting overhead."""
+        count = self.tokens_per_message
+        for key, value in message.items():
+            count += self.tokenizer.count_tokens(_message_text(value))
+            if key == "name":
+                count += self.tokens_per_name
+        return count
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __getitem__(self, index: int) -> Message:
+        return self._messages[index]
+
+def _message_text(value: Any) -> str:
+    """Get the text of a message field, including the text parts of multi-part content."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return "".join(part.get("text", "") for part in value if isinstance(part, dict))
+    return ""
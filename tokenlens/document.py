@@ -0,0 +1,131 @@
+"""Editable documents whose token count is kept up to date incrementally."""
+
+from bisect import bisect_right
+from itertools import accumulate
+from typing import List, Optional, Tuple
+
+from .tokenizers.base import BaseTokenizer
+from .tokenizers.boundaries import is_safe_boundary, iter_safe_chunks
+from .tokenizers.registry import TokenizerRegistry
+
+# Segments counted one by one rather than through count_tokens_batch
+_BATCH_THRESHOLD = 16
+
+class TokenizedDocument:
+    """Text split into segments at safe boundaries, each with a cached token count.
+
+    Tokens never span a safe boundary, so the document's count is the sum of
+    its segments' counts. An edit re-tokenizes only the segments it touches
+    (widened to the nearest boundaries that are still safe after the edit)
+    and splices their new counts in.
+
+    This relies on the tiktoken pre-tokenizer property described in
+    tokenizers.boundaries, so counts are exact for OpenAITokenizer. Tokenizers
+    without token IDs and offsets (such as the count-only remote APIs) give no such
+    guarantee and are rejected.
+    """
+
+    def __init__(
+        self,
+        text: str = "",
+        provider: str = "openai",
+        model: Optional[str] = None,
+        tokenizer: Optional[BaseTokenizer] = None,
+        segment_size: int = 1024,
+    ):
+        """Initialize the document.
+
+        Args:
+            text: Initial text
+            provider: Provider whose tokenizer counts the text
+            model: Optional model name to use for tokenization
+            tokenizer: Tokenizer to use instead of the provider's shared one
+            segment_size: Target segment length in characters; smaller segments
+                make edits cheaper and the segment list longer
+        """
+        if tokenizer is None:
+            tokenizer = TokenizerRegistry.get_tokenizer(provider, model)
+            if tokenizer is None:
+                raise ValueError(f"Provider {provider} not supported or its dependencies are not installed")
+        if not (tokenizer.supports_ids and tokenizer.supports_offsets):
+            raise ValueError(
+                f"{type(tokenizer).__name__} cannot back a TokenizedDocument: "
+                "segment counts only add up for tokenizers with token IDs and offsets"
+            )
+        self.tokenizer = tokenizer
+        self.segment_size = segment_size
+        self._segments, self._counts = self._tokenize(text)
+        # Cumulative end offset of each segment, so edits find their segments by bisection
+        self._ends = list(accumulate(map(len, self._segments)))
+        self._token_count = sum(self._counts)
+
+    @property
+    def text(self) -> str:
+        """The full document text."""
+        return "".join(self._segments)
+
+    @property
+    def token_count(self) -> int:
+        """Number of tokens in the document."""
+        return self._token_count
+
+    def __len__(self) -> int:
+        return self._ends[-1] if self._ends else 0
+
+    def edit(self, start: int, end: int, replacement: str = "") -> int:
+        """Replace text[start:end] with replacement and return the new token count."""
+        ends = self._ends
+        length = len(self)
+        if not 0 <= start <= end <= length:
+            raise ValueError(f"Edit range {start}:{end} is outside the document (length {length})")
+        if not self._segments:
+            self._segments, self._counts = self._tokenize(replacement)
+            self._ends = list(accumulate(map(len, self._segments)))
+            self._token_count = sum(self._counts)
+            return self._token_count
+
+        # Segments holding the characters next to the edit, whose tokens may change
+        first = bisect_right(ends, max(start - 1, 0))
+        last = min(bisect_right(ends, min(end, length - 1)), len(self._segments) - 1)
+        window_start = ends[first - 1] if first else 0
+        old = "".join(self._segments[first:last + 1])
+        window = old[:start - window_start] + replacement + old[end - window_start:]
+
+        # Widen the window until both of its edges are still safe boundaries
+        while first > 0 and not (window and is_safe_boundary(self._segments[first - 1][-1] + window[0], 1)):
+            first -= 1
+            window = self._segments[first] + window
+        while last < len(self._segments) - 1 and not (
+            window and is_safe_boundary(window[-1] + self._segments[last + 1][0], 1)
+        ):
+            last += 1
+            window += self._segments[last]
+
+        segments, counts = self._tokenize(window)
+        self._token_count += sum(counts) - sum(self._counts[first:last + 1])
+        self._segments[first:last + 1] = segments
+        self._counts[first:last + 1] = counts
+        # Later segments only move by the change in length
+        shift = len(replacement) - (end - start)
+        tail = ends[last + 1:]
+        if shift:
+            tail = [offset + shift for offset in tail]
+        window_start = ends[first - 1] if first else 0
+        ends[first:] = list(accumulate(map(len, segments), initial=window_start))[1:] + tail
+        return self._token_count
+
+    def insert(self, position: int, text: str) -> int:
+        """Insert text at position and return the new token count."""
+        return self.edit(position, position, text)
+
+    def delete(self, start: int, end: int) -> int:
+        """Delete text[start:end] and return the new token count."""
+        return self.edit(start, end)
+
+    def _tokenize(self, text: str) -> Tuple[List[str], List[int]]:
+        """Split text into safe segments and count each of them."""
+        segments = list(iter_safe_chunks(text, self.segment_size))
+        if len(segments) > _BATCH_THRESHOLD:
+            return segments, self.tokenizer.count_tokens_batch(segments)
+        # A batch call's thread pool costs more than a few small counts
+        return segments, [self.tokenizer.count_tokens(segment) for segment in segments]
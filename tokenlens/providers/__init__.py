@@ -1,3 +1,5 @@
+import asyncio
+import functools
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 
@@ -14,6 +16,15 @@ class BaseProvider(ABC):
         """Check if text is within the model's token limits."""
         pass
     
+    async def acheck_text_limits(self, model_name: str, text: str) -> Dict[str, Any]:
+        """Check text limits without blocking the event loop.
+        
+        Token counting is CPU-bound for local tokenizers, so by default
+        check_text_limits runs in the event loop's default executor.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(self.check_text_limits, model_name, text))
+    
     @abstractmethod
     def check_image_limits(self, model_name: str, image_info: Dict[str, Any]) -> Dict[str, Any]:
         """Check if image generation request is within the model's limits."""
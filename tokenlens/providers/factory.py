@@ -1,68 +1,87 @@
-from typing import Dict, Type
+from importlib import import_module
+from typing import Dict, List, Type, Union
 from . import BaseProvider
-from .openai_provider import OpenAIProvider
-from .anthropic_provider import AnthropicProvider
-from .huggingface_provider import HuggingFaceProvider
-from .google_provider import GoogleProvider
-from .stability_provider import StabilityProvider
-from .meta_provider import MetaProvider
-from .qwen_provider import QwenProvider
-from .mistral_provider import MistralProvider
-from .stanford_provider import StanfordProvider
-from .deepmind_provider import DeepMindProvider
-from .midjourney_provider import MidjourneyProvider
-from .adobe_provider import AdobeProvider
-from .ideogram_provider import IdeogramProvider
-from .runway_provider import RunwayProvider
-from .microsoft_provider import MicrosoftProvider
-from .synthesia_provider import SynthesiaProvider
-from .did_provider import DIDProvider
-from .replika_provider import ReplikaProvider
-from .nightcafe_provider import NightCafeProvider
-from .openart_provider import OpenArtProvider
-from .realm_provider import RealmProvider
-from .starrytars_provider import StarryTarsProvider
-from .fugatto_provider import FugattoProvider
 
 class ProviderFactory:
-    """Factory class for creating provider API clients."""
-    
-    _providers: Dict[str, Type[BaseProvider]] = {
-        "openai": OpenAIProvider,
-        "anthropic": AnthropicProvider,
-        "huggingface": HuggingFaceProvider,
-        "google": GoogleProvider,
-        "stability": StabilityProvider,
-        "meta": MetaProvider,
-        "qwen": QwenProvider,
-        "mistral": MistralProvider,
-        "stanford": StanfordProvider,
-        "deepmind": DeepMindProvider,
-        "midjourney": MidjourneyProvider,
-        "adobe": AdobeProvider,
-        "ideogram": IdeogramProvider,
-        "runway": RunwayProvider,
-        "microsoft": MicrosoftProvider,
-        "synthesia": SynthesiaProvider,
-        "d-id": DIDProvider,
-        "replika": ReplikaProvider,
-        "nightcafe": NightCafeProvider,
-        "openart": OpenArtProvider,
-        "realm": RealmProvider,
-        "starrytars": StarryTarsProvider,
-        "fugatto": FugattoProvider,
+    """Factory class for creating provider API clients.
+
+    Providers are registered as "module.ClassName" paths and imported on
+    first use, so looking up one provider never loads the others (or their
+    SDKs). Resolved classes are cached. Classes registered directly are
+    used as they are.
+    """
+
+    _providers: Dict[str, Union[str, Type[BaseProvider]]] = {
+        "openai": "openai_provider.OpenAIProvider",
+        "anthropic": "anthropic_provider.AnthropicProvider",
+        "huggingface": "huggingface_provider.HuggingFaceProvider",
+        "google": "google_provider.GoogleProvider",
+        "stability": "stability_provider.StabilityProvider",
+        "meta": "meta_provider.MetaProvider",
+        "qwen": "qwen_provider.QwenProvider",
+        "mistral": "mistral_provider.MistralProvider",
+        "cohere": "cohere_provider.CohereProvider",
+        "ai21": "ai21_provider.AI21Provider",
+        "amazon": "amazon_provider.AmazonProvider",
+        "stanford": "stanford_provider.StanfordProvider",
+        "deepmind": "deepmind_provider.DeepMindProvider",
+        "midjourney": "midjourney_provider.MidjourneyProvider",
+        "adobe": "adobe_provider.AdobeProvider",
+        "ideogram": "art_providers.IdeogramProvider",
+        "runway": "art_providers.RunwayProvider",
+        "nightcafe": "art_providers.NightcafeProvider",
+        "openart": "art_providers.OpenArtProvider",
+        "microsoft": "microsoft_provider.MicrosoftProvider",
+        "synthesia": "avatar_providers.SynthesiaProvider",
+        "d-id": "avatar_providers.DIDProvider",
+        "replika": "avatar_providers.ReplikaProvider",
+        "haygen": "haygen_provider.HaygenProvider",
+        "realm": "gaming_providers.RealmProvider",
+        "starrytars": "gaming_providers.StarrytarsProvider",
+        "fugatto": "voice_providers.FugattoProvider",
     }
+    _classes: Dict[str, Type[BaseProvider]] = {}
     
     @classmethod
     def get_provider(cls, provider_name: str, api_key: str = None) -> BaseProvider:
         """Get a provider instance for the specified provider."""
-        provider_class = cls._providers.get(provider_name.lower())
-        if not provider_class:
-            raise ValueError(f"No provider implementation available for: {provider_name}")
-        
+        provider_class = cls.get_provider_class(provider_name)
+        # Providers that need no credentials take no constructor arguments
+        if api_key is None:
+            return provider_class()
         return provider_class(api_key)
     
     @classmethod
-    def register_provider(cls, provider_name: str, provider_class: Type[BaseProvider]):
-        """Register a new provider implementation."""
-        cls._providers[provider_name.lower()] = provider_class
+    def get_provider_class(cls, provider_name: str) -> Type[BaseProvider]:
+        """Get the provider class for the specified provider, importing its module on first use."""
+        name = provider_name.lower()
+        provider_class = cls._classes.get(name)
+        if provider_class is not None:
+            return provider_class
+        
+        provider_path = cls._providers.get(name)
+        if not provider_path:
+            raise ValueError(f"No provider implementation available for: {provider_name}")
+        if not isinstance(provider_path, str):
+            return provider_path
+        module_name, class_name = provider_path.rsplit(".", 1)
+        try:
+            # Dotted module names are absolute, others live in this package
+            module = import_module(module_name if "." in module_name else f".{module_name}", package=__package__)
+        except ImportError as e:
+            raise ValueError(f"Provider {provider_name} dependencies are not installed: {e}") from e
+        provider_class = getattr(module, class_name)
+        cls._classes[name] = provider_class
+        return provider_class
+    
+    @classmethod
+    def register_provider(cls, provider_name: str, provider_class: Union[str, Type[BaseProvider]]):
+        """Register a new provider implementation, as a class or a "module.ClassName" path."""
+        name = provider_name.lower()
+        cls._classes.pop(name, None)
+        cls._providers[name] = provider_class
+    
+    @classmethod
+    def get_supported_providers(cls) -> List[str]:
+        """Get list of supported providers."""
+        return list(cls._providers)
@@ -1,30 +1,32 @@
 from typing import Dict, Any, Optional
 from .provider_template import ProviderTemplate
 
+# Model-specific limits
+MODEL_LIMITS = {
+    "haygen-avatar-v1": {
+        "max_script_chars": 2000,
+        "max_duration": 300,  # seconds
+        "supported_resolutions": ["720p", "1080p", "4k"]
+    },
+    "haygen-video-v1": {
+        "max_script_chars": 5000,
+        "max_duration": 300,  # seconds
+        "max_resolution": "4k"
+    },
+    "haygen-voice-v1": {
+        "max_script_chars": 3000,
+        "max_duration": 300  # seconds
+    }
+}
+
 class HaygenProvider(ProviderTemplate):
     def __init__(self):
         super().__init__()
-        # Model-specific limits
-        self.limits = {
-            "haygen-avatar-v1": {
-                "max_script_chars": 2000,
-                "max_duration": 300,  # seconds
-                "supported_resolutions": ["720p", "1080p", "4k"]
-            },
-            "haygen-video-v1": {
-                "max_script_chars": 5000,
-                "max_duration": 300,  # seconds
-                "max_resolution": "4k"
-            },
-            "haygen-voice-v1": {
-                "max_script_chars": 3000,
-                "max_duration": 300  # seconds
-            }
-        }
+        self.limits = MODEL_LIMITS
 
     def check_text_limits(self, text: str, model: str) -> Dict[str, Any]:
         char_count = len(text)
-        model_limits = self.limits.get(model, {})
+        model_limits = self.get_model_limits(model)
         max_chars = model_limits.get("max_script_chars", 2000)  # default
 
         return {
@@ -40,7 +42,7 @@ class HaygenProvider(ProviderTemplate):
         duration = content.get("duration", 0)
         resolution = content.get("resolution", "1080p")
         
-        model_limits = self.limits.get(model, {})
+        model_limits = self.get_model_limits(model)
         text_limits = self.check_text_limits(script, model)
         
         is_within_limit = (
@@ -69,7 +71,7 @@ class HaygenProvider(ProviderTemplate):
             duration = content.get("duration", 60)
             resolution = content.get("resolution", "1080p")
         
-        model_limits = self.limits.get(model, {})
+        model_limits = self.get_model_limits(model)
         text_limits = self.check_text_limits(script, model)
         
         is_within_limit = (
@@ -90,7 +92,7 @@ class HaygenProvider(ProviderTemplate):
 
     def check_voice_limits(self, text: str, model: str) -> Dict[str, Any]:
         text_limits = self.check_text_limits(text, model)
-        model_limits = self.limits.get(model, {})
+        model_limits = self.get_model_limits(model)
         
         # Estimate duration based on character count (rough approximation)
         estimated_duration = len(text) / 15  # ~15 chars per second
@@ -107,6 +109,3 @@ class HaygenProvider(ProviderTemplate):
             "estimated_duration": estimated_duration,
             "max_duration": model_limits.get("max_duration", 300)
         }
-
-    def get_model_limits(self, model: str) -> Dict[str, Any]:
-        return self.limits.get(model, {})
@@ -1,5 +1,4 @@
 from typing import Optional, Dict, Any
-from huggingface_hub import HfApi
 from . import BaseProvider
 
 class HuggingFaceProvider(BaseProvider):
@@ -7,7 +6,15 @@ class HuggingFaceProvider(BaseProvider):
     
     def __init__(self, api_token: Optional[str] = None):
         self.api_token = api_token
-        self.api = HfApi(token=api_token)
+        self._api = None
+    
+    @property
+    def api(self):
+        """Hugging Face Hub API client, created on first use."""
+        if self._api is None:
+            from huggingface_hub import HfApi
+            self._api = HfApi(token=self.api_token)
+        return self._api
         
     def get_model_limits(self, model_name: str) -> Dict[str, Any]:
         """Get the token limits for a specific HuggingFace model."""
@@ -0,0 +1,435 @@
+"""Process-wide registry of immutable model limit records."""
+
+import re
+import threading
+from bisect import bisect_left
+from importlib import import_module, resources
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Provider modules whose MODEL_LIMITS tables feed the registry
+PROVIDER_TABLES: Dict[str, str] = {
+    "openai": "openai_provider",
+    "anthropic": "anthropic_provider",
+    "amazon": "amazon_provider",
+    "midjourney": "midjourney_provider",
+    "stability": "stability_provider",
+    "adobe": "adobe_provider",
+    "ai21": "ai21_provider",
+    "cohere": "cohere_provider",
+    "google": "google_provider",
+    "meta": "meta_provider",
+    "mistral": "mistral_provider",
+    "haygen": "haygen_provider",
+}
+
+# Model configuration shipped as package data next to this module
+CONFIG_RESOURCE = "models.yaml"
+
+# Named video resolutions, as (width, height)
+_NAMED_RESOLUTIONS = {
+    "480p": (854, 480),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4k": (3840, 2160),
+}
+_RESOLUTION = re.compile(r"\s*(\d+)\s*[xX×]\s*(\d+)\s*")
+_SIZE = re.compile(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*", re.I)
+_SIZE_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+_DURATION = re.compile(r"\s*(\d+(?:\.\d+)?)\s*(s|sec|seconds?|m|min|minutes?|h|hours?)?\s*", re.I)
+_DURATION_UNITS = {"s": 1.0, "m": 60.0, "h": 3600.0}
+
+def parse_resolution(value: Any) -> Optional[Tuple[int, int]]:
+    """Parse a resolution like "1024x1024" or "1080p" into (width, height)."""
+    if not isinstance(value, str):
+        return None
+    named = _NAMED_RESOLUTIONS.get(value.strip().lower())
+    if named is not None:
+        return named
+    match = _RESOLUTION.fullmatch(value)
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+def parse_size(value: Any) -> Optional[int]:
+    """Parse a file size like "25MB" into bytes (binary units)."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    match = _SIZE.fullmatch(value) if isinstance(value, str) else None
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()]) if match else None
+
+def parse_duration(value: Any) -> Optional[float]:
+    """Parse a duration like 300, "300" or "5m" into seconds."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    match = _DURATION.fullmatch(value) if isinstance(value, str) else None
+    if not match:
+        return None
+    return float(match.group(1)) * _DURATION_UNITS[(match.group(2) or "s")[0].lower()]
+
+class ModelLimits:
+    """Immutable limits of one model, with numeric fields parsed once.
+
+    Attributes:
+        provider: Provider name (e.g. "openai")
+        model: Model name
+        type: Feature type ("text", "image", "video", "voice", "avatar", "embedding", "rerank")
+        token_limit: Context window in tokens
+        max_output_tokens: Largest response in tokens
+        max_width, max_height: Largest output resolution in pixels
+        max_duration: Longest media duration in seconds
+        max_file_size: Largest input file in bytes
+        supported_formats: File formats the model accepts or produces
+        capabilities: Additional constraints that are switched on (e.g. "json_mode")
+        limits: The merged source entry; a read-only mapping whose nested
+            mappings are read-only too and whose lists are tuples (to_dict
+            gives the plain copy providers return from get_model_limits)
+    """
+
+    __slots__ = (
+        "provider", "model", "type", "token_limit", "max_output_tokens", "max_width", "max_height",
+        "max_duration", "max_file_size", "supported_formats", "capabilities", "limits",
+    )
+
+    def __init__(self, provider: str, model: str, limits: Dict[str, Any]):
+        """Build the record from a limits entry of a provider table or the model config."""
+        constraints = limits.get("additional_constraints") or {}
+        resolution = parse_resolution(limits.get("max_resolution")) or parse_resolution(
+            constraints.get("max_resolution")
+        )
+        if resolution is None:
+            # Models listing discrete resolutions are limited by the largest one
+            listed = [parse_resolution(value) for value in limits.get("supported_resolutions") or ()]
+            resolution = max((size for size in listed if size), default=None, key=lambda size: size[0] * size[1])
+        file_size = constraints.get("file_size", constraints.get("max_image_size"))
+        values = {
+            "provider": provider,
+            "model": model,
+            "type": limits.get("type"),
+            "token_limit": _int_or_none(limits.get("token_limit")),
+            "max_output_tokens": _int_or_none(limits.get("max_output_tokens", limits.get("max_response_tokens"))),
+            "max_width": resolution[0] if resolution else None,
+            "max_height": resolution[1] if resolution else None,
+            "max_duration": parse_duration(limits.get("max_duration")),
+            "max_file_size": parse_size(file_size),
+            "supported_formats": tuple(limits.get("supported_formats") or ()),
+            "capabilities": frozenset(key for key, value in constraints.items() if value is True),
+            "limits": _freeze(limits),
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a mutable copy of limits built from plain dicts and lists."""
+        return _thaw(self.limits)
+
+    def __repr__(self) -> str:
+        return f"ModelLimits(provider={self.provider!r}, model={self.model!r}, type={self.type!r})"
+
+class ModelIndex:
+    """Bitset indexes over a fixed set of ModelLimits for fast model selection.
+
+    Records are numbered in ascending order of context window, and every
+    index maps a key to an int whose set bits are the matching records.
+    A query is then a few bisects and bitwise ANDs, and the lowest set bit
+    of the result is the smallest matching model.
+    """
+
+    def __init__(self, records: Iterable[ModelLimits]):
+        """Index the given records."""
+        self._records = tuple(sorted(
+            records,
+            key=lambda record: (record.token_limit is None, record.token_limit or 0, record.provider, record.model),
+        ))
+        self._all = (1 << len(self._records)) - 1
+        self._by_type: Dict[str, int] = {}
+        self._by_provider: Dict[str, int] = {}
+        self._by_capability: Dict[str, int] = {}
+        for position, record in enumerate(self._records):
+            bit = 1 << position
+            if record.type:
+                self._by_type[record.type] = self._by_type.get(record.type, 0) | bit
+            self._by_provider[record.provider] = self._by_provider.get(record.provider, 0) | bit
+            for capability in record.capabilities:
+                self._by_capability[capability] = self._by_capability.get(capability, 0) | bit
+        # Token limits are in record order, so ">= n" is every bit from a bisect point up
+        self._token_limits = [record.token_limit for record in self._records if record.token_limit is not None]
+        # A model without a stated output cap can use its whole context for output
+        outputs = sorted(
+            (record.max_output_tokens if record.max_output_tokens is not None else record.token_limit, position)
+            for position, record in enumerate(self._records)
+            if record.max_output_tokens is not None or record.token_limit is not None
+        )
+        self._output_limits = [limit for limit, _ in outputs]
+        self._output_masks = [0] * (len(outputs) + 1)
+        for i in range(len(outputs) - 1, -1, -1):
+            self._output_masks[i] = self._output_masks[i + 1] | (1 << outputs[i][1])
+
+    def select(
+        self,
+        feature: Optional[str] = None,
+        provider: Optional[str] = None,
+        min_tokens: Optional[int] = None,
+        min_output_tokens: Optional[int] = None,
+        capabilities: Iterable[str] = (),
+    ) -> int:
+        """Get the bitset of records matching every given condition.
+
+        Args:
+            feature: Feature type the model must have (e.g. "text", "image")
+            provider: Provider the model must belong to
+            min_tokens: Smallest acceptable context window
+            min_output_tokens: Smallest acceptable output limit
+            capabilities: Capabilities the model must support (e.g. "json_mode")
+
+        Returns:
+            An int whose set bits are positions of matching records
+        """
+        mask = self._all
+        if feature is not None:
+            mask &= self._by_type.get(feature, 0)
+        if provider is not None:
+            mask &= self._by_provider.get(provider.lower(), 0)
+        for capability in capabilities:
+            mask &= self._by_capability.get(capability, 0)
+        if min_tokens is not None:
+            start = bisect_left(self._token_limits, min_tokens)
+            mask &= ((1 << len(self._token_limits)) - 1) >> start << start
+        if min_output_tokens is not None:
+            mask &= self._output_masks[bisect_left(self._output_limits, min_output_tokens)]
+        return mask
+
+    def find(self, **conditions: Any) -> List[ModelLimits]:
+        """Get the records matching the select() conditions, smallest context first."""
+        mask = self.select(**conditions)
+        records = []
+        while mask:
+            low = mask & -mask
+            records.append(self._records[low.bit_length() - 1])
+            mask ^= low
+        return records
+
+    def smallest_fit(
+        self,
+        prompt_tokens: int,
+        reserved_output: int = 0,
+        feature: Optional[str] = "text",
+        provider: Optional[str] = None,
+        capabilities: Iterable[str] = (),
+    ) -> Optional[ModelLimits]:
+        """Get the model with the smallest context that fits a prompt plus its reserved output.
+
+        Args:
+            prompt_tokens: Tokens in the prompt
+            reserved_output: Tokens reserved for the response
+            feature: Feature type the model must have (None for any)
+            provider: Provider the model must belong to
+            capabilities: Capabilities the model must support
+
+        Returns:
+            The matching ModelLimits, or None if no model fits
+        """
+        mask = self.select(
+            feature=feature,
+            provider=provider,
+            min_tokens=prompt_tokens + reserved_output,
+            min_output_tokens=reserved_output or None,
+            capabilities=capabilities,
+        )
+        return self._records[(mask & -mask).bit_length() - 1] if mask else None
+
+    def features(self, provider: Optional[str] = None) -> List[str]:
+        """Get the feature types with at least one model, optionally for one provider."""
+        mask = self._by_provider.get(provider.lower(), 0) if provider is not None else self._all
+        return [feature for feature, bits in self._by_type.items() if bits & mask]
+
+class ModelRegistry:
+    """Thread-safe registry of ModelLimits, built once per process on first use.
+
+    Records come from the MODEL_LIMITS tables of the provider modules and
+    from the models.yaml shipped with this package; where both list a model,
+    the provider table's fields win and the config fills in the rest.
+    """
+
+    _models: Optional[Dict[Tuple[str, str], ModelLimits]] = None
+    _by_provider: Dict[str, Dict[str, ModelLimits]] = {}
+    _by_model: Dict[str, Tuple[ModelLimits, ...]] = {}
+    _index: Optional[ModelIndex] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, provider: str, model: str) -> Optional[ModelLimits]:
+        """Get the limits of a provider's model, or None if it is unknown."""
+        return cls._load().get((provider.lower(), model))
+
+    @classmethod
+    def get_provider_models(cls, provider: str) -> Dict[str, ModelLimits]:
+        """Get the limits of all models of a provider, keyed by model name."""
+        cls._load()
+        return cls._by_provider.get(provider.lower(), {})
+
+    @classmethod
+    def find(cls, model: str) -> Tuple[ModelLimits, ...]:
+        """Get the limits of a model name under every provider that lists it."""
+        cls._load()
+        return cls._by_model.get(model, ())
+
+    @classmethod
+    def all_models(cls) -> List[ModelLimits]:
+        """Get the limits of every known model."""
+        return list(cls._load().values())
+
+    @classmethod
+    def providers(cls) -> List[str]:
+        """Get the names of all providers with known models."""
+        cls._load()
+        return list(cls._by_provider)
+
+    @classmethod
+    def index(cls) -> ModelIndex:
+        """Get the query index over every known model."""
+        cls._load()
+        return cls._index
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop the registry so the next lookup rebuilds it."""
+        with cls._lock:
+            cls._models = None
+            cls._by_provider = {}
+            cls._by_model = {}
+            cls._index = None
+
+    @classmethod
+    def _load(cls) -> Dict[Tuple[str, str], ModelLimits]:
+        """Build the registry on first use and return it."""
+        models = cls._models
+        if models is not None:
+            return models
+        with cls._lock:
+            if cls._models is None:
+                cls._build()
+            return cls._models
+
+    @classmethod
+    def _build(cls) -> None:
+        """Merge the provider tables with the model config into records."""
+        entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for provider, model, info in _config_entries(_read_config()):
+            key = (provider, model)
+            entries[key] = {**entries.get(key, {}), **info}
+        for provider, module_name in PROVIDER_TABLES.items():
+            table = import_module(f".{module_name}", package=__package__).MODEL_LIMITS
+            for model, info in table.items():
+                key = (provider, model)
+                entries[key] = {**entries[key], **info} if key in entries else info
+
+        models: Dict[Tuple[str, str], ModelLimits] = {}
+        by_provider: Dict[str, Dict[str, ModelLimits]] = {}
+        by_model: Dict[str, List[ModelLimits]] = {}
+        for (provider, model), info in entries.items():
+            record = ModelLimits(provider, model, info)
+            models[(provider, model)] = record
+            by_provider.setdefault(provider, {})[model] = record
+            by_model.setdefault(model, []).append(record)
+        cls._by_provider = by_provider
+        cls._by_model = {model: tuple(records) for model, records in by_model.items()}
+        cls._index = ModelIndex(models.values())
+        cls._models = models
+
+class _Repeated(list):
+    """Values of a mapping key that appears more than once in a YAML document."""
+
+def _read_config() -> str:
+    """Read the model config shipped with the package ("" if it is missing)."""
+    try:
+        if hasattr(resources, "files"):
+            return resources.files(__package__).joinpath(CONFIG_RESOURCE).read_text(encoding="utf-8")
+        # Python 3.8
+        return resources.read_text(__package__, CONFIG_RESOURCE, encoding="utf-8")
+    except FileNotFoundError:
+        return ""
+
+def _config_entries(text: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """Read (provider, model, limits) entries from the YAML text of the model config.
+
+    The config lists some providers several times (once per feature
+    section), so repeated keys are kept rather than overwritten. Entries
+    without a "type" get one from their section's supported_features.
+    """
+    if not text.strip():
+        return []
+    import yaml
+
+    class RepeatedKeyLoader(yaml.SafeLoader):
+        pass
+
+    def construct_mapping(loader: yaml.SafeLoader, node: yaml.MappingNode) -> Dict[Any, Any]:
+        loader.flatten_mapping(node)
+        mapping: Dict[Any, Any] = {}
+        for key_node, value_node in node.value:
+            key = loader.construct_object(key_node, deep=True)
+            value = loader.construct_object(value_node, deep=True)
+            if key in mapping:
+                previous = mapping[key]
+                value = _Repeated([*previous, value]) if isinstance(previous, _Repeated) else _Repeated([previous, value])
+            mapping[key] = value
+        return mapping
+
+    RepeatedKeyLoader.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, construct_mapping)
+    config = yaml.load(text, Loader=RepeatedKeyLoader) or {}
+
+    entries = []
+    for provider, blocks in (config.get("providers") or {}).items():
+        for block in blocks if isinstance(blocks, _Repeated) else [blocks]:
+            features = list(block.get("supported_features") or [])
+            for model, info in (block.get("models") or {}).items():
+                info = dict(info or {})
+                info.setdefault("type", _infer_type(model, info, features))
+                entries.append((provider.lower(), model, info))
+    return entries
+
+def _infer_type(model: str, info: Dict[str, Any], features: List[str]) -> Optional[str]:
+    """Guess the feature type of a config entry that does not state one."""
+    if len(features) == 1:
+        return features[0]
+    for feature in features:
+        if feature in model:
+            return feature
+    if "token_limit" in info:
+        return "text"
+    if "max_resolution" in info:
+        if "max_duration" in info:
+            return "video" if "video" in features else "avatar"
+        return "image"
+    if "max_duration" in info or "supported_formats" in info:
+        return "voice"
+    return features[0] if features else None
+
+def _freeze(value: Any) -> Any:
+    """Copy a limits entry into read-only mappings and tuples, so records can be shared safely."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def _thaw(value: Any) -> Any:
+    """Copy a frozen limits entry back into plain dicts and lists."""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+def _int_or_none(value: Any) -> Optional[int]:
+    """Convert a numeric limit to int, or None if it is missing or not numeric."""
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
@@ -1,77 +1,87 @@
 from typing import Dict, Any, Optional
-import openai
 from . import BaseProvider
+from ..tokenizers.registry import TokenizerRegistry
+from .limits import ModelRegistry
+
+# OpenAI model limits
+MODEL_LIMITS = {
+    # Text Models
+    "gpt-4": {"token_limit": 8192, "type": "text"},
+    "gpt-4-32k": {"token_limit": 32768, "type": "text"},
+    "gpt-4-1106-preview": {"token_limit": 128000, "type": "text"},
+    "gpt-4-vision-preview": {"token_limit": 128000, "type": "text"},
+    "gpt-3.5-turbo": {"token_limit": 4096, "type": "text"},
+    "gpt-3.5-turbo-16k": {"token_limit": 16384, "type": "text"},
+    "gpt-3.5-turbo-1106": {"token_limit": 16384, "type": "text"},
+    
+    # Image Models
+    "dall-e-3": {
+        "type": "image",
+        "max_resolution": "1024x1024",
+        "supported_formats": ["png", "jpeg"],
+        "additional_constraints": {
+            "quality": ["standard", "hd"],
+            "style": ["vivid", "natural"]
+        }
+    },
+    "dall-e-2": {
+        "type": "image",
+        "max_resolution": "1024x1024",
+        "supported_formats": ["png", "jpeg"],
+        "additional_constraints": {
+            "size": ["256x256", "512x512", "1024x1024"]
+        }
+    },
+    
+    # Audio/Voice Models
+    "whisper-1": {
+        "type": "voice",
+        "supported_formats": ["mp3", "mp4", "mpeg", "mpga", "m4a", "wav", "webm"],
+        "max_duration": "300", # 5 minutes
+        "additional_constraints": {
+            "file_size": "25MB",
+            "languages": "multilingual"
+        }
+    },
+    "tts-1": {
+        "type": "voice",
+        "supported_formats": ["mp3", "opus", "aac", "flac"],
+        "additional_constraints": {
+            "voices": ["alloy", "echo", "fable", "onyx", "nova", "shimmer"],
+            "max_text_length": 4096
+        }
+    },
+    
+    "tts-1-hd": {
+        "type": "voice",
+        "supported_formats": ["mp3", "opus", "aac", "flac"],
+        "additional_constraints": {
+            "voices": ["alloy", "echo", "fable", "onyx", "nova", "shimmer"],
+            "max_text_length": 4096,
+            "quality": "high-definition"
+        }
+    }
+}
 
 class OpenAIProvider(BaseProvider):
     """OpenAI API provider integration."""
     
     def __init__(self, api_key: Optional[str] = None):
-        if api_key:
-            openai.api_key = api_key
+        self.api_key = api_key
+        self._client = None
+    
+    @property
+    def client(self):
+        """OpenAI client, created on first use."""
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=self.api_key)
+        return self._client
     
     def get_model_limits(self, model_name: str) -> Dict[str, Any]:
-        """Get the limits for a specific OpenAI model."""
-        # OpenAI model limits
-        MODEL_LIMITS = {
-            # Text Models
-            "gpt-4": {"token_limit": 8192, "type": "text"},
-            "gpt-4-32k": {"token_limit": 32768, "type": "text"},
-            "gpt-4-1106-preview": {"token_limit": 128000, "type": "text"},
-            "gpt-4-vision-preview": {"token_limit": 128000, "type": "text"},
-            "gpt-3.5-turbo": {"token_limit": 4096, "type": "text"},
-            "gpt-3.5-turbo-16k": {"token_limit": 16384, "type": "text"},
-            "gpt-3.5-turbo-1106": {"token_limit": 16384, "type": "text"},
-            
-            # Image Models
-            "dall-e-3": {
-                "type": "image",
-                "max_resolution": "1024x1024",
-                "supported_formats": ["png", "jpeg"],
-                "additional_constraints": {
-                    "quality": ["standard", "hd"],
-                    "style": ["vivid", "natural"]
-                }
-            },
-            "dall-e-2": {
-                "type": "image",
-                "max_resolution": "1024x1024",
-                "supported_formats": ["png", "jpeg"],
-                "additional_constraints": {
-                    "size": ["256x256", "512x512", "1024x1024"]
-                }
-            },
-            
-            # Audio/Voice Models
-            "whisper-1": {
-                "type": "voice",
-                "supported_formats": ["mp3", "mp4", "mpeg", "mpga", "m4a", "wav", "webm"],
-                "max_duration": "300", # 5 minutes
-                "additional_constraints": {
-                    "file_size": "25MB",
-                    "languages": "multilingual"
-                }
-            },
-            "tts-1": {
-                "type": "voice",
-                "supported_formats": ["mp3", "opus", "aac", "flac"],
-                "additional_constraints": {
-                    "voices": ["alloy", "echo", "fable", "onyx", "nova", "shimmer"],
-                    "max_text_length": 4096
-                }
-            },
-            
-            "tts-1-hd": {
-                "type": "voice",
-                "supported_formats": ["mp3", "opus", "aac", "flac"],
-                "additional_constraints": {
-                    "voices": ["alloy", "echo", "fable", "onyx", "nova", "shimmer"],
-                    "max_text_length": 4096,
-                    "quality": "high-definition"
-                }
-            }
-        }
-        
-        return MODEL_LIMITS.get(model_name, {})
+        """Get the limits for a specific OpenAI model from the shared model-limits registry."""
+        record = ModelRegistry.get("openai", model_name)
+        return record.to_dict() if record is not None else {}
     
     def check_text_limits(self, model_name: str, text: str) -> Dict[str, Any]:
         """Check if text is within the model's token limits."""
@@ -79,19 +89,19 @@ class OpenAIProvider(BaseProvider):
         if not model_limits or model_limits.get("type") != "text":
             return {"error": f"Model {model_name} not found or is not a text model"}
         
-        # Use tiktoken to count tokens
+        # Use the shared tokenizer, which stops counting once the limit is passed
         try:
-            import tiktoken
-            encoding = tiktoken.encoding_for_model(model_name)
-            token_count = len(encoding.encode(text))
-            
+            tokenizer = TokenizerRegistry.get_tokenizer("openai", model_name)
             token_limit = model_limits["token_limit"]
-            is_within_limit = token_count <= token_limit
+            result = tokenizer.check_limit(text, token_limit)
             
             return {
-                "token_count": token_count,
+                "token_count": result["token_count"],
                 "token_limit": token_limit,
-                "is_within_limit": is_within_limit,
+                "is_within_limit": result["within_limit"],
+                "exact": result["exact"],
+                "cutoff_char": result["cutoff_char"],
+                "decided_by": result["decided_by"],
                 "model": model_name
             }
         except Exception as e:
@@ -138,9 +148,11 @@ class OpenAIProvider(BaseProvider):
     
     def check_voice_limits(self, model_name: str, audio_info: Dict[str, Any]) -> Dict[str, Any]:
         """Check if audio processing request is within the model's limits."""
-        model_limits = self.get_model_limits(model_name)
-        if not model_limits or model_limits.get("type") != "voice":
+        # The registry record has the duration and file size limits parsed already
+        record = ModelRegistry.get("openai", model_name)
+        if record is None or record.type != "voice":
             return {"error": f"Model {model_name} not found or is not a voice model"}
+        model_limits = record.limits
         
         # Extract audio info
         format = audio_info.get("format", "mp3").lower()
@@ -150,16 +162,15 @@ class OpenAIProvider(BaseProvider):
         # Check constraints
         errors = []
         
-        if format not in model_limits["supported_formats"]:
-            errors.append(f"Invalid format. Supported formats: {model_limits['supported_formats']}")
+        if format not in record.supported_formats:
+            errors.append(f"Invalid format. Supported formats: {list(record.supported_formats)}")
         
-        max_duration = float(model_limits["max_duration"])
-        if duration > max_duration:
-            errors.append(f"Duration exceeds limit of {max_duration} seconds")
+        if record.max_duration is not None and duration > record.max_duration:
+            errors.append(f"Duration exceeds limit of {record.max_duration} seconds")
         
-        max_file_size = float(model_limits["additional_constraints"]["file_size"].replace("MB", ""))
-        if file_size > max_file_size:
-            errors.append(f"File size exceeds limit of {max_file_size}MB")
+        # Sizes are parsed in binary units
+        if record.max_file_size is not None and file_size * (1 << 20) > record.max_file_size:
+            errors.append(f"File size exceeds limit of {record.max_file_size / (1 << 20)}MB")
         
         if errors:
             return {"error": "; ".join(errors)}
@@ -167,15 +178,15 @@ class OpenAIProvider(BaseProvider):
         return {
             "is_within_limit": True,
             "model": model_name,
-            "supported_formats": model_limits["supported_formats"],
-            "max_duration": model_limits["max_duration"],
-            "max_file_size": model_limits["additional_constraints"]["file_size"]
+            "supported_formats": list(record.supported_formats),
+            "max_duration": model_limits.get("max_duration"),
+            "max_file_size": model_limits.get("additional_constraints", {}).get("file_size")
         }
     
     def list_models(self) -> Dict[str, Dict[str, Any]]:
         """List all available OpenAI models and their limits."""
         try:
-            models = openai.models.list()
+            models = self.client.models.list()
             model_limits = {}
             
             for model in models.data:
@@ -1,34 +1,143 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional, Union
+from ..tokenizers.base import BaseTokenizer
+from ..tokenizers.estimator import TokenEstimator
+from ..tokenizers.registry import TokenizerRegistry
+from .limits import ModelRegistry
 
 class ProviderTemplate(ABC):
     """Template class for implementing new providers."""
     
+    # TokenizerFactory name used for exact counts; None falls back to the offline estimate
+    tokenizer_name: Optional[str] = None
+    # Whether that tokenizer calls the provider's API and needs its api_key
+    tokenizer_uses_api_key: bool = False
+    
     @abstractmethod
     def __init__(self, api_key: Optional[str] = None):
         """Initialize provider with optional API key."""
         pass
 
-    @abstractmethod
     def get_model_limits(self, model_name: str) -> Dict[str, Any]:
-        """Get the limits for a specific model."""
-        pass
+        """Get the limits for a specific model, or for all models if model_name is empty.
+        
+        The default reads the shared model-limits registry under this
+        provider's name and returns plain copies of its entries.
+        """
+        models = ModelRegistry.get_provider_models(self._provider_name())
+        if not model_name:
+            return {model: record.to_dict() for model, record in models.items()}
+        record = models.get(model_name)
+        return record.to_dict() if record is not None else {}
+
+    def _get_model_config(self, model: str) -> Dict[str, Any]:
+        """Get the registry limits of one of this provider's models ({} if unknown)."""
+        record = ModelRegistry.get(self._provider_name(), model)
+        return record.to_dict() if record is not None else {}
+
+    def _provider_name(self) -> str:
+        """Get the registry name of this provider."""
+        return getattr(self, "provider_name", None) or self.__class__.__name__.replace('Provider', '').lower()
 
     def check_text_limits(self, model: str, content: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
-        """Check text content against model limits."""
+        """Check text content against model limits.
+        
+        Unless a local tokenizer is available, a calibrated offline estimate
+        is tried first and rejects text that is clearly over the limit without
+        a (usually remote) exact count. Everything else is counted exactly; only
+        when no exact counter is available (e.g. without an API key) does the
+        point estimate decide, reported with "exact" False.
+        """
+        token_limit = self._get_token_limit(model)
+        tokenizer = self._get_tokenizer()
+        result = self._reject_by_estimate(model, content, token_limit, tokenizer)
+        if result is None:
+            try:
+                if tokenizer is not None and isinstance(content, str):
+                    result = tokenizer.check_limit(content, token_limit)
+                else:
+                    result = self._count_result(self._count_tokens(content), token_limit)
+            except ValueError:
+                result = self._estimate_result(model, content, token_limit)
+        return self._text_limits_result(model, token_limit, result)
+
+    async def acheck_text_limits(self, model: str, content: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Check text content against model limits without blocking the event loop."""
+        token_limit = self._get_token_limit(model)
+        tokenizer = self._get_tokenizer()
+        result = self._reject_by_estimate(model, content, token_limit, tokenizer)
+        if result is None:
+            try:
+                if tokenizer is not None and isinstance(content, str):
+                    result = await tokenizer.acheck_limit(content, token_limit)
+                else:
+                    result = self._count_result(await self._acount_tokens(content), token_limit)
+            except ValueError:
+                result = self._estimate_result(model, content, token_limit)
+        return self._text_limits_result(model, token_limit, result)
+
+    def _reject_by_estimate(
+        self,
+        model: str,
+        content: Union[str, Dict[str, Any]],
+        token_limit: int,
+        tokenizer: Optional[BaseTokenizer],
+    ) -> Optional[Dict[str, Any]]:
+        """Reject text a calibrated offline estimate puts clearly over the limit, when exact counting is costly or unavailable."""
+        if not isinstance(content, str) or (tokenizer is not None and not tokenizer.remote):
+            return None
+        return self._get_estimator(model).decide(content, token_limit)
+
+    def _estimate_result(self, model: str, content: Union[str, Dict[str, Any]], token_limit: int) -> Dict[str, Any]:
+        """Build an inexact check_limit style result from the point estimate."""
+        estimator = self._get_estimator(model)
+        if isinstance(content, str):
+            token_count = estimator.estimate(content)["estimate"]
+        elif isinstance(content, dict):
+            token_count = sum(
+                estimator.estimate(value)["estimate"]
+                for value in content.values()
+                if isinstance(value, str)
+            )
+        else:
+            token_count = 0
+        result = self._count_result(token_count, token_limit)
+        result.update(exact=False, decided_by="estimate")
+        return result
+
+    def _get_estimator(self, model: Optional[str] = None) -> TokenEstimator:
+        """Get the offline token estimator for one of this provider's models."""
+        return TokenEstimator.for_model(self._provider_name(), model)
+
+    def _get_token_limit(self, model: str) -> int:
+        """Get the token limit of a text model."""
         limits = self.get_model_limits(model)
         if not limits or limits.get('type') != 'text':
             raise ValueError(f"Model {model} does not support text content")
-            
-        token_count = self._count_tokens(content)
-        token_limit = limits.get('token_limit', 0)
-        
+        return limits.get('token_limit', 0)
+
+    @staticmethod
+    def _count_result(token_count: int, token_limit: int) -> Dict[str, Any]:
+        """Build a check_limit style result from a full token count."""
         return {
-            "valid": token_count <= token_limit,
+            "within_limit": token_count <= token_limit,
             "token_count": token_count,
+            "exact": True,
+            "cutoff_char": None,
+            "decided_by": "count",
+        }
+
+    def _text_limits_result(self, model: str, token_limit: int, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the check_text_limits response from a check_limit result."""
+        return {
+            "valid": result["within_limit"],
+            "token_count": result["token_count"],
             "token_limit": token_limit,
+            "exact": result["exact"],
+            "cutoff_char": result["cutoff_char"],
+            "decided_by": result["decided_by"],
             "model": model,
-            "provider": self.__class__.__name__.replace('Provider', '').lower()
+            "provider": self._provider_name()
         }
 
     def check_image_limits(self, model: str, content: Dict[str, Any]) -> Dict[str, Any]:
@@ -48,7 +157,7 @@ class ProviderTemplate(ABC):
             "width_limit": max_w,
             "height_limit": max_h,
             "model": model,
-            "provider": self.__class__.__name__.replace('Provider', '').lower()
+            "provider": self._provider_name()
         }
 
     def check_video_limits(self, model: str, content: Dict[str, Any]) -> Dict[str, Any]:
@@ -64,7 +173,7 @@ class ProviderTemplate(ABC):
             "valid": duration <= max_duration,
             "duration_limit": max_duration,
             "model": model,
-            "provider": self.__class__.__name__.replace('Provider', '').lower()
+            "provider": self._provider_name()
         }
 
     def check_avatar_limits(self, model: str, content: Dict[str, Any]) -> Dict[str, Any]:
@@ -84,7 +193,7 @@ class ProviderTemplate(ABC):
             "duration_limit": max_duration,
             "script_char_limit": max_script_chars,
             "model": model,
-            "provider": self.__class__.__name__.replace('Provider', '').lower()
+            "provider": self._provider_name()
         }
 
     def check_voice_limits(self, model: str, content: Dict[str, Any]) -> Dict[str, Any]:
@@ -100,36 +209,62 @@ class ProviderTemplate(ABC):
             "valid": text_length <= max_chars,
             "char_limit": max_chars,
             "model": model,
-            "provider": self.__class__.__name__.replace('Provider', '').lower()
+            "provider": self._provider_name()
         }
 
+    def _get_tokenizer(self) -> Optional[BaseTokenizer]:
+        """Get the shared tokenizer for this provider, or None if it is unavailable.
+        
+        A tokenizer is unavailable when its SDK is not installed or it cannot
+        be constructed; the registry remembers failed constructions, so they
+        are not retried on every check.
+        """
+        if not self.tokenizer_name:
+            return None
+        api_key = getattr(self, "api_key", None)
+        options = {"api_key": api_key} if self.tokenizer_uses_api_key and api_key else {}
+        try:
+            return TokenizerRegistry.get_tokenizer(self.tokenizer_name, **options)
+        except (ImportError, OSError, ValueError):
+            return None
+
     def _count_tokens(self, content: Union[str, Dict[str, Any]]) -> int:
-        """Count tokens in content. Override in provider-specific implementations."""
+        """Count tokens in content exactly. Override in provider-specific implementations.
+        
+        Raises:
+            ValueError: If no exact counter is available or counting fails
+        """
+        tokenizer = self._get_tokenizer()
+        if tokenizer is None:
+            raise ValueError(f"No tokenizer available for {self._provider_name()}")
         if isinstance(content, str):
-            # Default to word-based counting if no specific tokenizer
-            return len(content.split())
-        elif isinstance(content, dict):
-            # For structured content, count tokens in all text fields
-            total = 0
-            for value in content.values():
-                if isinstance(value, str):
-                    total += len(value.split())
-            return total
+            return tokenizer.count_tokens(content)
+        if isinstance(content, dict):
+            return sum(
+                tokenizer.count_tokens(value)
+                for value in content.values()
+                if isinstance(value, str)
+            )
+        return 0
+
+    async def _acount_tokens(self, content: Union[str, Dict[str, Any]]) -> int:
+        """Count tokens in content without blocking the event loop."""
+        tokenizer = self._get_tokenizer()
+        if tokenizer is None:
+            # Provider-specific counters call blocking SDKs, so run them off the loop
+            return await BaseTokenizer._run_sync(self._count_tokens, content)
+        if isinstance(content, str):
+            return await tokenizer.acount_tokens(content)
+        if isinstance(content, dict):
+            texts = [value for value in content.values() if isinstance(value, str)]
+            return sum(await tokenizer.acount_tokens_batch(texts))
         return 0
 
     def get_supported_features(self) -> List[str]:
         """Get list of supported features for this provider."""
-        features = set()
-        for model_info in self.get_model_limits("").values():
-            if isinstance(model_info, dict) and 'type' in model_info:
-                features.add(model_info['type'])
-        return list(features)
+        return ModelRegistry.index().features(self._provider_name())
 
     def get_supported_models(self, feature: Optional[str] = None) -> List[str]:
         """Get list of supported models, optionally filtered by feature."""
-        models = []
-        for model, info in self.get_model_limits("").items():
-            if isinstance(info, dict):
-                if not feature or info.get('type') == feature:
-                    models.append(model)
-        return models
+        records = ModelRegistry.index().find(feature=feature, provider=self._provider_name())
+        return [record.model for record in records]
@@ -1,7 +1,8 @@
 from typing import Dict, Any, Optional
-import tiktoken
 from . import BaseProvider
 from .provider_template import ProviderTemplate
+from ..tokenizers.registry import TokenizerRegistry
+from ..chunker import plan_batches
 import os
 
 class QwenProvider(ProviderTemplate):
@@ -11,7 +12,7 @@ class QwenProvider(ProviderTemplate):
         """Initialize the Qwen provider."""
         super().__init__(api_key or os.getenv("QWEN_API_KEY"))
         # Initialize Qwen-specific tokenizer
-        self.tokenizer = tiktoken.get_encoding("cl100k_base")  # Using OpenAI's tokenizer as example
+        self.tokenizer = TokenizerRegistry.get_tokenizer("openai", "cl100k_base")  # Using OpenAI's tokenizer as example
     
     def check_text_limits(
         self, 
@@ -21,47 +22,30 @@ class QwenProvider(ProviderTemplate):
     ) -> Dict[str, Any]:
         """Check text model limits for Qwen models."""
         # Get model configuration
-        model_config = self.config_loader.get_model_details("text", "qwen", model)
+        model_config = self._get_model_config(model)
         
         # Calculate tokens using Qwen's tokenizer
-        total_tokens = len(self.tokenizer.encode(content))
+        total_tokens = self.tokenizer.count_tokens(content)
         
         # Check if within limits
         is_within_limit = total_tokens <= model_config["token_limit"]
         
         # Calculate batches if needed
         batches = None
+        recommended_batch_size = None
         if not is_within_limit:
             batch_size = model_config["token_limit"] // 2
             if additional_constraints and "batch_size" in additional_constraints:
                 batch_size = additional_constraints["batch_size"]
-            
-            # Calculate character positions for batches
-            batches = []
-            tokens = self.tokenizer.encode(content)
-            current_batch = 0
-            current_tokens = 0
-            start_char = 0
-            
-            for i, token in enumerate(tokens):
-                current_tokens += 1
-                if current_tokens >= batch_size or i == len(tokens) - 1:
-                    # Decode tokens to find character position
-                    end_char = len(self.tokenizer.decode(tokens[:i+1]))
-                    batches.append({
-                        "batch": current_batch + 1,
-                        "tokens": current_tokens,
-                        "start_char": start_char,
-                        "end_char": end_char
-                    })
-                    start_char = end_char
-                    current_tokens = 0
-                    current_batch += 1
+            plan = plan_batches(content, batch_size, tokenizer=self.tokenizer, total_tokens=total_tokens)
+            batches = plan["batches"]
+            recommended_batch_size = plan["recommended_batch_size"]
         
         return {
             "total_tokens": total_tokens,
             "is_within_limit": is_within_limit,
             "model_max_tokens": model_config["token_limit"],
+            "recommended_batch_size": recommended_batch_size,
             "batches": batches,
             "model_additional_constraints": model_config.get("additional_constraints", {})
         }
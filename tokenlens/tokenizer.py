@@ -1,8 +1,10 @@
 """TokenLens core functionality for counting tokens and validating token limits."""
 
-from typing import Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
-from .tokenizers import OpenAITokenizer
+from .providers.limits import ModelRegistry
+from .tokenizers import BaseTokenizer, OpenAITokenizer
+from .tokenizers.registry import TokenizerRegistry
 
 __all__ = [
     "OpenAITokenizer",
@@ -10,7 +12,7 @@ __all__ = [
 
 def count_tokens(text: str, provider: str = "openai", model: Optional[str] = None) -> int:
     """Count the number of tokens in the given text using the specified provider's tokenizer.
-    
+
     Args:
         text: The text to count tokens for
         provider: The provider to use for tokenization (e.g. 'openai', 'anthropic', etc.)
@@ -19,16 +21,82 @@ def count_tokens(text: str, provider: str = "openai", model: Optional[str] = Non
     Returns:
         Number of tokens in the text
     """
-    if provider == "openai":
-        tokenizer = OpenAITokenizer()
-    else:
+    tokenizer = TokenizerRegistry.get_tokenizer(provider, model)
+    if tokenizer is None:
+        raise ValueError(f"Provider {provider} not supported or its dependencies are not installed")
+        
+    return tokenizer.count_tokens(text)
+
+def check_token_limit(text: str, max_tokens: int, provider: str = "openai", model: Optional[str] = None) -> Dict[str, Any]:
+    """Check text against a token limit, stopping early once the limit is exceeded.
+
+    Args:
+        text: The text to check
+        max_tokens: Maximum number of tokens allowed
+        provider: The provider to use for tokenization
+        model: Optional model name to use for tokenization
+        
+    Returns:
+        Dict with "within_limit", "token_count" (a lower bound when "exact" is
+        False) and "cutoff_char", the character offset where the limit was passed
+    """
+    tokenizer = TokenizerRegistry.get_tokenizer(provider, model)
+    if tokenizer is None:
+        raise ValueError(f"Provider {provider} not supported or its dependencies are not installed")
+        
+    return tokenizer.check_limit(text, max_tokens)
+
+def estimate_tokens(
+    text: str,
+    provider: str = "openai",
+    model: Optional[str] = None,
+    sample_fraction: float = 0.01,
+    confidence: float = 0.95,
+    exact: bool = False,
+) -> Dict[str, Any]:
+    """Estimate the token count of a large text by tokenizing a random sample of it.
+
+    Args:
+        text: The text to estimate
+        provider: The provider to use for tokenization
+        model: Optional model name to use for tokenization
+        sample_fraction: Fraction of the text to tokenize
+        confidence: Coverage of the returned interval
+        exact: Count every token instead of sampling
+        
+    Returns:
+        Dict with "estimate", the interval "low" and "high", "confidence" and "exact"
+    """
+    tokenizer = TokenizerRegistry.get_tokenizer(provider, model)
+    if tokenizer is None:
         raise ValueError(f"Provider {provider} not supported or its dependencies are not installed")
         
-    return tokenizer.count_tokens(text, model)
+    return tokenizer.estimate_tokens(text, sample_fraction=sample_fraction, confidence=confidence, exact=exact)
+
+def truncate_text(
+    text: str, max_tokens: int, provider: str = "openai", model: Optional[str] = None, strategy: str = "head"
+) -> str:
+    """Shorten text to fit in max_tokens tokens.
+
+    Args:
+        text: The text to shorten
+        max_tokens: Maximum number of tokens allowed
+        provider: The provider to use for tokenization
+        model: Optional model name to use for tokenization
+        strategy: "head" keeps the beginning, "tail" the end and "middle" both ends
+        
+    Returns:
+        The text, or the kept part(s) of it if it is too long
+    """
+    tokenizer = TokenizerRegistry.get_tokenizer(provider, model)
+    if tokenizer is None:
+        raise ValueError(f"Provider {provider} not supported or its dependencies are not installed")
+        
+    return tokenizer.truncate(text, max_tokens, strategy)
 
 def validate_token_limit(text: str, max_tokens: int, provider: str = "openai", model: Optional[str] = None) -> bool:
     """Validate that the text is within the specified token limit.
-    
+
     Args:
         text: The text to validate
         max_tokens: Maximum number of tokens allowed
@@ -38,5 +106,107 @@ def validate_token_limit(text: str, max_tokens: int, provider: str = "openai", m
     Returns:
         True if text is within token limit, False otherwise
     """
-    token_count = count_tokens(text, provider, model)
-    return token_count <= max_tokens
+    return check_token_limit(text, max_tokens, provider, model)["within_limit"]
+
+def check_models(
+    text: str,
+    models: Iterable[Union[str, Tuple[str, str]]],
+    provider: str = "openai",
+    reserved_output: int = 0,
+) -> List[Dict[str, Any]]:
+    """Check text against the token limits of several models, tokenizing it once per vocabulary.
+
+    Models whose tokenizers share a tokenizer_id (e.g. "gpt-4" and
+    "gpt-4-32k", or the same model under "openai" and "microsoft.azure")
+    are grouped, and each group counts the text once against its largest
+    budget. The count stops early when the text is over every limit in
+    the group.
+
+    Args:
+        text: The text to check
+        models: Model names (using provider) or (provider, model) pairs, e.g.
+            ("amazon.titan", "amazon.titan-text-express-v1")
+        provider: The provider for models given by name only
+        reserved_output: Tokens to keep free for each model's response
+        
+    Returns:
+        One dict per model, in input order, with "provider", "model",
+        "within_limit", "token_count" (when "exact" is False, a lower bound
+        if the text is over the limit and an upper bound if it is within),
+        "exact", "token_limit", "available_tokens" and "tokenizer_id".
+        Models whose window is smaller than reserved_output are never
+        within the limit, not even for empty text.
+
+    Raises:
+        ValueError: If reserved_output is negative
+    """
+    if reserved_output < 0:
+        raise ValueError("reserved_output must not be negative")
+    checks = []
+    groups: Dict[str, Tuple[BaseTokenizer, List[int]]] = {}
+    for entry in models:
+        model_provider, model = (provider, entry) if isinstance(entry, str) else entry
+        tokenizer = _get_model_tokenizer(model_provider, model)
+        token_limit = _get_token_limit(model_provider, model)
+        available = token_limit - reserved_output
+        groups.setdefault(tokenizer.tokenizer_id, (tokenizer, []))[1].append(max(available, 0))
+        checks.append({
+            "provider": model_provider,
+            "model": model,
+            "token_limit": token_limit,
+            "available_tokens": available,
+            "tokenizer_id": tokenizer.tokenizer_id,
+        })
+
+    counts = {
+        tokenizer_id: _check_budgets(tokenizer, text, budgets)
+        for tokenizer_id, (tokenizer, budgets) in groups.items()
+    }
+    for check in checks:
+        count = counts[check["tokenizer_id"]]
+        if check["available_tokens"] < 0:
+            # Not even an empty prompt fits next to the reserved output
+            check["within_limit"] = False
+        elif count["exact"]:
+            check["within_limit"] = count["token_count"] <= check["available_tokens"]
+        else:
+            # An inexact result settles every budget in the group the same way
+            check["within_limit"] = count["within_limit"]
+        check["token_count"] = count["token_count"]
+        check["exact"] = count["exact"]
+    return checks
+
+def _check_budgets(tokenizer: BaseTokenizer, text: str, budgets: List[int]) -> Dict[str, Any]:
+    """Check text against the largest budget of a group, counting exactly if that leaves a smaller one open.
+
+    An inexact result is either a lower bound past the largest budget,
+    which is past every budget, or an upper bound within it, which only
+    settles the budgets it is also within.
+    """
+    result = tokenizer.check_limit(text, max(budgets))
+    if result["within_limit"] and not result["exact"] and result["token_count"] > min(budgets):
+        token_count = tokenizer.count_tokens(text)
+        result = {"within_limit": True, "token_count": token_count, "exact": True}
+    return result
+
+def _get_model_tokenizer(provider: str, model: str) -> BaseTokenizer:
+    """Get the shared tokenizer for a provider's model."""
+    # Model IDs the tokenizer does not know (e.g. Bedrock's) use its default vocabulary
+    tokenizer = TokenizerRegistry.get_model_tokenizer(provider, model)
+    if tokenizer is None:
+        raise ValueError(f"Provider {provider} not supported or its dependencies are not installed")
+    return tokenizer
+
+def _get_token_limit(provider: str, model: str) -> int:
+    """Get a model's context window, looking the model up under any provider if needed.
+
+    Tokenizer aliases such as "amazon.titan" are registered under their
+    provider ("amazon"); models served by another provider (e.g. "gpt-4"
+    on "microsoft.azure") fall back to the provider that lists them.
+    """
+    record = ModelRegistry.get(provider.split(".", 1)[0], model)
+    if record is None or record.token_limit is None:
+        record = next((found for found in ModelRegistry.find(model) if found.token_limit is not None), None)
+    if record is None:
+        raise ValueError(f"No token limit known for model: {model}")
+    return record.token_limit
@@ -1,67 +1,38 @@
 """TokenLens tokenizers module."""
 
+from importlib import import_module
+
 from .base import BaseTokenizer
 from .openai_tokenizer import OpenAITokenizer
 
-__all__ = ["BaseTokenizer", "OpenAITokenizer"]
-
-# Optional tokenizers - import only if dependencies are available
-try:
-    from .anthropic_tokenizer import AnthropicTokenizer
-    __all__.append("AnthropicTokenizer")
-except ImportError:
-    AnthropicTokenizer = None
-
-try:
-    from .mistral_tokenizer import MistralTokenizer
-    __all__.append("MistralTokenizer")
-except ImportError:
-    MistralTokenizer = None
-
-try:
-    from .cohere_tokenizer import CohereTokenizer
-    __all__.append("CohereTokenizer")
-except ImportError:
-    CohereTokenizer = None
-
-try:
-    from .meta_tokenizer import MetaTokenizer
-    __all__.append("MetaTokenizer")
-except ImportError:
-    MetaTokenizer = None
-
-try:
-    from .google_tokenizer import GoogleTokenizer
-    __all__.append("GoogleTokenizer")
-except ImportError:
-    GoogleTokenizer = None
-
-try:
-    from .ai21_tokenizer import AI21Tokenizer
-    __all__.append("AI21Tokenizer")
-except ImportError:
-    AI21Tokenizer = None
-
-try:
-    from .deepmind_tokenizer import DeepMindTokenizer
-    __all__.append("DeepMindTokenizer")
-except ImportError:
-    DeepMindTokenizer = None
-
-try:
-    from .huggingface_tokenizer import HuggingFaceTokenizer
-    __all__.append("HuggingFaceTokenizer")
-except ImportError:
-    HuggingFaceTokenizer = None
-
-try:
-    from .qwen_tokenizer import QwenTokenizer
-    __all__.append("QwenTokenizer")
-except ImportError:
-    QwenTokenizer = None
-
-try:
-    from .stanford_tokenizer import StanfordTokenizer
-    __all__.append("StanfordTokenizer")
-except ImportError:
-    StanfordTokenizer = None
+# Optional tokenizers - imported on first access (PEP 562) so that a provider's
+# SDK only loads when its tokenizer is used. A tokenizer whose dependencies
+# are not installed resolves to None.
+_OPTIONAL_TOKENIZERS = {
+    "AnthropicTokenizer": "anthropic_tokenizer",
+    "MistralTokenizer": "mistral_tokenizer",
+    "CohereTokenizer": "cohere_tokenizer",
+    "MetaTokenizer": "meta_tokenizer",
+    "GoogleTokenizer": "google_tokenizer",
+    "AI21Tokenizer": "ai21_tokenizer",
+    "DeepMindTokenizer": "deepmind_tokenizer",
+    "HuggingFaceTokenizer": "huggingface_tokenizer",
+    "QwenTokenizer": "qwen_tokenizer",
+    "StanfordTokenizer": "stanford_tokenizer",
+}
+
+__all__ = ["BaseTokenizer", "OpenAITokenizer", *_OPTIONAL_TOKENIZERS]
+
+def __getattr__(name: str):
+    module_name = _OPTIONAL_TOKENIZERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        tokenizer = getattr(import_module(f".{module_name}", __name__), name)
+    except ImportError:
+        tokenizer = None
+    globals()[name] = tokenizer
+    return tokenizer
+
+def __dir__():
+    return sorted(set(globals()) | set(_OPTIONAL_TOKENIZERS))
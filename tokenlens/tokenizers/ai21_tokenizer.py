@@ -2,11 +2,15 @@
 
 from typing import List, Optional
 import ai21
-from .base_tokenizer import BaseTokenizer
+from .base import BaseTokenizer
 
 class AI21Tokenizer(BaseTokenizer):
     """AI21 tokenizer for text encoding and decoding."""
     
+    # The SDK only offers blocking calls, so the async methods run them in
+    # an executor; remote batches are still sent concurrently
+    remote = True
+    
     def __init__(self, api_key: Optional[str] = None):
         """Initialize AI21 tokenizer with API key."""
         super().__init__()
@@ -37,9 +41,9 @@ class AI21Tokenizer(BaseTokenizer):
     def count_tokens(self, text: str) -> int:
         """Count the number of tokens in the text."""
         if not self.api_key:
-            return super().count_tokens(text)
+            raise ValueError("Tokenizer not initialized")
         try:
             response = ai21.TokenizeRequest(text=text)
             return len(response.tokens)
-        except:
-            return super().count_tokens(text)
+        except Exception as e:
+            raise ValueError(f"Failed to count tokens: {str(e)}")
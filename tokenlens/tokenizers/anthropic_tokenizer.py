@@ -7,19 +7,47 @@ from .base import BaseTokenizer
 class AnthropicTokenizer(BaseTokenizer):
     """Anthropic tokenizer for text encoding and decoding."""
     
+    # The API reports counts only; it exposes neither token IDs nor decoding
+    supports_ids = False
+    supports_decode = False
+    remote = True
+    estimator_family = "claude"
+    
     def __init__(self, api_key: Optional[str] = None):
         """Initialize Anthropic tokenizer with API key."""
+        self.api_key = api_key
         self.client = anthropic.Anthropic(api_key=api_key) if api_key else None
+        self._async_client = None
+    
+    @property
+    def async_client(self):
+        """Async Anthropic client, created on first use inside an event loop."""
+        if self._async_client is None and self.api_key:
+            self._async_client = anthropic.AsyncAnthropic(api_key=self.api_key)
+        return self._async_client
     
     def encode(self, text: str) -> List[int]:
-        """Encode text into token IDs."""
+        """Anthropic does not expose token IDs; use count_tokens."""
+        raise NotImplementedError("Anthropic does not support token encoding")
+    
+    def decode(self, token_ids: List[int]) -> str:
+        """Decode token IDs back into text."""
+        raise NotImplementedError("Anthropic does not support token decoding")
+    
+    def count_tokens(self, text: str) -> int:
+        """Count the number of tokens in the text."""
         if not self.client:
             raise ValueError("Tokenizer not initialized")
         try:
             return self.client.count_tokens(text)
         except Exception as e:
-            raise ValueError(f"Failed to encode text: {str(e)}")
+            raise ValueError(f"Failed to count tokens: {str(e)}")
     
-    def decode(self, token_ids: List[int]) -> str:
-        """Decode token IDs back into text."""
-        raise NotImplementedError("Anthropic does not support token decoding")
+    async def acount_tokens(self, text: str) -> int:
+        """Count the number of tokens in the text without blocking the event loop."""
+        if not self.async_client:
+            raise ValueError("Tokenizer not initialized")
+        try:
+            return await self.async_client.count_tokens(text)
+        except Exception as e:
+            raise ValueError(f"Failed to count tokens: {str(e)}")
@@ -1,11 +1,58 @@
 """Base tokenizer implementation."""
 
+import asyncio
+import functools
+import math
+import mmap
+import os
+import random
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from statistics import NormalDist
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from .boundaries import (
+    DEFAULT_CHUNK_SIZE, ByteSource, TextSource, iter_decoded, iter_text, next_safe_boundary
+)
+from .buffers import ARRAY, BatchBuffer, TokenBuffer, to_buffer
+from .estimator import TokenEstimator
+
+# Fewest chunks a sampled estimate is based on
+_MIN_SAMPLES = 32
+
+# Parts of the text truncate can keep
+TRUNCATE_STRATEGIES = ("head", "tail", "middle")
 
 class BaseTokenizer(ABC):
     """Base class for all tokenizers."""
     
+    # Capabilities: whether encode returns real token IDs and decode works.
+    # Count-only tokenizers implement count_tokens directly and never build ID lists.
+    supports_ids: bool = True
+    supports_decode: bool = True
+    # Whether encode_with_offsets is available
+    supports_offsets: bool = False
+    # True when counting calls a remote API rather than running locally
+    remote: bool = False
+    # Upper bound on concurrent requests a remote tokenizer sends for one batch
+    max_concurrency: int = 8
+    # TokenEstimator family of this vocabulary, used for offline estimates
+    estimator_family: str = "default"
+    
+    @property
+    def tokenizer_id(self) -> str:
+        """Stable identity of this tokenizer's vocabulary, used as a cache key."""
+        return f"{type(self).__name__}:{getattr(self, 'model_name', '')}"
+    
+    @property
+    def estimator(self) -> TokenEstimator:
+        """Offline estimator for this tokenizer's vocabulary family."""
+        return TokenEstimator.for_family(self.estimator_family)
+    
+    @property
+    def count_only(self) -> bool:
+        """True when the tokenizer can count tokens but not produce their IDs."""
+        return not self.supports_ids
+    
     @abstractmethod
     def encode(self, text: str) -> List[int]:
         """Encode text into tokens."""
@@ -16,6 +63,337 @@ class BaseTokenizer(ABC):
         """Decode tokens back into text."""
         pass
     
+    def encode_with_offsets(self, text: str) -> Tuple[List[int], List[int]]:
+        """Encode text into token IDs plus the character offset where each token starts."""
+        raise NotImplementedError(f"{type(self).__name__} does not support token offsets")
+    
+    def encode_buffer(self, text: str, kind: str = ARRAY) -> TokenBuffer:
+        """Encode text into a compact buffer of 4-byte token IDs.
+        
+        Args:
+            text: The text to encode
+            kind: "array" for array('I') or "numpy" for a numpy uint32 array
+        """
+        return to_buffer(self.encode(text), kind)
+    
+    def encode_batch_buffer(self, texts: List[str], kind: str = ARRAY) -> BatchBuffer:
+        """Encode a batch of texts into one flat token buffer with per-text offsets."""
+        return BatchBuffer.from_lists(self.encode_batch(texts), kind)
+    
     def count_tokens(self, text: str) -> int:
-        """Count the number of tokens in the text."""
+        """Count the number of tokens in the text.
+        
+        Count-only tokenizers must override this, since encode is unavailable.
+        """
         return len(self.encode(text))
+    
+    def encode_batch(self, texts: List[str]) -> List[List[int]]:
+        """Encode a batch of texts into tokens."""
+        if self.remote and len(texts) > 1:
+            return self._fan_out(self.encode, texts)
+        return [self.encode(text) for text in texts]
+    
+    def count_tokens_batch(self, texts: List[str]) -> List[int]:
+        """Count the number of tokens in each text of a batch.
+        
+        Remote tokenizers without a batch endpoint send up to max_concurrency
+        requests at a time.
+        """
+        if self.remote and len(texts) > 1:
+            return self._fan_out(self.count_tokens, texts)
+        return [self.count_tokens(text) for text in texts]
+    
+    def _fan_out(self, func: Callable[[str], Any], texts: List[str]) -> List[Any]:
+        """Call func on each text from a bounded thread pool, keeping the order."""
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(texts))) as pool:
+            return list(pool.map(func, texts))
+    
+    def count_tokens_stream(self, source: TextSource, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """Count the tokens of text read from a string, text file object or iterable.
+        
+        Returns the same count as count_tokens on the full text. This default
+        joins the text first; tokenizers whose pre-tokenizer allows cutting at
+        safe boundaries override it to work in bounded memory.
+        """
+        return self.count_tokens("".join(iter_text(source, chunk_size)))
+    
+    def count_tokens_parallel(self, text: str, workers: Optional[int] = None) -> int:
+        """Count the tokens of a large text using several cores.
+        
+        Always returns the same count as count_tokens. This default counts
+        serially; tokenizers that can split text at safe boundaries and
+        release the GIL override it.
+        """
+        return self.count_tokens(text)
+    
+    def estimate_tokens(
+        self,
+        text: str,
+        sample_fraction: float = 0.01,
+        confidence: float = 0.95,
+        exact: bool = False,
+        seed: Optional[int] = None,
+        chunk_size: int = 4096,
+    ) -> Dict[str, Any]:
+        """Estimate the token count of a large text by tokenizing a sample of it.
+        
+        The text is split into equal strata and one chunk of about chunk_size
+        characters, cut at safe boundaries where possible, is tokenized from
+        each. The total is extrapolated with a ratio estimator.
+        
+        Args:
+            text: The text to estimate
+            sample_fraction: Fraction of the text to tokenize
+            confidence: Coverage of the returned interval
+            exact: Count every token instead of sampling
+            seed: Seed for reproducible samples
+            chunk_size: Characters per sampled chunk
+            
+        Returns:
+            Dict with "estimate", the interval "low" and "high", "confidence",
+            "exact" and the number of "samples"; texts no larger than the
+            sample are counted exactly
+        
+        Raises:
+            ValueError: If confidence is not in (0, 1) or sample_fraction not in (0, 1]
+        """
+        if not 0 < confidence < 1:
+            raise ValueError("confidence must be between 0 and 1 (exclusive)")
+        if not 0 < sample_fraction <= 1:
+            raise ValueError("sample_fraction must be greater than 0 and at most 1")
+        samples = max(_MIN_SAMPLES, math.ceil(sample_fraction * len(text) / chunk_size))
+        if exact or samples * chunk_size >= len(text):
+            count = self.count_tokens_stream(text)
+            return {"estimate": count, "low": count, "high": count, "confidence": 1.0, "exact": True, "samples": 0}
+        
+        rng = random.Random(seed)
+        stratum = len(text) / samples
+        snap = chunk_size // 4
+        chunks = []
+        for i in range(samples):
+            low = int(i * stratum)
+            start = rng.randrange(low, int((i + 1) * stratum) - chunk_size + 1)
+            # Cut at safe boundaries so the sampled counts add up like the real ones
+            boundary = next_safe_boundary(text, start, start + snap)
+            start = boundary if boundary != -1 else start
+            boundary = next_safe_boundary(text, start + chunk_size, start + chunk_size + snap)
+            end = boundary if boundary != -1 else start + chunk_size
+            chunks.append(text[start:end])
+        
+        sizes = [len(chunk) for chunk in chunks]
+        counts = self.count_tokens_batch(chunks)
+        ratio = sum(counts) / sum(sizes)
+        residual_var = sum((count - ratio * size) ** 2 for count, size in zip(counts, sizes)) / (samples - 1)
+        sampled = sum(sizes) / len(text)
+        mean_size = sum(sizes) / samples
+        std_error = len(text) / mean_size * math.sqrt((1 - sampled) * residual_var / samples)
+        margin = NormalDist().inv_cdf(0.5 + confidence / 2) * std_error
+        estimate = ratio * len(text)
+        return {
+            "estimate": round(estimate),
+            "low": max(sum(counts), math.floor(estimate - margin)),
+            "high": math.ceil(estimate + margin),
+            "confidence": confidence,
+            "exact": False,
+            "samples": samples,
+        }
+    
+    def count_tokens_bytes(
+        self, buffer: ByteSource, encoding: str = "utf-8", chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> int:
+        """Count the tokens of encoded text in a bytes, memoryview or mmap buffer.
+        
+        The buffer is decoded incrementally and fed to count_tokens_stream, so
+        tokenizers that stream never hold the whole text as a str.
+        """
+        return self.count_tokens_stream(iter_decoded(buffer, chunk_size, encoding), chunk_size)
+    
+    def count_tokens_file(
+        self, path: "os.PathLike[str]", encoding: str = "utf-8", chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> int:
+        """Count the tokens of a text file by memory-mapping it instead of reading it."""
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return self.count_tokens_bytes(mapped, encoding, chunk_size)
+    
+    def token_bounds(self, text: str) -> Optional[Tuple[int, int]]:
+        """Get cheap (lower, upper) bounds on the token count, or None if unknown."""
+        return None
+    
+    def check_limit(self, text: str, max_tokens: int) -> Dict[str, Any]:
+        """Check whether text fits in max_tokens.
+        
+        Returns a dict with "within_limit", "token_count", "exact",
+        "cutoff_char" and "decided_by". When token_bounds already settles the
+        check, "decided_by" is "bound" and "token_count" is the bound that
+        decided it. Otherwise the text is counted ("decided_by" is "count");
+        tokenizers that count incrementally stop once the limit is passed, in
+        which case "token_count" is a lower bound ("exact" is False) and
+        "cutoff_char" is the character offset where the first token past the
+        limit starts.
+        """
+        bounds = self.token_bounds(text)
+        if bounds is not None:
+            lower, upper = bounds
+            if upper <= max_tokens or lower > max_tokens:
+                within_limit = upper <= max_tokens
+                return {
+                    "within_limit": within_limit,
+                    "token_count": upper if within_limit else lower,
+                    "exact": lower == upper,
+                    "cutoff_char": None,
+                    "decided_by": "bound",
+                }
+        result = self._check_limit_by_count(text, max_tokens)
+        result["decided_by"] = "count"
+        return result
+    
+    def _check_limit_by_count(self, text: str, max_tokens: int) -> Dict[str, Any]:
+        """Check text against max_tokens by counting its tokens."""
+        token_count = self.count_tokens(text)
+        return {
+            "within_limit": token_count <= max_tokens,
+            "token_count": token_count,
+            "exact": True,
+            "cutoff_char": None,
+        }
+    
+    def truncate(self, text: str, max_tokens: int, strategy: str = "head") -> str:
+        """Shorten text to at most max_tokens tokens.
+        
+        Args:
+            text: The text to shorten
+            max_tokens: Largest number of tokens the result may have
+            strategy: The part of the text to keep: "head" keeps the beginning,
+                "tail" the end and "middle" both ends, cutting out the middle
+        
+        Returns:
+            text itself if it fits, otherwise the kept part(s) joined together
+        
+        Tokenizers with token offsets encode the text once and cut between
+        tokens; others binary-search the cut on character offsets with
+        count_tokens. The result is counted once more, since text next to a
+        cut may tokenize differently, and cut further if it is still too long.
+        """
+        if strategy not in TRUNCATE_STRATEGIES:
+            raise ValueError(f"Unknown truncation strategy: {strategy}")
+        if max_tokens < 0:
+            raise ValueError("max_tokens must not be negative")
+        if self.supports_offsets:
+            tokens, offsets = self.encode_with_offsets(text)
+            if len(tokens) <= max_tokens:
+                return text
+            find_cuts = functools.partial(_token_cuts, text, offsets)
+        else:
+            if self.count_tokens(text) <= max_tokens:
+                return text
+            find_cuts = functools.partial(self._search_cuts, text)
+        
+        head = {"head": max_tokens, "tail": 0, "middle": (max_tokens + 1) // 2}[strategy]
+        tail = max_tokens - head
+        while True:
+            head_end, tail_start = find_cuts(head, tail)
+            result = text[:head_end] + text[tail_start:]
+            excess = self.count_tokens(result) - max_tokens
+            if excess <= 0:
+                return result
+            head_excess = min(head, (excess + 1) // 2 if tail else excess)
+            head -= head_excess
+            tail = max(0, tail - (excess - head_excess))
+    
+    def _search_cuts(self, text: str, head: int, tail: int) -> Tuple[int, int]:
+        """Find the longest prefix and suffix within head and tail tokens by binary search."""
+        head_end = self._search_cut(head, 0, len(text), lambda cut: text[:cut], True)
+        tail_start = self._search_cut(tail, head_end, len(text), lambda cut: text[cut:], False)
+        return head_end, tail_start
+    
+    def _search_cut(
+        self, budget: int, low: int, high: int, part: Callable[[int], str], grows_with_cut: bool
+    ) -> int:
+        """Binary-search the character cut in [low, high] that keeps the most text within budget."""
+        if budget <= 0:
+            return low if grows_with_cut else high
+        # Invariant: the part at `fits` is within budget and the part at `over` is not
+        fits, over = (low, high + 1) if grows_with_cut else (high, low - 1)
+        while abs(over - fits) > 1:
+            cut = (fits + over) // 2
+            if self.count_tokens(part(cut)) <= budget:
+                fits = cut
+            else:
+                over = cut
+        return fits
+    
+    async def aencode(self, text: str) -> List[int]:
+        """Encode text into tokens without blocking the event loop."""
+        return await self._run_sync(self.encode, text)
+    
+    async def adecode(self, tokens: List[int]) -> str:
+        """Decode tokens back into text without blocking the event loop."""
+        return await self._run_sync(self.decode, tokens)
+    
+    async def acount_tokens(self, text: str) -> int:
+        """Count the number of tokens in the text without blocking the event loop."""
+        return await self._run_sync(self.count_tokens, text)
+    
+    async def aencode_batch(self, texts: List[str]) -> List[List[int]]:
+        """Encode a batch of texts without blocking the event loop.
+        
+        Remote tokenizers send the requests concurrently; local ones encode
+        the whole batch in one executor call.
+        """
+        if self.remote:
+            return await self._agather(self.aencode, texts)
+        return await self._run_sync(self.encode_batch, texts)
+    
+    async def acount_tokens_batch(self, texts: List[str]) -> List[int]:
+        """Count the tokens in each text of a batch without blocking the event loop."""
+        if self.remote:
+            return await self._agather(self.acount_tokens, texts)
+        return await self._run_sync(self.count_tokens_batch, texts)
+    
+    async def acheck_limit(self, text: str, max_tokens: int) -> Dict[str, Any]:
+        """Check whether text fits in max_tokens without blocking the event loop.
+        
+        Returns the same dict as check_limit.
+        """
+        if not self.remote:
+            return await self._run_sync(self.check_limit, text, max_tokens)
+        token_count = await self.acount_tokens(text)
+        return {
+            "within_limit": token_count <= max_tokens,
+            "token_count": token_count,
+            "exact": True,
+            "cutoff_char": None,
+            "decided_by": "count",
+        }
+    
+    async def _agather(self, func: Callable[[str], Awaitable[Any]], texts: List[str]) -> List[Any]:
+        """Await func on each text with at most max_concurrency calls in flight."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def bounded(text: str) -> Any:
+            async with semaphore:
+                return await func(text)
+        
+        return list(await asyncio.gather(*(bounded(text) for text in texts)))
+    
+    @staticmethod
+    async def _run_sync(func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking call in the event loop's default executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args))
+
+def _token_cuts(text: str, offsets: List[int], head: int, tail: int) -> Tuple[int, int]:
+    """Get the character cuts that keep the first head and last tail tokens.
+
+    A cut inside a multi-byte character drops the whole character.
+    """
+    count = len(offsets)
+    head_end = offsets[head] if head < count else len(text)
+    start = count - tail
+    while 0 < start < count and offsets[start] == offsets[start - 1]:
+        start += 1
+    tail_start = offsets[start] if start < count else len(text)
+    return head_end, max(head_end, tail_start)
@@ -0,0 +1,122 @@
+"""Helpers for cutting text where byte-pair pre-tokenizers cannot merge across.
+
+The tiktoken pre-tokenizer patterns (gpt2/r50k, p50k, cl100k, o200k) never
+produce a piece that spans a letter or digit followed by whitespace: letter
+and number runs always end there and the next piece starts at the whitespace.
+Tokenizing the text on either side of such a cut separately therefore yields
+exactly the same tokens as tokenizing the whole text.
+"""
+
+import codecs
+import re
+from typing import IO, Iterable, Iterator, Union
+
+# Default number of characters held in memory while streaming
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# A letter or digit followed by whitespace; the boundary is the match end
+_BOUNDARY = re.compile(r"[^\W_](?=\s)")
+
+TextSource = Union[str, IO[str], Iterable[str]]
+
+ByteSource = Union[bytes, bytearray, memoryview, "mmap.mmap"]
+
+def is_safe_boundary(text: str, index: int) -> bool:
+    """Check whether text can be cut at index without changing its tokens."""
+    return 0 < index < len(text) and _BOUNDARY.match(text, index - 1) is not None
+
+def find_safe_boundary(text: str, end: int, start: int = 0) -> int:
+    """Find the last safe boundary in text[start:end].
+
+    Args:
+        text: The text to search
+        end: Largest acceptable boundary position
+        start: Boundaries must lie strictly after this position
+
+    Returns:
+        The boundary position, or -1 if there is none
+    """
+    end = min(end, len(text) - 1)
+    window = 256
+    while True:
+        low = max(start, end - window)
+        boundary = -1
+        for match in _BOUNDARY.finditer(text, low, end + 1):
+            boundary = match.end()
+        if boundary > start:
+            return boundary
+        if low <= start:
+            return -1
+        window *= 4
+
+def next_safe_boundary(text: str, start: int, end: int) -> int:
+    """Find the first safe boundary in text[start:end], or -1 if there is none."""
+    match = _BOUNDARY.search(text, max(start - 1, 0), end)
+    return match.end() if match is not None and match.end() > start else -1
+
+def iter_text(source: TextSource, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Iterate over the text pieces of a string, text file object or iterable."""
+    if isinstance(source, str):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+    elif hasattr(source, "read"):
+        while True:
+            piece = source.read(chunk_size)
+            if not piece:
+                break
+            yield piece
+    else:
+        for piece in source:
+            if piece:
+                yield piece
+
+def iter_decoded(
+    buffer: ByteSource, chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = "utf-8", errors: str = "strict"
+) -> Iterator[str]:
+    """Decode a bytes-like buffer piece by piece, never holding all of it as one str.
+
+    Multi-byte characters split across pieces are carried over by an
+    incremental decoder, so the pieces join up to the fully decoded text.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors)
+    # Release the views even when decoding fails, so an mmap behind them can be closed
+    with memoryview(buffer) as raw, raw.cast("B") as view:
+        for start in range(0, len(view), chunk_size):
+            with view[start:start + chunk_size] as chunk:
+                piece = decoder.decode(chunk)
+            if piece:
+                yield piece
+    piece = decoder.decode(b"", final=True)
+    if piece:
+        yield piece
+
+def iter_safe_chunks(source: TextSource, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Split text into chunks of roughly chunk_size characters at safe boundaries.
+
+    Chunks only grow past chunk_size when the text has no safe boundary for a
+    long stretch (e.g. long runs of CJK text without spaces).
+    """
+    pieces = []
+    size = 0
+    searched = 0
+    threshold = chunk_size
+    for piece in iter_text(source, chunk_size):
+        pieces.append(piece)
+        size += len(piece)
+        if size < threshold:
+            continue
+        buffer = "".join(pieces)
+        boundary = -1
+        for match in _BOUNDARY.finditer(buffer, max(searched - 1, 0)):
+            boundary = match.end()
+        if boundary > 0:
+            yield buffer[:boundary]
+            buffer = buffer[boundary:]
+            threshold = chunk_size
+        else:
+            # Grow geometrically so boundary-free text is scanned in linear time
+            threshold = 2 * size
+        pieces = [buffer]
+        size = searched = len(buffer)
+    if size:
+        yield "".join(pieces)
@@ -0,0 +1,99 @@
+"""Compact token ID buffers as an alternative to lists of Python ints."""
+
+from array import array
+from typing import Any, Iterable, Iterator, List, Sequence, Union
+
+# Buffer kinds accepted by encode_buffer and encode_batch_buffer
+ARRAY = "array"
+NUMPY = "numpy"
+
+TokenBuffer = Union[array, memoryview, Any]
+
+def load_numpy() -> Any:
+    """Import numpy on first use of a numpy buffer, keeping it out of `import tokenlens`."""
+    try:
+        import numpy
+    except ImportError:
+        raise ValueError("numpy is required for numpy token buffers")
+    return numpy
+
+def to_buffer(tokens: Iterable[int], kind: str = ARRAY) -> TokenBuffer:
+    """Pack token IDs into a contiguous 4-byte-per-token buffer.
+
+    Args:
+        tokens: Token IDs (a list, another buffer or any iterable)
+        kind: "array" for array('I') or "numpy" for a numpy uint32 array
+
+    Returns:
+        The packed buffer
+    """
+    if kind == ARRAY:
+        return tokens if isinstance(tokens, array) and tokens.typecode == "I" else array("I", tokens)
+    if kind == NUMPY:
+        numpy = load_numpy()
+        if isinstance(tokens, numpy.ndarray):
+            return tokens.astype(numpy.uint32, copy=False)
+        if isinstance(tokens, (array, memoryview)):
+            return numpy.frombuffer(tokens, dtype=numpy.uint32)
+        return numpy.fromiter(tokens, dtype=numpy.uint32)
+    raise ValueError(f"Unknown token buffer kind: {kind}")
+
+def as_token_sequence(tokens: Union[Sequence[int], TokenBuffer]) -> Sequence[int]:
+    """View a token list or buffer as a sequence of ints, without copying when possible."""
+    if isinstance(tokens, memoryview):
+        return tokens if tokens.format == "I" else tokens.cast("B").cast("I")
+    return tokens
+
+class BatchBuffer:
+    """Token IDs of a batch of texts held as one flat buffer plus offsets.
+
+    The IDs of text i are tokens[offsets[i]:offsets[i + 1]]; indexing returns
+    a view of that slice rather than a copy.
+    """
+
+    def __init__(self, tokens: TokenBuffer, offsets: TokenBuffer):
+        """Wrap a flat token buffer and its len(batch) + 1 offsets."""
+        self.tokens = tokens
+        self.offsets = offsets
+
+    @classmethod
+    def from_lists(cls, batch: Iterable[Sequence[int]], kind: str = ARRAY) -> "BatchBuffer":
+        """Pack per-text token sequences into one flat buffer."""
+        tokens = array("I")
+        offsets = array("Q", [0])
+        for ids in batch:
+            tokens.extend(ids)
+            offsets.append(len(tokens))
+        if kind == ARRAY:
+            return cls(tokens, offsets)
+        tokens = to_buffer(tokens, kind)
+        numpy = load_numpy()
+        return cls(tokens, numpy.frombuffer(offsets, dtype=numpy.uint64))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> TokenBuffer:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("BatchBuffer index out of range")
+        start, end = int(self.offsets[index]), int(self.offsets[index + 1])
+        if isinstance(self.tokens, array):
+            return memoryview(self.tokens)[start:end]
+        return self.tokens[start:end]
+
+    def __iter__(self) -> Iterator[TokenBuffer]:
+        return (self[i] for i in range(len(self)))
+
+    def counts(self) -> List[int]:
+        """Get the number of tokens of each text."""
+        return [int(self.offsets[i + 1]) - int(self.offsets[i]) for i in range(len(self))]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the token and offset buffers."""
+        return sum(
+            buffer.nbytes if hasattr(buffer, "nbytes") else buffer.itemsize * len(buffer)
+            for buffer in (self.tokens, self.offsets)
+        )
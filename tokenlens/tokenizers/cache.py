@@ -0,0 +1,284 @@
+"""Bounded in-memory cache of token counts and encodings."""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base import BaseTokenizer
+from .boundaries import DEFAULT_CHUNK_SIZE, TextSource
+from .buffers import ARRAY, BatchBuffer, TokenBuffer
+
+# Approximate memory cost of one cached entry besides its token IDs
+_ENTRY_OVERHEAD = 200
+# Approximate memory cost of one cached token ID (list slot plus int object)
+_TOKEN_ID_SIZE = 36
+
+def content_digest(text: str) -> bytes:
+    """Hash text into a 16-byte digest that is stable across processes."""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+class _Stripe:
+    """One independently locked LRU segment of a TokenCountCache."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[Tuple[str, str, bytes], Tuple[Any, int]]" = OrderedDict()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, *keys: Tuple[str, str, bytes]) -> Any:
+        """Get the value of the first key present, counting one hit or miss."""
+        with self.lock:
+            for key in keys:
+                entry = self.entries.get(key)
+                if entry is not None:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+            self.misses += 1
+            return None
+
+    def put(self, key: Tuple[str, str, bytes], value: Any, size: int) -> None:
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self.entries[key] = (value, size)
+            self.size += size
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+class TokenCountCache:
+    """Thread-safe LRU cache of token counts and token IDs.
+
+    Entries are keyed by (tokenizer id, content digest) and spread over
+    independently locked stripes, so concurrent lookups rarely contend.
+    Both the entry count and the approximate memory use are bounded.
+    """
+
+    def __init__(self, max_entries: int = 100_000, max_bytes: int = 64 * 1024 * 1024, stripes: int = 16):
+        """Initialize the cache with its entry and byte budgets."""
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+        self._stripes = [
+            _Stripe(max(1, max_entries // stripes), max(1, max_bytes // stripes))
+            for _ in range(stripes)
+        ]
+
+    def _stripe(self, digest: bytes) -> _Stripe:
+        return self._stripes[digest[0] % len(self._stripes)]
+
+    def get_count(self, tokenizer_id: str, text: str) -> Optional[int]:
+        """Get the cached token count of text, or None."""
+        digest = content_digest(text)
+        value = self._stripe(digest).get(("count", tokenizer_id, digest), ("tokens", tokenizer_id, digest))
+        return len(value) if isinstance(value, tuple) else value
+
+    def put_count(self, tokenizer_id: str, text: str, count: int) -> None:
+        """Cache the token count of text."""
+        digest = content_digest(text)
+        self._stripe(digest).put(("count", tokenizer_id, digest), count, _ENTRY_OVERHEAD)
+
+    def get_tokens(self, tokenizer_id: str, text: str) -> Optional[List[int]]:
+        """Get a copy of the cached token IDs of text, or None."""
+        digest = content_digest(text)
+        tokens = self._stripe(digest).get(("tokens", tokenizer_id, digest))
+        return list(tokens) if tokens is not None else None
+
+    def put_tokens(self, tokenizer_id: str, text: str, tokens: List[int]) -> None:
+        """Cache the token IDs of text (and therefore its count)."""
+        digest = content_digest(text)
+        size = _ENTRY_OVERHEAD + _TOKEN_ID_SIZE * len(tokens)
+        self._stripe(digest).put(("tokens", tokenizer_id, digest), tuple(tokens), size)
+
+    def clear(self) -> None:
+        """Drop all entries, keeping the counters."""
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.entries.clear()
+                stripe.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit, miss and eviction counters and current usage."""
+        totals = {"hits": 0, "misses": 0, "evictions": 0, "entries": 0, "bytes": 0}
+        for stripe in self._stripes:
+            with stripe.lock:
+                totals["hits"] += stripe.hits
+                totals["misses"] += stripe.misses
+                totals["evictions"] += stripe.evictions
+                totals["entries"] += len(stripe.entries)
+                totals["bytes"] += stripe.size
+        return totals
+
+def _count_result(count: int, max_tokens: int) -> Dict[str, Any]:
+    """Build a check_limit result from a known exact count."""
+    return {
+        "within_limit": count <= max_tokens,
+        "token_count": count,
+        "exact": True,
+        "cutoff_char": None,
+        "decided_by": "count",
+    }
+
+class CachedTokenizer(BaseTokenizer):
+    """Tokenizer wrapper that memoizes count_tokens and encode results.
+
+    Tokenizers raise rather than return an estimate when they cannot count,
+    so counts are exact and safe to cache. check_limit results are only
+    cached when they are exact.
+    """
+
+    def __init__(self, tokenizer: BaseTokenizer, cache: Optional[Any] = None):
+        """Wrap a tokenizer with a cache (a new TokenCountCache by default).
+
+        Any cache with the TokenCountCache get/put methods works, e.g. a
+        DiskTokenCountCache shared by several processes.
+        """
+        self.tokenizer = tokenizer
+        self.cache = cache if cache is not None else TokenCountCache()
+
+    def __getattr__(self, name: str) -> Any:
+        # Expose the wrapped tokenizer's own attributes (model_name, client, ...)
+        tokenizer = self.__dict__.get("tokenizer")
+        if tokenizer is None:
+            raise AttributeError(name)
+        return getattr(tokenizer, name)
+
+    @property
+    def tokenizer_id(self) -> str:
+        """Identity of the wrapped tokenizer."""
+        return self.tokenizer.tokenizer_id
+
+    # Class-level capabilities would shadow __getattr__, so forward them explicitly
+    supports_ids = property(lambda self: self.tokenizer.supports_ids)
+    supports_decode = property(lambda self: self.tokenizer.supports_decode)
+    supports_offsets = property(lambda self: self.tokenizer.supports_offsets)
+    remote = property(lambda self: self.tokenizer.remote)
+    max_concurrency = property(lambda self: self.tokenizer.max_concurrency)
+    estimator_family = property(lambda self: self.tokenizer.estimator_family)
+
+    def encode(self, text: str) -> List[int]:
+        """Encode text into tokens, reusing cached IDs."""
+        tokens = self.cache.get_tokens(self.tokenizer_id, text)
+        if tokens is None:
+            tokens = self.tokenizer.encode(text)
+            self.cache.put_tokens(self.tokenizer_id, text, tokens)
+        return tokens
+
+    def decode(self, tokens: List[int]) -> str:
+        """Decode tokens back into text."""
+        return self.tokenizer.decode(tokens)
+
+    def encode_with_offsets(self, text: str) -> Tuple[List[int], List[int]]:
+        """Encode text into token IDs plus the character offset where each token starts."""
+        return self.tokenizer.encode_with_offsets(text)
+
+    def count_tokens(self, text: str) -> int:
+        """Count the number of tokens in the text, reusing cached counts."""
+        count = self.cache.get_count(self.tokenizer_id, text)
+        if count is None:
+            count = self.tokenizer.count_tokens(text)
+            self.cache.put_count(self.tokenizer_id, text, count)
+        return count
+
+    def encode_buffer(self, text: str, kind: str = ARRAY) -> TokenBuffer:
+        """Encode text into a compact token buffer; buffers are not cached."""
+        return self.tokenizer.encode_buffer(text, kind)
+
+    def encode_batch_buffer(self, texts: List[str], kind: str = ARRAY) -> BatchBuffer:
+        """Encode a batch of texts into one flat token buffer; buffers are not cached."""
+        return self.tokenizer.encode_batch_buffer(texts, kind)
+
+    def encode_batch(self, texts: List[str]) -> List[List[int]]:
+        """Encode a batch of texts, sending only cache misses to the tokenizer."""
+        results: List[Optional[List[int]]] = [self.cache.get_tokens(self.tokenizer_id, text) for text in texts]
+        missing = [i for i, tokens in enumerate(results) if tokens is None]
+        if missing:
+            encoded = self.tokenizer.encode_batch([texts[i] for i in missing])
+            for i, tokens in zip(missing, encoded):
+                self.cache.put_tokens(self.tokenizer_id, texts[i], tokens)
+                results[i] = tokens
+        return results
+
+    def count_tokens_batch(self, texts: List[str]) -> List[int]:
+        """Count tokens for a batch of texts, sending only cache misses to the tokenizer."""
+        results: List[Optional[int]] = [self.cache.get_count(self.tokenizer_id, text) for text in texts]
+        missing = [i for i, count in enumerate(results) if count is None]
+        if missing:
+            counts = self.tokenizer.count_tokens_batch([texts[i] for i in missing])
+            for i, count in zip(missing, counts):
+                self.cache.put_count(self.tokenizer_id, texts[i], count)
+                results[i] = count
+        return results
+
+    def count_tokens_stream(self, source: TextSource, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """Count streamed text; streams are not cached."""
+        return self.tokenizer.count_tokens_stream(source, chunk_size)
+
+    def count_tokens_parallel(self, text: str, workers: Optional[int] = None) -> int:
+        """Count the tokens of a large text on several cores, reusing cached counts."""
+        count = self.cache.get_count(self.tokenizer_id, text)
+        if count is None:
+            count = self.tokenizer.count_tokens_parallel(text, workers)
+            self.cache.put_count(self.tokenizer_id, text, count)
+        return count
+
+    def token_bounds(self, text: str) -> Optional[Tuple[int, int]]:
+        """Get bounds on the token count from the wrapped tokenizer."""
+        return self.tokenizer.token_bounds(text)
+
+    def check_limit(self, text: str, max_tokens: int) -> Dict[str, Any]:
+        """Check text against max_tokens, answering from a cached count when possible."""
+        count = self.cache.get_count(self.tokenizer_id, text)
+        if count is not None:
+            return _count_result(count, max_tokens)
+        result = self.tokenizer.check_limit(text, max_tokens)
+        if result["exact"]:
+            self.cache.put_count(self.tokenizer_id, text, result["token_count"])
+        return result
+
+    async def aencode(self, text: str) -> List[int]:
+        """Encode text into tokens without blocking the event loop, reusing cached IDs."""
+        tokens = self.cache.get_tokens(self.tokenizer_id, text)
+        if tokens is None:
+            tokens = await self.tokenizer.aencode(text)
+            self.cache.put_tokens(self.tokenizer_id, text, tokens)
+        return tokens
+
+    async def acount_tokens(self, text: str) -> int:
+        """Count tokens without blocking the event loop, reusing cached counts."""
+        count = self.cache.get_count(self.tokenizer_id, text)
+        if count is None:
+            count = await self.tokenizer.acount_tokens(text)
+            self.cache.put_count(self.tokenizer_id, text, count)
+        return count
+
+    async def acount_tokens_batch(self, texts: List[str]) -> List[int]:
+        """Count tokens for a batch without blocking the event loop, sending only cache misses."""
+        results: List[Optional[int]] = [self.cache.get_count(self.tokenizer_id, text) for text in texts]
+        missing = [i for i, count in enumerate(results) if count is None]
+        if missing:
+            counts = await self.tokenizer.acount_tokens_batch([texts[i] for i in missing])
+            for i, count in zip(missing, counts):
+                self.cache.put_count(self.tokenizer_id, texts[i], count)
+                results[i] = count
+        return results
+
+    async def acheck_limit(self, text: str, max_tokens: int) -> Dict[str, Any]:
+        """Check text against max_tokens without blocking the event loop."""
+        count = self.cache.get_count(self.tokenizer_id, text)
+        if count is not None:
+            return _count_result(count, max_tokens)
+        result = await self.tokenizer.acheck_limit(text, max_tokens)
+        if result["exact"]:
+            self.cache.put_count(self.tokenizer_id, text, result["token_count"])
+        return result
@@ -0,0 +1,130 @@
+"""Micro-batching of concurrent count_tokens calls to a tokenizer."""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+from .base import BaseTokenizer
+
+class CountCoalescer:
+    """Gather concurrent count requests into batched tokenizer calls.
+
+    Requests from any thread or event loop are queued; a background thread
+    collects them for up to window seconds (or until max_batch texts are
+    waiting), counts each distinct text once through count_tokens_batch and
+    hands every caller its result. Remote tokenizers send a batch as one
+    bounded parallel fan-out, so thousands of tiny round trips per second
+    become a handful of batches.
+    """
+
+    def __init__(self, tokenizer: BaseTokenizer, window: float = 0.005, max_batch: int = 64):
+        """Initialize the coalescer.
+
+        Args:
+            tokenizer: Tokenizer whose count_tokens_batch does the counting
+            window: Seconds to wait for more requests after the first one arrives
+            max_batch: Largest number of distinct texts counted in one batch
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.tokenizer = tokenizer
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Optional[Tuple[str, Future]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, text: str) -> "Future[int]":
+        """Queue text for counting and return a future of its token count."""
+        future: "Future[int]" = Future()
+        with self._lock:
+            if self._closed:
+                raise ValueError("CountCoalescer is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="CountCoalescer", daemon=True)
+                self._thread.start()
+            self._queue.put((text, future))
+        return future
+
+    def count_tokens(self, text: str) -> int:
+        """Count the tokens of text, waiting for its batch to complete."""
+        return self.submit(text).result()
+
+    async def acount_tokens(self, text: str) -> int:
+        """Count the tokens of text without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def close(self) -> None:
+        """Count what is still queued, then stop the background thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            self._queue.put(None)
+        if thread is not None:
+            thread.join()
+
+    def __enter__(self) -> "CountCoalescer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        """Collect and count batches until close() is called."""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            pending: Dict[str, List[Future]] = {item[0]: [item[1]]}
+            expires = time.monotonic() + self.window
+            while len(pending) < self.max_batch:
+                remaining = expires - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                pending.setdefault(item[0], []).append(item[1])
+            try:
+                self._count(pending)
+            except Exception as e:
+                # Keep the thread alive for later batches whatever went wrong with this one
+                for futures in pending.values():
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(e)
+
+    def _count(self, pending: Dict[str, List[Future]]) -> None:
+        """Count one batch of distinct texts and resolve their futures.
+
+        Futures are claimed first so that callers who cancelled in the
+        meantime are skipped, along with texts nobody is waiting for.
+        """
+        for text in list(pending):
+            pending[text] = [future for future in pending[text] if future.set_running_or_notify_cancel()]
+            if not pending[text]:
+                del pending[text]
+        if not pending:
+            return
+        texts = list(pending)
+        try:
+            counts = self.tokenizer.count_tokens_batch(texts)
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    future.set_exception(e)
+            return
+        if len(counts) != len(texts):
+            raise ValueError(f"Expected {len(texts)} token counts, got {len(counts)}")
+        for text, count in zip(texts, counts):
+            for future in pending[text]:
+                future.set_result(count)
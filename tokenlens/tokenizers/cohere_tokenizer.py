@@ -2,42 +2,84 @@
 
 from typing import List, Optional
 import cohere
-from .base_tokenizer import BaseTokenizer
+from .base import BaseTokenizer
 
 class CohereTokenizer(BaseTokenizer):
     """Cohere tokenizer for text encoding and decoding."""
     
+    remote = True
+    estimator_family = "cohere"
+    
     def __init__(self, api_key: Optional[str] = None):
         """Initialize Cohere tokenizer with API key."""
         super().__init__()
+        self.api_key = api_key
         self.client = cohere.Client(api_key) if api_key else None
+        self._async_client = None
+    
+    @property
+    def async_client(self):
+        """Async Cohere client, created on first use inside an event loop."""
+        if self._async_client is None and self.api_key:
+            self._async_client = cohere.AsyncClient(self.api_key)
+        return self._async_client
     
     def encode(self, text: str) -> List[int]:
         """Encode text into token IDs."""
         if not self.client:
-            return super().encode(text)
+            raise ValueError("Tokenizer not initialized")
         try:
             response = self.client.tokenize(text=text)
             return response.tokens
-        except:
-            return super().encode(text)
+        except Exception as e:
+            raise ValueError(f"Failed to encode text: {str(e)}")
     
     def decode(self, token_ids: List[int]) -> str:
         """Decode token IDs back into text."""
         if not self.client:
-            return super().decode(token_ids)
+            raise ValueError("Tokenizer not initialized")
         try:
             response = self.client.detokenize(tokens=token_ids)
             return response.text
-        except:
-            return super().decode(token_ids)
+        except Exception as e:
+            raise ValueError(f"Failed to decode tokens: {str(e)}")
     
     def count_tokens(self, text: str) -> int:
         """Count the number of tokens in the text."""
         if not self.client:
-            return super().count_tokens(text)
+            raise ValueError("Tokenizer not initialized")
         try:
             response = self.client.tokenize(text=text)
             return response.length
-        except:
-            return super().count_tokens(text)
+        except Exception as e:
+            raise ValueError(f"Failed to count tokens: {str(e)}")
+    
+    async def aencode(self, text: str) -> List[int]:
+        """Encode text into token IDs without blocking the event loop."""
+        if not self.async_client:
+            raise ValueError("Tokenizer not initialized")
+        try:
+            response = await self.async_client.tokenize(text=text)
+            return response.tokens
+        except Exception as e:
+            raise ValueError(f"Failed to encode text: {str(e)}")
+    
+    async def adecode(self, token_ids: List[int]) -> str:
+        """Decode token IDs back into text without blocking the event loop."""
+        if not self.async_client:
+            raise ValueError("Tokenizer not initialized")
+        try:
+            response = await self.async_client.detokenize(tokens=token_ids)
+            return response.text
+        except Exception as e:
+            raise ValueError(f"Failed to decode tokens: {str(e)}")
+    
+    async def acount_tokens(self, text: str) -> int:
+        """Count the number of tokens in the text without blocking the event loop."""
+        if not self.async_client:
+            raise ValueError("Tokenizer not initialized")
+        try:
+            response = await self.async_client.tokenize(text=text)
+            return response.length
+        except Exception as e:
+            raise ValueError(f"Failed to count tokens: {str(e)}")
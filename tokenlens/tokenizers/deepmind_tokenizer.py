@@ -1,67 +1,102 @@
 """DeepMind tokenizer implementation."""
 
-from typing import List, Optional
-import requests
-from .base_tokenizer import BaseTokenizer
+from typing import Any, Dict, List, Optional
+from .base import BaseTokenizer
+from ..transport import HTTPTransport
 
 class DeepMindTokenizer(BaseTokenizer):
     """DeepMind tokenizer for text encoding and decoding."""
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize DeepMind tokenizer with API key."""
+    remote = True
+    estimator_family = "gemini"
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = "https://api.deepmind.com/v1",
+        transport: Optional[HTTPTransport] = None,
+        deadline: Optional[float] = 30.0,
+    ):
+        """Initialize DeepMind tokenizer with API key.
+        
+        Args:
+            api_key: DeepMind API key
+            base_url: API root, e.g. a local stand-in server in tests
+            transport: HTTP transport to use (a pooled one is created by default)
+            deadline: Total seconds allowed per call, including retries
+        """
         super().__init__()
         self.api_key = api_key
-        self.base_url = "https://api.deepmind.com/v1"
+        self.base_url = base_url
+        self.deadline = deadline
+        self.headers = {}
         if api_key:
             self.headers = {
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json"
             }
+        self.transport = transport or HTTPTransport(base_url, headers=self.headers)
     
-    def encode(self, text: str) -> List[int]:
-        """Encode text into token IDs."""
+    def _post(self, endpoint: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """POST payload to an API endpoint, returning the JSON body or None on failure."""
+        response = self.transport.post(endpoint, json=payload, deadline=self.deadline)
+        if response.status_code == 200:
+            return response.json()
+        return None
+    
+    async def _apost(self, endpoint: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """POST payload to an API endpoint without blocking the event loop."""
+        status, body = await self.transport.apost(endpoint, json=payload, deadline=self.deadline)
+        return body if status == 200 else None
+    
+    def _call(self, endpoint: str, payload: Dict[str, Any], field: str, action: str) -> Any:
+        """POST payload and return one field of the response.
+        
+        Raises:
+            ValueError: If there is no API key or the request fails
+        """
         if not self.api_key:
-            return super().encode(text)
+            raise ValueError("Tokenizer not initialized")
         try:
-            response = requests.post(
-                f"{self.base_url}/tokenize",
-                headers=self.headers,
-                json={"text": text}
-            )
-            if response.status_code == 200:
-                return response.json()["tokens"]
-            return super().encode(text)
-        except:
-            return super().encode(text)
+            body = self._post(endpoint, payload)
+        except Exception as e:
+            raise ValueError(f"Failed to {action}: {str(e)}")
+        if body is None:
+            raise ValueError(f"Failed to {action}: the API returned an error")
+        return body[field]
     
-    def decode(self, token_ids: List[int]) -> str:
-        """Decode token IDs back into text."""
+    async def _acall(self, endpoint: str, payload: Dict[str, Any], field: str, action: str) -> Any:
+        """POST payload without blocking the event loop and return one field of the response."""
         if not self.api_key:
-            return super().decode(token_ids)
+            raise ValueError("Tokenizer not initialized")
         try:
-            response = requests.post(
-                f"{self.base_url}/detokenize",
-                headers=self.headers,
-                json={"tokens": token_ids}
-            )
-            if response.status_code == 200:
-                return response.json()["text"]
-            return super().decode(token_ids)
-        except:
-            return super().decode(token_ids)
+            body = await self._apost(endpoint, payload)
+        except Exception as e:
+            raise ValueError(f"Failed to {action}: {str(e)}")
+        if body is None:
+            raise ValueError(f"Failed to {action}: the API returned an error")
+        return body[field]
+    
+    def encode(self, text: str) -> List[int]:
+        """Encode text into token IDs."""
+        return self._call("tokenize", {"text": text}, "tokens", "encode text")
+    
+    def decode(self, token_ids: List[int]) -> str:
+        """Decode token IDs back into text."""
+        return self._call("detokenize", {"tokens": token_ids}, "text", "decode tokens")
     
     def count_tokens(self, text: str) -> int:
         """Count the number of tokens in the text."""
-        if not self.api_key:
-            return super().count_tokens(text)
-        try:
-            response = requests.post(
-                f"{self.base_url}/count_tokens",
-                headers=self.headers,
-                json={"text": text}
-            )
-            if response.status_code == 200:
-                return response.json()["count"]
-            return super().count_tokens(text)
-        except:
-            return super().count_tokens(text)
+        return self._call("count_tokens", {"text": text}, "count", "count tokens")
+    
+    async def aencode(self, text: str) -> List[int]:
+        """Encode text into token IDs without blocking the event loop."""
+        return await self._acall("tokenize", {"text": text}, "tokens", "encode text")
+    
+    async def adecode(self, token_ids: List[int]) -> str:
+        """Decode token IDs back into text without blocking the event loop."""
+        return await self._acall("detokenize", {"tokens": token_ids}, "text", "decode tokens")
+    
+    async def acount_tokens(self, text: str) -> int:
+        """Count the number of tokens in the text without blocking the event loop."""
+        return await self._acall("count_tokens", {"text": text}, "count", "count tokens")
@@ -0,0 +1,182 @@
+"""Persistent SQLite cache of token counts shared across processes."""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .cache import content_digest
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS token_counts (
+    tokenizer_id TEXT NOT NULL,
+    digest BLOB NOT NULL,
+    count INTEGER NOT NULL,
+    accessed INTEGER NOT NULL,
+    PRIMARY KEY (tokenizer_id, digest)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS token_counts_accessed ON token_counts (accessed);
+"""
+
+class DiskTokenCountCache:
+    """SQLite-backed cache of token counts that survives restarts.
+
+    The database runs in WAL mode, so any number of worker processes can read
+    it while one of them writes. Entries are keyed by (tokenizer id, content
+    digest) like TokenCountCache and can be used anywhere it can, e.g.
+    CachedTokenizer or TokenizerRegistry.set_cache. Only counts are persisted;
+    token IDs are not.
+
+    The least recently used entries beyond max_entries are removed every
+    compact_every writes, and the freed pages are returned to the filesystem.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 10_000_000,
+        compact_every: int = 10_000,
+        touch_interval: int = 3600,
+        timeout: float = 30.0,
+    ):
+        """Open (or create) the cache database.
+
+        Args:
+            path: Path of the SQLite database file
+            max_entries: Number of entries kept after compaction
+            compact_every: Number of writes by this process between compactions
+            touch_interval: Seconds before a read refreshes an entry's LRU timestamp
+            timeout: Seconds to wait for another process's write lock
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.path = path
+        self.max_entries = max_entries
+        self.compact_every = compact_every
+        self.touch_interval = touch_interval
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        # Create the schema up front so readers never race its creation
+        self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, reopening it after a fork."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            # auto_vacuum only takes effect before the first table is created
+            connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get_count(self, tokenizer_id: str, text: str) -> Optional[int]:
+        """Get the cached token count of text, or None."""
+        digest = content_digest(text)
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT count, accessed FROM token_counts WHERE tokenizer_id = ? AND digest = ?",
+            (tokenizer_id, digest),
+        ).fetchone()
+        with self._lock:
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        # Refresh the LRU timestamp rarely so that hot reads stay read-only
+        now = int(time.time())
+        if now - row[1] >= self.touch_interval:
+            try:
+                connection.execute(
+                    "UPDATE token_counts SET accessed = ? WHERE tokenizer_id = ? AND digest = ?",
+                    (now, tokenizer_id, digest),
+                )
+            except sqlite3.OperationalError:
+                pass
+        return row[0]
+
+    def put_count(self, tokenizer_id: str, text: str, count: int) -> None:
+        """Cache the token count of text."""
+        self._connection().execute(
+            "INSERT OR REPLACE INTO token_counts (tokenizer_id, digest, count, accessed) VALUES (?, ?, ?, ?)",
+            (tokenizer_id, content_digest(text), count, int(time.time())),
+        )
+        with self._lock:
+            self._writes += 1
+            compact = self.compact_every > 0 and self._writes % self.compact_every == 0
+        if compact:
+            self.compact()
+
+    def get_tokens(self, tokenizer_id: str, text: str) -> Optional[List[int]]:
+        """Token IDs are not persisted, so this always returns None."""
+        return None
+
+    def put_tokens(self, tokenizer_id: str, text: str, tokens: List[int]) -> None:
+        """Cache the count of the given token IDs."""
+        self.put_count(tokenizer_id, text, len(tokens))
+
+    def compact(self) -> int:
+        """Evict the least recently used entries beyond max_entries.
+
+        Returns:
+            The number of evicted entries
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            (entries,) = connection.execute("SELECT COUNT(*) FROM token_counts").fetchone()
+            excess = entries - self.max_entries
+            if excess > 0:
+                connection.execute(
+                    "DELETE FROM token_counts WHERE (tokenizer_id, digest) IN ("
+                    "SELECT tokenizer_id, digest FROM token_counts ORDER BY accessed LIMIT ?)",
+                    (excess,),
+                )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        if excess > 0:
+            connection.execute("PRAGMA incremental_vacuum")
+            with self._lock:
+                self._evictions += excess
+        return max(excess, 0)
+
+    def clear(self) -> None:
+        """Drop all entries, keeping the counters."""
+        connection = self._connection()
+        connection.execute("DELETE FROM token_counts")
+        connection.execute("PRAGMA incremental_vacuum")
+
+    def stats(self) -> Dict[str, int]:
+        """Get this process's hit, miss and eviction counters and current usage."""
+        connection = self._connection()
+        (entries,) = connection.execute("SELECT COUNT(*) FROM token_counts").fetchone()
+        (page_count,) = connection.execute("PRAGMA page_count").fetchone()
+        (page_size,) = connection.execute("PRAGMA page_size").fetchone()
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": entries,
+                "bytes": page_count * page_size,
+            }
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
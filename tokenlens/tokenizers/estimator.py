@@ -0,0 +1,229 @@
+"""Fast offline token estimates with confidence intervals."""
+
+import math
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Character classes that tokenize at very different rates
+FEATURES = ("ascii", "digit", "cjk", "other")
+
+# Han, kana, hangul and full-width forms, which mostly take one or more tokens per character
+_CJK = re.compile(
+    "[\u1100-\u11ff\u2e80-\u9fff\ua960-\ua97f\uac00-\ud7ff\uf900-\ufaff"
+    "\ufe30-\ufe4f\uff00-\uffef\U00020000-\U0003ffff]"
+)
+_NON_ASCII = re.compile("[^\x00-\x7f]")
+
+# Tokens per character of each class, with the relative error that the
+# confidence interval allows. These are seed values from the published
+# characteristics of each vocabulary, not fitted on a corpus; calibrate()
+# refits them on real counts.
+FAMILY_RATIOS: Dict[str, Dict[str, float]] = {
+    "cl100k_base": {"ascii": 0.25, "digit": 0.34, "cjk": 0.9, "other": 0.45, "margin": 0.25},
+    "o200k_base": {"ascii": 0.24, "digit": 0.34, "cjk": 0.7, "other": 0.3, "margin": 0.25},
+    "p50k_base": {"ascii": 0.26, "digit": 0.6, "cjk": 1.6, "other": 0.9, "margin": 0.3},
+    "r50k_base": {"ascii": 0.26, "digit": 0.6, "cjk": 1.6, "other": 0.9, "margin": 0.3},
+    "claude": {"ascii": 0.28, "digit": 0.34, "cjk": 1.0, "other": 0.5, "margin": 0.3},
+    "gemini": {"ascii": 0.24, "digit": 1.0, "cjk": 0.6, "other": 0.3, "margin": 0.3},
+    "llama": {"ascii": 0.28, "digit": 1.0, "cjk": 1.4, "other": 0.7, "margin": 0.3},
+    "mistral": {"ascii": 0.29, "digit": 1.0, "cjk": 1.3, "other": 0.7, "margin": 0.3},
+    "cohere": {"ascii": 0.25, "digit": 0.34, "cjk": 0.9, "other": 0.45, "margin": 0.3},
+    "qwen": {"ascii": 0.24, "digit": 1.0, "cjk": 0.65, "other": 0.4, "margin": 0.3},
+    "default": {"ascii": 0.27, "digit": 0.5, "cjk": 1.0, "other": 0.6, "margin": 0.4},
+}
+
+# Families used by each provider's models
+PROVIDER_FAMILIES: Dict[str, str] = {
+    "openai": "cl100k_base",
+    "microsoft": "cl100k_base",
+    "anthropic": "claude",
+    "google": "gemini",
+    "deepmind": "gemini",
+    "meta": "llama",
+    "stanford": "llama",
+    "huggingface": "llama",
+    "mistral": "mistral",
+    "cohere": "cohere",
+    "qwen": "qwen",
+}
+
+# Extra tokens allowed on either side, which dominates for very short texts
+_SLACK = 4
+
+def count_features(text: str) -> Dict[str, int]:
+    """Count the characters of text in each estimator class."""
+    digit = sum(text.count(d) for d in "0123456789")
+    if text.isascii():
+        return {"ascii": len(text) - digit, "digit": digit, "cjk": 0, "other": 0}
+    non_ascii = _NON_ASCII.subn("", text)[1]
+    cjk = _CJK.subn("", text)[1]
+    return {"ascii": len(text) - non_ascii - digit, "digit": digit, "cjk": cjk, "other": non_ascii - cjk}
+
+def family_for(provider: str, model_name: Optional[str] = None) -> str:
+    """Get the estimator family of a provider's model."""
+    provider = provider.split(".")[0].lower()
+    if provider in ("openai", "microsoft") and model_name:
+        try:
+            import tiktoken.model
+            return tiktoken.model.encoding_name_for_model(model_name)
+        except (ImportError, KeyError):
+            pass
+    return PROVIDER_FAMILIES.get(provider, "default")
+
+class TokenEstimator:
+    """Estimate token counts from character-class ratios, without tokenizing.
+
+    An estimate costs a few passes over the text in C and comes with an
+    interval that the exact count falls in for typical text. Limit checks
+    only trust the estimate to reject text whose whole interval lies above
+    the limit, and only once the ratios are calibrated (fitted with
+    calibrate() or given explicitly): the seed ratios can be far off for
+    whitespace-, punctuation- or code-heavy text. Accepting text always
+    takes an exact count.
+    """
+
+    _shared: Dict[str, "TokenEstimator"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, family: str = "default", ratios: Optional[Dict[str, float]] = None):
+        """Initialize the estimator.
+
+        Args:
+            family: Tokenizer family, a key of FAMILY_RATIOS
+            ratios: Tokens per character of each class plus "margin", overriding the
+                family's seed ratios; explicit ratios count as calibrated
+        """
+        self.family = family
+        self.ratios = dict(ratios or FAMILY_RATIOS.get(family, FAMILY_RATIOS["default"]))
+        # Whether the interval is trusted to reject text without an exact count
+        self.calibrated = ratios is not None
+
+    @classmethod
+    def for_family(cls, family: str) -> "TokenEstimator":
+        """Get the shared estimator of a family."""
+        estimator = cls._shared.get(family)
+        if estimator is None:
+            with cls._lock:
+                estimator = cls._shared.setdefault(family, cls(family))
+        return estimator
+
+    @classmethod
+    def for_model(cls, provider: str, model_name: Optional[str] = None) -> "TokenEstimator":
+        """Get the shared estimator of a provider's model."""
+        return cls.for_family(family_for(provider, model_name))
+
+    def estimate(self, text: str) -> Dict[str, Any]:
+        """Estimate the token count of text.
+
+        Returns:
+            Dict with the point "estimate", the interval "low" and "high" and the "family"
+        """
+        features = count_features(text)
+        estimate = sum(features[name] * self.ratios[name] for name in FEATURES)
+        margin = self.ratios["margin"]
+        low = max(0, math.floor(estimate * (1 - margin)) - _SLACK)
+        high = math.ceil(estimate * (1 + margin)) + _SLACK
+        if not text:
+            low = high = 0
+        return {
+            "estimate": round(estimate),
+            "low": low,
+            "high": high,
+            "family": self.family,
+        }
+
+    def check_limit(self, text: str, max_tokens: int, tokenizer: Optional[Any] = None) -> Dict[str, Any]:
+        """Check text against max_tokens, tokenizing only when the estimate is inconclusive.
+
+        Returns the same dict as BaseTokenizer.check_limit. When the ratios
+        are calibrated and the interval lies above the limit, "decided_by" is
+        "estimate", "exact" is False and "token_count" is the point estimate.
+        Otherwise tokenizer.check_limit decides, or the point estimate does
+        (still with "exact" False) if no tokenizer is given.
+        """
+        result = self.decide(text, max_tokens)
+        if result is not None:
+            return result
+        if tokenizer is not None:
+            return tokenizer.check_limit(text, max_tokens)
+        estimate = self.estimate(text)
+        return _estimate_result(estimate["estimate"], estimate["estimate"] <= max_tokens)
+
+    def decide(self, text: str, max_tokens: int) -> Optional[Dict[str, Any]]:
+        """Reject text whose whole interval lies above max_tokens, or return None if an exact count is needed.
+
+        Uncalibrated estimators never reject.
+        """
+        if not self.calibrated:
+            return None
+        estimate = self.estimate(text)
+        if estimate["low"] > max_tokens:
+            return _estimate_result(estimate["estimate"], False)
+        return None
+
+    def calibrate(self, samples: Iterable[Tuple[str, int]], confidence: float = 0.95) -> "TokenEstimator":
+        """Fit the ratios to (text, exact token count) samples.
+
+        Classes absent from the samples keep their current ratio. The margin
+        becomes the confidence quantile of the relative error on the samples,
+        and the estimator counts as calibrated from then on.
+
+        Returns:
+            self, for chaining
+        """
+        rows = [(count_features(text), count) for text, count in samples if text]
+        if not rows:
+            raise ValueError("calibrate needs at least one non-empty sample")
+        present = [name for name in FEATURES if any(features[name] for features, _ in rows)]
+        fixed = [name for name in FEATURES if name not in present]
+        matrix = [[features[name] for name in present] for features, _ in rows]
+        targets = [count - sum(features[name] * self.ratios[name] for name in fixed) for features, count in rows]
+        prior = [self.ratios[name] for name in present]
+        # Shrink rarely seen classes towards their current ratio instead of overfitting them
+        strength = 0.01 * (sum(map(sum, matrix)) / len(matrix)) ** 2
+        for name, ratio in zip(present, _least_squares(matrix, targets, prior, strength)):
+            self.ratios[name] = max(ratio, 0.0)
+
+        errors = sorted(
+            abs(sum(features[name] * self.ratios[name] for name in FEATURES) - count) / max(count, 1)
+            for features, count in rows
+        )
+        self.ratios["margin"] = errors[min(len(errors) - 1, math.ceil(confidence * len(errors)) - 1)]
+        self.calibrated = True
+        return self
+
+def _estimate_result(token_count: int, within_limit: bool) -> Dict[str, Any]:
+    """Build a check_limit result decided by an estimate."""
+    return {
+        "within_limit": within_limit,
+        "token_count": token_count,
+        "exact": False,
+        "cutoff_char": None,
+        "decided_by": "estimate",
+    }
+
+def _least_squares(
+    matrix: List[List[float]], targets: List[float], prior: List[float], strength: float
+) -> List[float]:
+    """Solve a small least-squares problem with a ridge penalty towards prior."""
+    size = len(matrix[0])
+    normal = [[sum(row[i] * row[j] for row in matrix) for j in range(size)] for i in range(size)]
+    rhs = [sum(row[i] * target for row, target in zip(matrix, targets)) for i in range(size)]
+    for i in range(size):
+        normal[i][i] += strength
+        rhs[i] += strength * prior[i]
+    # Gaussian elimination with partial pivoting
+    for col in range(size):
+        pivot = max(range(col, size), key=lambda r: abs(normal[r][col]))
+        normal[col], normal[pivot] = normal[pivot], normal[col]
+        rhs[col], rhs[pivot] = rhs[pivot], rhs[col]
+        for r in range(col + 1, size):
+            factor = normal[r][col] / normal[col][col]
+            for c in range(col, size):
+                normal[r][c] -= factor * normal[col][c]
+            rhs[r] -= factor * rhs[col]
+    solution = [0.0] * size
+    for r in range(size - 1, -1, -1):
+        solution[r] = (rhs[r] - sum(normal[r][c] * solution[c] for c in range(r + 1, size))) / normal[r][r]
+    return solution
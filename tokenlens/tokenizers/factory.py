@@ -1,6 +1,6 @@
 """Tokenizer factory for creating tokenizer instances."""
 
-from typing import Dict, Type, Optional
+from typing import Any, Dict, Type, Optional
 from importlib import import_module
 from .base import BaseTokenizer
 
@@ -64,6 +64,14 @@ class TokenizerFactory:
         except ImportError:
             return None
     
+    @classmethod
+    def get_shared_tokenizer(
+        cls, tokenizer_name: str, model_name: Optional[str] = None, **options: Any
+    ) -> Optional[BaseTokenizer]:
+        """Get a shared, ready-to-use tokenizer instance by name."""
+        from .registry import TokenizerRegistry
+        return TokenizerRegistry.get_tokenizer(tokenizer_name, model_name, **options)
+    
     @classmethod
     def register_tokenizer(cls, name: str, tokenizer_path: str) -> None:
         """Register a new tokenizer."""
@@ -2,11 +2,17 @@
 
 from typing import List, Optional
 import google.generativeai as genai
-from .base_tokenizer import BaseTokenizer
+from .base import BaseTokenizer
 
 class GoogleTokenizer(BaseTokenizer):
     """Google AI tokenizer for text encoding and decoding."""
     
+    # The API reports counts only; it exposes neither token IDs nor decoding
+    supports_ids = False
+    supports_decode = False
+    remote = True
+    estimator_family = "gemini"
+    
     def __init__(self, api_key: Optional[str] = None):
         """Initialize Google tokenizer with API key."""
         super().__init__()
@@ -15,31 +21,29 @@ class GoogleTokenizer(BaseTokenizer):
         self.model = genai.GenerativeModel('gemini-pro') if api_key else None
     
     def encode(self, text: str) -> List[int]:
-        """Encode text into token IDs."""
-        if not self.model:
-            return super().encode(text)
-        try:
-            response = self.model.count_tokens(text)
-            return list(range(response.total_tokens))  # Google doesn't expose token IDs
-        except:
-            return super().encode(text)
+        """Google does not expose token IDs; use count_tokens."""
+        raise NotImplementedError("Google does not support token encoding")
     
     def decode(self, token_ids: List[int]) -> str:
-        """Decode token IDs back into text."""
-        if not self.model:
-            return super().decode(token_ids)
-        try:
-            # Google doesn't provide decoding functionality
-            return super().decode(token_ids)
-        except:
-            return super().decode(token_ids)
+        """Google does not expose token IDs, so there is nothing to decode."""
+        raise NotImplementedError("Google does not support token decoding")
     
     def count_tokens(self, text: str) -> int:
         """Count the number of tokens in the text."""
         if not self.model:
-            return super().count_tokens(text)
+            raise ValueError("Tokenizer not initialized")
         try:
             response = self.model.count_tokens(text)
             return response.total_tokens
-        except:
-            return super().count_tokens(text)
+        except Exception as e:
+            raise ValueError(f"Failed to count tokens: {str(e)}")
+    
+    async def acount_tokens(self, text: str) -> int:
+        """Count the number of tokens in the text without blocking the event loop."""
+        if not self.model:
+            raise ValueError("Tokenizer not initialized")
+        try:
+            response = await self.model.count_tokens_async(text)
+            return response.total_tokens
+        except Exception as e:
+            raise ValueError(f"Failed to count tokens: {str(e)}")
@@ -0,0 +1,32 @@
+"""Batch encoding shared by the tokenizers built on Hugging Face transformers."""
+
+from typing import List
+
+class HuggingFaceBatchMixin:
+    """Batch methods for tokenizers wrapping a transformers tokenizer in self.tokenizer.
+
+    Fast tokenizers encode a whole list in one call; tokenizers without a
+    batch path (e.g. slow ones), or without a loaded tokenizer, fall back to
+    the per-text methods. Mix in before BaseTokenizer.
+    """
+
+    def encode_batch(self, texts: List[str]) -> List[List[int]]:
+        """Encode a batch of texts using the fast tokenizer's batch path."""
+        if not self.tokenizer:
+            return super().encode_batch(texts)
+        try:
+            return self.tokenizer(texts)["input_ids"]
+        except Exception:
+            return super().encode_batch(texts)
+
+    def count_tokens_batch(self, texts: List[str]) -> List[int]:
+        """Count the number of tokens in each text of a batch.
+
+        Tokenizers without a batch path (e.g. slow tokenizers) count each text on its own.
+        """
+        if not self.tokenizer:
+            return [self.count_tokens(text) for text in texts]
+        try:
+            return [len(tokens) for tokens in self.tokenizer(texts)["input_ids"]]
+        except Exception:
+            return [self.count_tokens(text) for text in texts]
@@ -2,9 +2,10 @@
 
 from typing import List, Optional
 from transformers import AutoTokenizer
-from .base_tokenizer import BaseTokenizer
+from .base import BaseTokenizer
+from .hf_batch import HuggingFaceBatchMixin
 
-class HuggingFaceTokenizer(BaseTokenizer):
+class HuggingFaceTokenizer(HuggingFaceBatchMixin, BaseTokenizer):
     """HuggingFace tokenizer for text encoding and decoding."""
     
     def __init__(self, model_name: str = "gpt2", api_key: Optional[str] = None):
@@ -40,8 +41,8 @@ class HuggingFaceTokenizer(BaseTokenizer):
     def count_tokens(self, text: str) -> int:
         """Count the number of tokens in the text."""
         if not self.tokenizer:
-            return super().count_tokens(text)
+            raise ValueError("Tokenizer not initialized")
         try:
             return len(self.tokenizer.encode(text))
-        except:
-            return super().count_tokens(text)
+        except Exception as e:
+            raise ValueError(f"Failed to count tokens: {str(e)}")
@@ -3,11 +3,14 @@
 from typing import List, Optional
 import requests
 from transformers import AutoTokenizer, LlamaTokenizer
-from .base_tokenizer import BaseTokenizer
+from .base import BaseTokenizer
+from .hf_batch import HuggingFaceBatchMixin
 
-class MetaTokenizer(BaseTokenizer):
+class MetaTokenizer(HuggingFaceBatchMixin, BaseTokenizer):
     """Meta AI tokenizer for text encoding and decoding."""
     
+    estimator_family = "llama"
+    
     def __init__(self, model_name: str = "meta-llama/Llama-2-70b-chat-hf", api_key: Optional[str] = None):
         """Initialize Meta tokenizer with model name and API key."""
         super().__init__()
@@ -45,8 +48,8 @@ class MetaTokenizer(BaseTokenizer):
     def count_tokens(self, text: str) -> int:
         """Count the number of tokens in the text."""
         if not self.tokenizer:
-            return super().count_tokens(text)
+            raise ValueError("Tokenizer not initialized")
         try:
             return len(self.tokenizer.encode(text))
-        except:
-            return super().count_tokens(text)
+        except Exception as e:
+            raise ValueError(f"Failed to count tokens: {str(e)}")
@@ -2,42 +2,37 @@
 
 from typing import List, Optional
 import mistralai
-from .base_tokenizer import BaseTokenizer
+from .base import BaseTokenizer
 
 class MistralTokenizer(BaseTokenizer):
     """Mistral AI tokenizer for text encoding and decoding."""
     
+    # The SDK only offers blocking calls, so the async methods run them in
+    # an executor; remote batches are still sent concurrently
+    remote = True
+    estimator_family = "mistral"
+    # The API reports counts only; it exposes neither token IDs nor decoding
+    supports_ids = False
+    supports_decode = False
+    
     def __init__(self, api_key: Optional[str] = None):
         """Initialize Mistral tokenizer with API key."""
         super().__init__()
         self.client = mistralai.MistralClient(api_key=api_key) if api_key else None
     
     def encode(self, text: str) -> List[int]:
-        """Encode text into token IDs."""
-        if not self.client:
-            return super().encode(text)
-        try:
-            # Mistral doesn't expose token IDs directly
-            count = self.client.count_tokens(text)
-            return list(range(count))
-        except:
-            return super().encode(text)
+        """Mistral does not expose token IDs; use count_tokens."""
+        raise NotImplementedError("Mistral does not support token encoding")
     
     def decode(self, token_ids: List[int]) -> str:
-        """Decode token IDs back into text."""
-        if not self.client:
-            return super().decode(token_ids)
-        try:
-            # Mistral doesn't provide decoding functionality
-            return super().decode(token_ids)
-        except:
-            return super().decode(token_ids)
+        """Mistral does not expose token IDs, so there is nothing to decode."""
+        raise NotImplementedError("Mistral does not support token decoding")
     
     def count_tokens(self, text: str) -> int:
         """Count the number of tokens in the text."""
         if not self.client:
-            return super().count_tokens(text)
+            raise ValueError("Tokenizer not initialized")
         try:
             return self.client.count_tokens(text)
-        except:
-            return super().count_tokens(text)
+        except Exception as e:
+            raise ValueError(f"Failed to count tokens: {str(e)}")
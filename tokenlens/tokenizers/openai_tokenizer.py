@@ -1,22 +1,52 @@
 """OpenAI tokenizer implementation."""
 
-from typing import List, Optional
-import tiktoken
-from openai import OpenAI
+import os
+import re
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Tuple
 from .base import BaseTokenizer
+from .boundaries import DEFAULT_CHUNK_SIZE, TextSource, iter_safe_chunks
+from .buffers import ARRAY, NUMPY, TokenBuffer, as_token_sequence, load_numpy, to_buffer
+from .registry import TokenizerRegistry
+
+# Smallest chunk worth handing to another thread
+PARALLEL_MIN_CHUNK = 1 << 18
+
+_NON_ASCII = re.compile("[^\x00-\x7f]")
 
 class OpenAITokenizer(BaseTokenizer):
     """OpenAI tokenizer for text encoding and decoding."""
     
+    supports_offsets = True
+    
     def __init__(self, model_name: str = "gpt-4", api_key: Optional[str] = None):
         """Initialize OpenAI tokenizer with model name and API key."""
         self.model_name = model_name
+        self.api_key = api_key
+        self._client = None
         try:
-            self.client = OpenAI(api_key=api_key) if api_key else None
-            self.tokenizer = tiktoken.encoding_for_model(model_name)
+            self.tokenizer = TokenizerRegistry.get_encoding(model_name)
         except Exception as e:
             raise ValueError(f"Failed to initialize OpenAI tokenizer: {str(e)}")
     
+    @property
+    def client(self):
+        """OpenAI client, created on first access since tokenization never needs it."""
+        if self._client is None and self.api_key:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=self.api_key)
+        return self._client
+    
+    @property
+    def tokenizer_id(self) -> str:
+        """Models sharing a tiktoken encoding share their token counts."""
+        return f"tiktoken:{self.tokenizer.name}"
+    
+    @property
+    def estimator_family(self) -> str:
+        """Estimates use the ratios of this model's encoding."""
+        return self.tokenizer.name
+    
     def encode(self, text: str) -> List[int]:
         """Encode text into token IDs."""
         if not self.tokenizer:
@@ -24,13 +54,150 @@ class OpenAITokenizer(BaseTokenizer):
         return self.tokenizer.encode(text)
     
     def decode(self, token_ids: List[int]) -> str:
-        """Decode token IDs back into text."""
+        """Decode token IDs (a list or a token buffer) back into text."""
         if not self.tokenizer:
             raise ValueError("Tokenizer not initialized")
-        return self.tokenizer.decode(token_ids)
+        return self.tokenizer.decode(as_token_sequence(token_ids))
+    
+    def encode_with_offsets(self, text: str) -> Tuple[List[int], List[int]]:
+        """Encode text into token IDs plus the character offset where each token starts.
+        
+        A token that starts inside a multi-byte character gets that
+        character's offset, so consecutive offsets may be equal.
+        """
+        if not self.tokenizer:
+            raise ValueError("Tokenizer not initialized")
+        tokens = self.tokenizer.encode(text)
+        lengths = map(TokenizerRegistry.get_token_lengths(self.tokenizer).__getitem__, tokens)
+        byte_offsets = list(accumulate(lengths, initial=0))
+        byte_offsets.pop()
+        if text.isascii():
+            # One byte per character: byte offsets are character offsets
+            return tokens, byte_offsets
+        return tokens, _char_offsets(text, byte_offsets)
+    
+    def encode_buffer(self, text: str, kind: str = ARRAY) -> TokenBuffer:
+        """Encode text into a compact buffer of 4-byte token IDs."""
+        if not self.tokenizer:
+            raise ValueError("Tokenizer not initialized")
+        if kind == NUMPY:
+            load_numpy()
+            # tiktoken fills the numpy array directly, without an intermediate list
+            return self.tokenizer.encode_to_numpy(text)
+        return to_buffer(self.tokenizer.encode(text), kind)
     
     def count_tokens(self, text: str) -> int:
         """Count the number of tokens in the text."""
         if not self.tokenizer:
             raise ValueError("Tokenizer not initialized")
         return len(self.tokenizer.encode(text))
+    
+    def encode_batch(self, texts: List[str], num_threads: int = 8) -> List[List[int]]:
+        """Encode a batch of texts using tiktoken's multithreaded batch encoder."""
+        if not self.tokenizer:
+            raise ValueError("Tokenizer not initialized")
+        return self.tokenizer.encode_batch(texts, num_threads=num_threads)
+    
+    def count_tokens_batch(self, texts: List[str], num_threads: int = 8) -> List[int]:
+        """Count the number of tokens in each text of a batch."""
+        return [len(tokens) for tokens in self.encode_batch(texts, num_threads=num_threads)]
+    
+    def count_tokens_stream(self, source: TextSource, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """Count tokens chunk by chunk, holding only about chunk_size characters at a time."""
+        if not self.tokenizer:
+            raise ValueError("Tokenizer not initialized")
+        return sum(len(self.tokenizer.encode(chunk)) for chunk in iter_safe_chunks(source, chunk_size))
+    
+    def count_tokens_parallel(self, text: str, workers: Optional[int] = None) -> int:
+        """Count tokens of a large text by encoding safe-boundary chunks on several threads.
+        
+        tiktoken releases the GIL while encoding, so threads scale across
+        cores, and no merge crosses a safe boundary, so the sum equals
+        count_tokens exactly.
+        """
+        if not self.tokenizer:
+            raise ValueError("Tokenizer not initialized")
+        if workers is None:
+            # Respect CPU affinity (e.g. container limits) where the platform exposes it
+            workers = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+        # A few chunks per worker evens out uneven chunk costs
+        chunk_size = max(len(text) // (workers * 4), PARALLEL_MIN_CHUNK)
+        if workers == 1 or len(text) <= chunk_size:
+            return self.count_tokens(text)
+        chunks = list(iter_safe_chunks(text, chunk_size))
+        return sum(len(tokens) for tokens in self.tokenizer.encode_batch(chunks, num_threads=workers))
+    
+    def token_bounds(self, text: str) -> Optional[Tuple[int, int]]:
+        """Bound the token count by the UTF-8 length of the text.
+        
+        Every byte-level BPE token covers at least one byte and at most the
+        longest token in the encoding, so the count lies between
+        ceil(bytes / max_token_bytes) and bytes.
+        """
+        if not self.tokenizer:
+            raise ValueError("Tokenizer not initialized")
+        byte_count = len(text) if text.isascii() else len(text.encode("utf-8"))
+        max_token_bytes = TokenizerRegistry.get_max_token_bytes(self.tokenizer)
+        return -(-byte_count // max_token_bytes), byte_count
+    
+    def _check_limit_by_count(self, text: str, max_tokens: int) -> Dict[str, Any]:
+        """Count tokens chunk by chunk, stopping once max_tokens is passed."""
+        if not self.tokenizer:
+            raise ValueError("Tokenizer not initialized")
+        token_count = 0
+        chunk_start = 0
+        # Roughly a quarter of the limit in tokens per chunk, so rejecting
+        # oversized input costs a few chunks rather than the whole text
+        for chunk in iter_safe_chunks(text, max(max_tokens, 1024)):
+            tokens = self.tokenizer.encode(chunk)
+            chunk_end = chunk_start + len(chunk)
+            if token_count + len(tokens) > max_tokens:
+                # The first token past the limit may start inside a multi-byte
+                # character; the cutoff is then that character's offset
+                head = b"".join(self.tokenizer.decode_tokens_bytes(tokens[:max_tokens - token_count]))
+                return {
+                    "within_limit": False,
+                    "token_count": token_count + len(tokens),
+                    "exact": chunk_end == len(text),
+                    "cutoff_char": chunk_start + len(head.decode("utf-8", errors="ignore")),
+                }
+            token_count += len(tokens)
+            chunk_start = chunk_end
+        return {
+            "within_limit": True,
+            "token_count": token_count,
+            "exact": True,
+            "cutoff_char": None,
+        }
+
+def _char_offsets(text: str, byte_offsets: List[int]) -> List[int]:
+    """Convert the UTF-8 byte offsets of tokens into character offsets.
+
+    Only the non-ASCII characters are visited; an offset inside a multi-byte
+    character maps to that character.
+    """
+    # Byte span and character index of every non-ASCII character
+    starts: List[int] = []
+    ends: List[int] = []
+    indices: List[int] = []
+    extra = 0
+    for match in _NON_ASCII.finditer(text):
+        index = match.start()
+        width = len(match.group().encode("utf-8"))
+        starts.append(index + extra)
+        ends.append(index + extra + width)
+        indices.append(index)
+        extra += width - 1
+    offsets = []
+    shift = 0
+    k = 0
+    count = len(starts)
+    for offset in byte_offsets:
+        while k < count and ends[k] <= offset:
+            shift += ends[k] - starts[k] - 1
+            k += 1
+        if k < count and starts[k] < offset:
+            offsets.append(indices[k])
+        else:
+            offsets.append(offset - shift)
+    return offsets
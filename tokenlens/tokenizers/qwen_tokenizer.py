@@ -3,11 +3,14 @@
 from typing import List, Optional
 import requests
 from transformers import AutoTokenizer
-from .base_tokenizer import BaseTokenizer
+from .base import BaseTokenizer
+from .hf_batch import HuggingFaceBatchMixin
 
-class QwenTokenizer(BaseTokenizer):
+class QwenTokenizer(HuggingFaceBatchMixin, BaseTokenizer):
     """Qwen tokenizer for text encoding and decoding."""
     
+    estimator_family = "qwen"
+    
     def __init__(self, model_name: str = "Qwen/Qwen-7B", api_key: Optional[str] = None):
         """Initialize Qwen tokenizer with model name and API key."""
         super().__init__()
@@ -41,8 +44,8 @@ class QwenTokenizer(BaseTokenizer):
     def count_tokens(self, text: str) -> int:
         """Count the number of tokens in the text."""
         if not self.tokenizer:
-            return super().count_tokens(text)
+            raise ValueError("Tokenizer not initialized")
         try:
             return len(self.tokenizer.encode(text))
-        except:
-            return super().count_tokens(text)
+        except Exception as e:
+            raise ValueError(f"Failed to count tokens: {str(e)}")
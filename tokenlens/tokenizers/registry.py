@@ -0,0 +1,196 @@
+"""Process-wide registry of shared tokenizer and encoding instances."""
+
+import inspect
+import threading
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import tiktoken
+
+from .base import BaseTokenizer
+from .cache import CachedTokenizer
+from .factory import TokenizerFactory
+
+class TokenizerRegistry:
+    """Thread-safe registry handing out shared, ready-to-use tokenizers.
+
+    Tokenizers are keyed by (tokenizer class, model name, options), so provider
+    aliases that resolve to the same class (e.g. "openai" and "microsoft.azure")
+    share one instance. Encodings are keyed by model or encoding name. With
+    set_cache, shared tokenizers are wrapped in a CachedTokenizer. Failed
+    constructions are remembered until clear(), so e.g. a vocabulary download
+    that fails offline is not retried on every call.
+    """
+
+    _tokenizers: Dict[Tuple[Hashable, ...], BaseTokenizer] = {}
+    _failures: Dict[Tuple[Hashable, ...], Exception] = {}
+    _fallbacks: Dict[Tuple[str, str], BaseTokenizer] = {}
+    _encodings: Dict[str, "tiktoken.Encoding"] = {}
+    _max_token_bytes: Dict[str, int] = {}
+    _token_lengths: Dict[str, List[int]] = {}
+    _key_locks: Dict[Tuple[Hashable, ...], threading.Lock] = {}
+    _accepts_model_name: Dict[type, bool] = {}
+    _cache: Optional[Any] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_encoding(cls, name: str) -> "tiktoken.Encoding":
+        """Get a shared tiktoken encoding by model name or encoding name.
+
+        Args:
+            name: A model name (e.g. "gpt-4") or an encoding name (e.g. "cl100k_base")
+
+        Returns:
+            The shared tiktoken encoding
+        """
+        encoding = cls._encodings.get(name)
+        if encoding is not None:
+            return encoding
+
+        with cls._lock:
+            encoding = cls._encodings.get(name)
+            if encoding is None:
+                try:
+                    encoding = tiktoken.encoding_for_model(name)
+                except KeyError:
+                    encoding = tiktoken.get_encoding(name)
+                cls._encodings[name] = encoding
+        return encoding
+
+    @classmethod
+    def get_max_token_bytes(cls, encoding: "tiktoken.Encoding") -> int:
+        """Get the byte length of the longest ordinary token in an encoding."""
+        max_token_bytes = cls._max_token_bytes.get(encoding.name)
+        if max_token_bytes is None:
+            max_token_bytes = max(len(token) for token in encoding.token_byte_values())
+            cls._max_token_bytes[encoding.name] = max_token_bytes
+        return max_token_bytes
+
+    @classmethod
+    def get_token_lengths(cls, encoding: "tiktoken.Encoding") -> List[int]:
+        """Get the byte length of every token ID in an encoding (0 for unused IDs)."""
+        lengths = cls._token_lengths.get(encoding.name)
+        if lengths is None:
+            lengths = [0] * (encoding.max_token_value + 1)
+            for token in range(len(lengths)):
+                try:
+                    lengths[token] = len(encoding.decode_single_token_bytes(token))
+                except KeyError:
+                    pass
+            cls._token_lengths[encoding.name] = lengths
+        return lengths
+
+    @classmethod
+    def get_tokenizer(
+        cls, tokenizer_name: str, model_name: Optional[str] = None, **options: Any
+    ) -> Optional[BaseTokenizer]:
+        """Get a shared tokenizer instance by name.
+
+        Args:
+            tokenizer_name: Name registered with TokenizerFactory (e.g. "openai")
+            model_name: Optional model name, ignored by tokenizers that take none
+            **options: Additional constructor arguments (e.g. api_key)
+
+        Returns:
+            The shared tokenizer instance, or None if the tokenizer is unknown or
+            its dependencies are not installed
+
+        Raises:
+            ImportError, OSError, ValueError: If the tokenizer could not be
+                constructed, now or on an earlier call with the same arguments
+        """
+        tokenizer_class = TokenizerFactory.get_tokenizer(tokenizer_name)
+        if tokenizer_class is None:
+            return None
+
+        if not cls._takes_model_name(tokenizer_class):
+            model_name = None
+
+        key = (tokenizer_class, model_name, tuple(sorted(options.items())))
+        tokenizer = cls._tokenizers.get(key)
+        if tokenizer is not None:
+            return tokenizer
+        failure = cls._failures.get(key)
+        if failure is not None:
+            raise failure
+
+        # Construction may be slow (model downloads, SDK clients), so only
+        # callers asking for the same key wait on each other.
+        with cls._lock:
+            key_lock = cls._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            tokenizer = cls._tokenizers.get(key)
+            if tokenizer is None:
+                failure = cls._failures.get(key)
+                if failure is not None:
+                    raise failure
+                if model_name is not None:
+                    options["model_name"] = model_name
+                try:
+                    tokenizer = tokenizer_class(**options)
+                except (ImportError, OSError, ValueError) as e:
+                    cls._failures[key] = e
+                    raise
+                if cls._cache is not None:
+                    tokenizer = CachedTokenizer(tokenizer, cls._cache)
+                cls._tokenizers[key] = tokenizer
+        return tokenizer
+
+    @classmethod
+    def get_model_tokenizer(cls, tokenizer_name: str, model_name: str) -> Optional[BaseTokenizer]:
+        """Get a shared tokenizer for a model, falling back to the tokenizer's default vocabulary.
+
+        Model IDs the tokenizer does not know (e.g. Bedrock's) get the shared
+        tokenizer built without a model name. The fallback is remembered, so
+        later calls neither retry the construction nor raise.
+
+        Returns:
+            The shared tokenizer instance, or None as for get_tokenizer
+        """
+        key = (tokenizer_name, model_name)
+        tokenizer = cls._fallbacks.get(key)
+        if tokenizer is not None:
+            return tokenizer
+        try:
+            return cls.get_tokenizer(tokenizer_name, model_name)
+        except ValueError:
+            tokenizer = cls.get_tokenizer(tokenizer_name)
+            if tokenizer is not None:
+                cls._fallbacks[key] = tokenizer
+            return tokenizer
+
+    @classmethod
+    def set_cache(cls, cache: Optional[Any]) -> None:
+        """Memoize counts of all shared tokenizers in cache (None disables caching).
+
+        The cache is a TokenCountCache, a DiskTokenCountCache, or any object
+        with the same get_count/put_count/get_tokens/put_tokens methods.
+
+        Tokenizers already handed out keep their previous setting.
+        """
+        with cls._lock:
+            cls._cache = cache
+            cls._tokenizers.clear()
+            cls._fallbacks.clear()
+
+    @classmethod
+    def _takes_model_name(cls, tokenizer_class: type) -> bool:
+        """Check whether a tokenizer class accepts a model_name argument."""
+        accepts = cls._accepts_model_name.get(tokenizer_class)
+        if accepts is None:
+            parameters = inspect.signature(tokenizer_class.__init__).parameters
+            accepts = "model_name" in parameters
+            cls._accepts_model_name[tokenizer_class] = accepts
+        return accepts
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop all shared tokenizers and encodings, and forget failed constructions."""
+        with cls._lock:
+            cls._tokenizers.clear()
+            cls._failures.clear()
+            cls._fallbacks.clear()
+            cls._encodings.clear()
+            cls._max_token_bytes.clear()
+            cls._token_lengths.clear()
+            cls._key_locks.clear()
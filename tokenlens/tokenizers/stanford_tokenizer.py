@@ -3,11 +3,14 @@
 from typing import List, Optional
 import requests
 from transformers import AutoTokenizer
-from .base_tokenizer import BaseTokenizer
+from .base import BaseTokenizer
+from .hf_batch import HuggingFaceBatchMixin
 
-class StanfordTokenizer(BaseTokenizer):
+class StanfordTokenizer(HuggingFaceBatchMixin, BaseTokenizer):
     """Stanford AI tokenizer for text encoding and decoding."""
     
+    estimator_family = "llama"
+    
     def __init__(self, model_name: str = "stanford-alpaca/alpaca-7b", api_key: Optional[str] = None):
         """Initialize Stanford tokenizer with model name and API key."""
         super().__init__()
@@ -41,8 +44,8 @@ class StanfordTokenizer(BaseTokenizer):
     def count_tokens(self, text: str) -> int:
         """Count the number of tokens in the text."""
         if not self.tokenizer:
-            return super().count_tokens(text)
+            raise ValueError("Tokenizer not initialized")
         try:
             return len(self.tokenizer.encode(text))
-        except:
-            return super().count_tokens(text)
+        except Exception as e:
+            raise ValueError(f"Failed to count tokens: {str(e)}")
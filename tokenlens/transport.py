@@ -0,0 +1,266 @@
+"""Pooled HTTP transport for REST-based tokenizers and providers."""
+
+import asyncio
+import functools
+import os
+import random
+import threading
+import time
+from typing import Any, AsyncGenerator, Dict, FrozenSet, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+Timeout = Union[float, Tuple[float, float]]
+
+class HTTPTransport:
+    """Keep-alive HTTP client with timeouts and bounded, jittered retries.
+
+    One transport holds a pooled requests.Session (and, for async callers, an
+    aiohttp session per event loop), so repeated calls to the same host reuse
+    connections instead of paying TCP and TLS setup each time. Every attempt is
+    bounded by a timeout, and the whole call by an optional deadline.
+
+    An event loop's aiohttp session is closed when the loop shuts down its
+    async generators (as asyncio.run does), and sessions of loops closed
+    without that are dropped on the next async call.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "",
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Timeout = (3.05, 30.0),
+        max_retries: int = 3,
+        backoff: float = 0.25,
+        max_backoff: float = 8.0,
+        retry_statuses: FrozenSet[int] = RETRY_STATUSES,
+        pool_size: int = 32,
+    ):
+        """Initialize the transport.
+
+        Args:
+            base_url: Prefix for relative request paths
+            headers: Headers sent with every request
+            timeout: Per-attempt timeout in seconds, or (connect, read) timeouts
+            max_retries: Retries after the first attempt
+            backoff: Base delay in seconds; retry n waits up to backoff * 2**n
+            max_backoff: Cap on a single retry delay
+            retry_statuses: Response status codes that trigger a retry
+            pool_size: Maximum number of pooled connections per host
+        """
+        self.base_url = base_url.rstrip("/")
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_statuses = retry_statuses
+        self.pool_size = pool_size
+        self._session: Optional[requests.Session] = None
+        self._session_pid: Optional[int] = None
+        # Event loop -> (aiohttp session, async generator that closes it at loop shutdown)
+        self._async_sessions: Dict[Any, Tuple[Any, Any]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """Pooled session, recreated in a forked child so sockets are not shared."""
+        if self._session is None or self._session_pid != os.getpid():
+            with self._lock:
+                if self._session is None or self._session_pid != os.getpid():
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    session.headers.update(self.headers)
+                    self._session = session
+                    self._session_pid = os.getpid()
+        return self._session
+
+    def url(self, path: str) -> str:
+        """Resolve a request path against base_url."""
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(
+        self, method: str, path: str, deadline: Optional[float] = None, **kwargs: Any
+    ) -> requests.Response:
+        """Send a request, retrying connection errors, timeouts and retryable statuses.
+
+        Args:
+            method: HTTP method
+            path: Path relative to base_url, or an absolute URL
+            deadline: Total seconds allowed for all attempts and waits
+            **kwargs: Passed to requests.Session.request (json, params, ...)
+
+        Returns:
+            The last response; a retryable status is returned once retries
+            or the deadline run out
+
+        Raises:
+            requests.RequestException: If the last attempt failed to connect or timed out
+        """
+        expires = time.monotonic() + deadline if deadline is not None else None
+        url = self.url(path)
+        attempt = 0
+        while True:
+            timeout = self._attempt_timeout(expires)
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                delay = self._retry_delay(attempt, expires)
+                if delay is None:
+                    raise
+            else:
+                if response.status_code not in self.retry_statuses:
+                    return response
+                delay = self._retry_delay(attempt, expires, response.headers.get("Retry-After"))
+                if delay is None:
+                    return response
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def post(self, path: str, json: Any = None, deadline: Optional[float] = None, **kwargs: Any) -> requests.Response:
+        """POST a JSON body."""
+        return self.request("POST", path, deadline=deadline, json=json, **kwargs)
+
+    def get(self, path: str, deadline: Optional[float] = None, **kwargs: Any) -> requests.Response:
+        """Send a GET request."""
+        return self.request("GET", path, deadline=deadline, **kwargs)
+
+    async def arequest(
+        self, method: str, path: str, deadline: Optional[float] = None, json: Any = None
+    ) -> Tuple[int, Any]:
+        """Send a request without blocking the event loop, with the same retry policy.
+
+        Returns:
+            (status code, decoded JSON body or None)
+        """
+        if aiohttp is None:
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(
+                None, functools.partial(self.request, method, path, deadline=deadline, json=json)
+            )
+            return response.status_code, _json_or_none(response)
+
+        expires = time.monotonic() + deadline if deadline is not None else None
+        url = self.url(path)
+        session = await self._async_session()
+        attempt = 0
+        while True:
+            timeout = self._attempt_timeout(expires)
+            if isinstance(timeout, tuple):
+                client_timeout = aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+            else:
+                client_timeout = aiohttp.ClientTimeout(total=timeout)
+            try:
+                async with session.request(method, url, json=json, timeout=client_timeout) as response:
+                    status = response.status
+                    retry_after = response.headers.get("Retry-After")
+                    body = None
+                    if status not in self.retry_statuses:
+                        try:
+                            body = await response.json(content_type=None)
+                        except ValueError:
+                            pass
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                delay = self._retry_delay(attempt, expires)
+                if delay is None:
+                    raise
+            else:
+                if status not in self.retry_statuses:
+                    return status, body
+                delay = self._retry_delay(attempt, expires, retry_after)
+                if delay is None:
+                    return status, None
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def apost(self, path: str, json: Any = None, deadline: Optional[float] = None) -> Tuple[int, Any]:
+        """POST a JSON body without blocking the event loop."""
+        return await self.arequest("POST", path, deadline=deadline, json=json)
+
+    async def _async_session(self) -> Any:
+        """Get the aiohttp session bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        # Sessions of loops closed without shutting down their async generators
+        # cannot be closed any more; dropping them releases the dead loops
+        for other in list(self._async_sessions):
+            if other.is_closed():
+                self._async_sessions.pop(other, None)
+        entry = self._async_sessions.get(loop)
+        if entry is None or entry[0].closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.pool_size)
+            session = aiohttp.ClientSession(headers=self.headers, connector=connector)
+            closer = self._close_at_shutdown(loop, session)
+            # Starting the generator registers it with the loop, whose
+            # shutdown_asyncgens() then closes the session
+            await closer.asend(None)
+            entry = self._async_sessions[loop] = (session, closer)
+        return entry[0]
+
+    async def _close_at_shutdown(self, loop: Any, session: Any) -> AsyncGenerator[None, None]:
+        """Wait until the loop shuts down its async generators, then close the session."""
+        try:
+            yield
+        finally:
+            if self._async_sessions.get(loop, (None,))[0] is session:
+                self._async_sessions.pop(loop, None)
+            await session.close()
+
+    def _attempt_timeout(self, expires: Optional[float]) -> Timeout:
+        """Shrink the per-attempt timeout to what is left of the deadline."""
+        if expires is None:
+            return self.timeout
+        remaining = max(expires - time.monotonic(), 0.001)
+        if isinstance(self.timeout, tuple):
+            return min(self.timeout[0], remaining), min(self.timeout[1], remaining)
+        return min(self.timeout, remaining)
+
+    def _retry_delay(
+        self, attempt: int, expires: Optional[float], retry_after: Optional[str] = None
+    ) -> Optional[float]:
+        """Get the wait before the next attempt, or None if no retry is left."""
+        if attempt >= self.max_retries:
+            return None
+        # Full jitter keeps many clients from retrying in lockstep
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+        if retry_after is not None:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        if expires is not None and time.monotonic() + delay >= expires:
+            return None
+        return delay
+
+    def close(self) -> None:
+        """Close the pooled synchronous connections."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    async def aclose(self) -> None:
+        """Close the aiohttp session of the running event loop."""
+        entry = self._async_sessions.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[1].aclose()
+
+def _json_or_none(response: requests.Response) -> Any:
+    """Decode a JSON response body, or None if it is not JSON."""
+    try:
+        return response.json()
+    except ValueError:
+        return None